@@ -1,77 +1,443 @@
+import json
 import logging
+from collections.abc import AsyncIterator
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.clients.omdb_client import OMDBClient
+from app.core.config import settings
 from app.core.exceptions import (
+    CircuitOpenError,
     ExternalAPIError,
+    InvalidCursorError,
+    InvalidFieldsError,
     MovieAlreadyExistsError,
+    MovieAPIException,
     MovieNotFoundError,
+    QuotaExceededError,
+)
+from app.core.http_cache import (
+    cache_headers,
+    collection_etag,
+    etag_matches,
+    movie_etag,
+)
+from app.db.database import (
+    get_db,
+    get_read_db,
+    get_read_sessionmaker,
+    mark_recent_write,
 )
-from app.db.database import get_db
 from app.repositories.movie_repository import MovieRepository
-from app.schemas.movie import MovieCreate, MovieListResponse, MovieResponse
+from app.schemas.movie import (
+    IMDB_ID_PATTERN,
+    MovieBatchCreate,
+    MovieBatchResponse,
+    MovieBatchStatus,
+    MovieCountMode,
+    MovieCreate,
+    MovieExportFormat,
+    MovieFilters,
+    MovieImdbCreate,
+    MovieListResponse,
+    MovieResponse,
+    MovieSearchResponse,
+    MovieSort,
+    OMDBSearchPage,
+    dump_movie,
+    dump_movie_batch,
+    dump_movies,
+    dump_movies_csv,
+    dump_movies_ndjson,
+    parse_fieldset,
+    sparse_movie_list_response,
+)
 from app.services.movie_service import MovieService
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/movies", tags=["movies"])
 
 
-def get_movie_service(db: Annotated[AsyncSession, Depends(get_db)]) -> MovieService:
+def get_omdb_client(request: Request) -> OMDBClient:
+    """Dependency - cliente OMDB do processo (criado no lifespan)"""
+    omdb_client = getattr(request.app.state, "omdb_client", None)
+    if omdb_client is None:
+        omdb_client = OMDBClient()
+    return omdb_client
+
+
+def get_movie_service(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    omdb_client: Annotated[OMDBClient, Depends(get_omdb_client)],
+) -> MovieService:
     """Dependency injection do service"""
     repository = MovieRepository(db)
-    omdb_client = OMDBClient()
     return MovieService(repository, omdb_client)
 
 
+def get_read_movie_service(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    omdb_client: Annotated[OMDBClient, Depends(get_omdb_client)],
+) -> MovieService:
+    """Dependency injection do service para leituras (réplica, se houver)"""
+    return MovieService(MovieRepository(db), omdb_client)
+
+
+def get_movie_filters(
+    genre: Annotated[str | None, Query(max_length=255)] = None,
+    actor: Annotated[str | None, Query(max_length=255)] = None,
+    director: Annotated[str | None, Query(max_length=255)] = None,
+    language: Annotated[str | None, Query(max_length=255)] = None,
+    year_from: Annotated[int | None, Query(ge=0)] = None,
+    year_to: Annotated[int | None, Query(ge=0)] = None,
+    min_runtime: Annotated[int | None, Query(ge=0)] = None,
+) -> MovieFilters:
+    """Dependency - filtros da listagem a partir da query string"""
+    return MovieFilters(
+        genre=genre,
+        actor=actor,
+        director=director,
+        language=language,
+        year_from=year_from,
+        year_to=year_to,
+        min_runtime=min_runtime,
+    )
+
+
+def get_fieldset(
+    fields: Annotated[
+        str | None,
+        Query(
+            max_length=512,
+            description="Comma-separated response fields, e.g. title,year",
+        ),
+    ] = None,
+) -> tuple[str, ...] | None:
+    """Dependency - campos pedidos em fields= (None: todos)"""
+    if fields is None:
+        return None
+    try:
+        return parse_fieldset(fields)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def _json(
+    body: bytes,
+    headers: dict[str, str] | None = None,
+    status_code: int = status.HTTP_200_OK,
+) -> Response:
+    """Resposta com JSON já serializado (dump_movie/dump_movies): o
+    response_model fica só para a documentação"""
+    return Response(
+        body, status_code=status_code, media_type="application/json", headers=headers
+    )
+
+
+CREATE_RESPONSES: dict[int | str, dict] = {
+    201: {"description": "Movie created"},
+    404: {"description": "Not found in OMDB"},
+    409: {"description": "Already exists"},
+    429: {"description": "OMDB request quota exhausted"},
+    502: {"description": "External API error"},
+    503: {"description": "OMDB temporarily unavailable (circuit open)"},
+}
+
+
+def _retry_later(
+    status_code: int, e: QuotaExceededError | CircuitOpenError
+) -> HTTPException:
+    headers = None
+    if e.retry_after is not None:
+        headers = {"Retry-After": str(int(e.retry_after) + 1)}
+    return HTTPException(status_code=status_code, detail=str(e), headers=headers)
+
+
+def _create_error(e: MovieAPIException) -> HTTPException:
+    """Converte erros da criação de filmes em respostas HTTP"""
+    if isinstance(e, MovieAlreadyExistsError):
+        return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if isinstance(e, MovieNotFoundError):
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    if isinstance(e, QuotaExceededError):
+        return _retry_later(status.HTTP_429_TOO_MANY_REQUESTS, e)
+    if isinstance(e, CircuitOpenError):
+        return _retry_later(status.HTTP_503_SERVICE_UNAVAILABLE, e)
+    if isinstance(e, ExternalAPIError):
+        return HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
+    raise e
+
+
 @router.post(
     "",
     response_model=MovieResponse,
     status_code=status.HTTP_201_CREATED,
-    responses={
-        201: {"description": "Movie created"},
-        404: {"description": "Not found in OMDB"},
-        409: {"description": "Already exists"},
-        502: {"description": "External API error"},
-    },
+    responses=CREATE_RESPONSES,
 )
 async def create_movie(
     movie_create: MovieCreate,
     service: Annotated[MovieService, Depends(get_movie_service)],
-) -> MovieResponse:
+) -> Response:
     try:
         movie = await service.create_movie(movie_create.title)
-        return MovieResponse.model_validate(movie)
-    except MovieAlreadyExistsError as e:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except MovieAPIException as e:
+        raise _create_error(e)
+    response = _json(dump_movie(movie), status_code=status.HTTP_201_CREATED)
+    mark_recent_write(response)
+    return response
+
+
+@router.post(
+    "/by-imdb",
+    response_model=MovieResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses=CREATE_RESPONSES,
+)
+async def create_movie_by_imdb_id(
+    movie_create: MovieImdbCreate,
+    service: Annotated[MovieService, Depends(get_movie_service)],
+) -> Response:
+    try:
+        movie = await service.create_movie_by_imdb_id(movie_create.imdb_id)
+    except MovieAPIException as e:
+        raise _create_error(e)
+    response = _json(dump_movie(movie), status_code=status.HTTP_201_CREATED)
+    mark_recent_write(response)
+    return response
+
+
+@router.get("/by-imdb/{imdb_id}", response_model=MovieResponse)
+async def get_movie_by_imdb_id(
+    imdb_id: Annotated[str, Path(pattern=IMDB_ID_PATTERN)],
+    service: Annotated[MovieService, Depends(get_read_movie_service)],
+) -> Response:
+    try:
+        movie = await service.get_movie_by_imdb_id(imdb_id)
     except MovieNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
-    except ExternalAPIError as e:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
+    return _json(dump_movie(movie))
+
+
+@router.post("/batch", response_model=MovieBatchResponse)
+async def create_movies_batch(
+    batch: MovieBatchCreate,
+    service: Annotated[MovieService, Depends(get_movie_service)],
+) -> Response:
+    results = await service.create_movies(batch.titles)
+    response = _json(dump_movie_batch(results))
+    if any(result["status"] == MovieBatchStatus.CREATED for result in results):
+        mark_recent_write(response)
+    return response
+
+
+@router.get(
+    "/omdb/search",
+    responses={
+        200: {
+            "description": "One OMDBSearchPage JSON object per line (NDJSON)",
+            "content": {"application/x-ndjson": {}},
+        },
+        429: CREATE_RESPONSES[429],
+        502: CREATE_RESPONSES[502],
+        503: CREATE_RESPONSES[503],
+    },
+)
+async def search_omdb(
+    omdb_client: Annotated[OMDBClient, Depends(get_omdb_client)],
+    q: Annotated[str, Query(min_length=1, max_length=255)],
+    max_pages: Annotated[int, Query(ge=1)] = 1,
+) -> StreamingResponse:
+    """Busca na OMDB, enviando cada página assim que chega (NDJSON)"""
+    pages = omdb_client.iter_search(q, min(max_pages, settings.OMDB_SEARCH_MAX_PAGES))
+    # a primeira página é buscada antes do stream para que erros virem status HTTP
+    try:
+        first = await anext(pages)
+    except MovieAPIException as e:
+        await pages.aclose()
+        raise _create_error(e)
+
+    async def stream() -> AsyncIterator[str]:
+        try:
+            yield OMDBSearchPage.model_validate(first).model_dump_json() + "\n"
+            async for page in pages:
+                yield OMDBSearchPage.model_validate(page).model_dump_json() + "\n"
+        except MovieAPIException as e:
+            logger.error(f"OMDB search for '{q}' interrupted: {e}")
+            yield json.dumps({"error": str(e)}) + "\n"
+        finally:
+            await pages.aclose()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+EXPORT_MEDIA_TYPES = {
+    MovieExportFormat.NDJSON: "application/x-ndjson",
+    MovieExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+@router.get(
+    "/export",
+    responses={
+        200: {
+            "description": "Every stored movie, streamed (NDJSON or CSV)",
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()},
+        }
+    },
+)
+async def export_movies(
+    sessionmaker: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_read_sessionmaker)
+    ],
+    omdb_client: Annotated[OMDBClient, Depends(get_omdb_client)],
+    filters: Annotated[MovieFilters, Depends(get_movie_filters)],
+    export_format: Annotated[
+        MovieExportFormat, Query(alias="format")
+    ] = MovieExportFormat.NDJSON,
+) -> StreamingResponse:
+    """Catálogo inteiro numa única resposta, enviado lote a lote a partir de um
+    cursor no servidor (para sincronizações, no lugar de paginar a listagem)"""
+    encode = (
+        dump_movies_csv
+        if export_format == MovieExportFormat.CSV
+        else dump_movies_ndjson
+    )
+
+    async def stream() -> AsyncIterator[bytes]:
+        # a sessão é aberta aqui para durar o stream inteiro
+        async with sessionmaker() as session:
+            service = MovieService(MovieRepository(session), omdb_client)
+            if export_format == MovieExportFormat.CSV:
+                yield dump_movies_csv([], header=True)
+            async for movies in service.export_movies(filters):
+                yield encode(movies)
+
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="movies.{export_format.value}"'
+            )
+        },
+    )
+
+
+@router.get("/search", response_model=MovieSearchResponse)
+async def search_movies(
+    service: Annotated[MovieService, Depends(get_read_movie_service)],
+    q: Annotated[str, Query(min_length=1, max_length=255)],
+    skip: Annotated[int, Query(ge=0)] = 0,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+) -> Response:
+    """Busca textual nos filmes cadastrados (título, elenco, direção, sinopse)"""
+    movies, has_more = await service.search_movies(q, skip=skip, limit=limit)
+    return _json(dump_movies(MovieSearchResponse, movies, has_more=has_more))
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag)
+    )
 
 
-@router.get("/{movie_id}", response_model=MovieResponse)
+@router.get(
+    "/{movie_id}",
+    response_model=MovieResponse,
+    responses={304: {"description": "Not modified (If-None-Match)"}},
+)
 async def get_movie(
     movie_id: int,
-    service: Annotated[MovieService, Depends(get_movie_service)],
-) -> MovieResponse:
+    request: Request,
+    service: Annotated[MovieService, Depends(get_read_movie_service)],
+    fields: Annotated[tuple[str, ...] | None, Depends(get_fieldset)],
+) -> Response:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # revalidação: só o updated_at, sem carregar a linha
+        updated_at = await service.get_movie_version(movie_id)
+        if updated_at is not None:
+            etag = movie_etag(movie_id, updated_at, fields)
+            if etag_matches(if_none_match, etag):
+                return _not_modified(etag)
+
     try:
-        movie = await service.get_movie_by_id(movie_id)
-        return MovieResponse.model_validate(movie)
+        movie = await service.get_movie_by_id(movie_id, fields=fields)
     except MovieNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return _json(
+        dump_movie(movie, fields),
+        cache_headers(movie_etag(movie.id, movie.updated_at, fields)),
+    )
 
 
-@router.get("", response_model=MovieListResponse)
+@router.get(
+    "",
+    response_model=MovieListResponse,
+    responses={304: {"description": "Not modified (If-None-Match)"}},
+)
 async def list_movies(
-    service: Annotated[MovieService, Depends(get_movie_service)],
+    request: Request,
+    service: Annotated[MovieService, Depends(get_read_movie_service)],
+    filters: Annotated[MovieFilters, Depends(get_movie_filters)],
+    fields: Annotated[tuple[str, ...] | None, Depends(get_fieldset)],
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 100,
-) -> MovieListResponse:
-    movies, total = await service.get_all_movies(skip=skip, limit=limit)
-    return MovieListResponse(
-        movies=[MovieResponse.model_validate(m) for m in movies],
+    count: Annotated[MovieCountMode, Query()] = MovieCountMode.EXACT,
+    cursor: Annotated[str | None, Query(max_length=512)] = None,
+    sort: Annotated[MovieSort, Query()] = MovieSort.CREATED_DESC,
+) -> Response:
+    if cursor is not None and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either skip or cursor, not both",
+        )
+    if cursor is not None and sort != MovieSort.CREATED_DESC:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"cursor only supports sort={MovieSort.CREATED_DESC.value}",
+        )
+
+    # versão lida antes da página: uma escrita no meio deixa o ETag mais velho
+    # que o conteúdo, e a próxima revalidação baixa a página de novo
+    version = await service.get_collection_version()
+    etag = collection_etag(version, request.query_params.multi_items())
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag)
+
+    try:
+        movies, total, estimated, next_cursor = await service.get_all_movies(
+            skip=skip,
+            limit=limit,
+            count_mode=count,
+            cursor=cursor,
+            filters=filters,
+            sort=sort,
+            fields=fields,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    envelope = (
+        MovieListResponse if fields is None else sparse_movie_list_response(fields)
+    )
+    body = dump_movies(
+        envelope,
+        movies,
+        fields,
         total=total,
+        total_estimated=estimated,
+        next_cursor=next_cursor,
     )
+    return _json(body, cache_headers(etag))
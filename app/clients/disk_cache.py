@@ -0,0 +1,202 @@
+import argparse
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core.titles import normalize_title
+
+logger = logging.getLogger(__name__)
+
+# Parâmetros que não fazem parte da chave (credenciais)
+_IGNORED_PARAMS = {"apikey"}
+# Parâmetros de texto livre em que caixa e espaços não importam para a OMDB
+_TEXT_PARAMS = {"t", "s"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS omdb_cache (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_omdb_cache_expires_at ON omdb_cache (expires_at);
+CREATE INDEX IF NOT EXISTS ix_omdb_cache_stored_at ON omdb_cache (stored_at);
+"""
+
+
+def make_key(params: dict) -> str:
+    """Chave estável a partir dos parâmetros da consulta à OMDB"""
+    key_params = {}
+    for name, value in params.items():
+        if name in _IGNORED_PARAMS:
+            continue
+        if name in _TEXT_PARAMS and isinstance(value, str):
+            value = normalize_title(value)
+        key_params[name] = value
+    return json.dumps(key_params, sort_keys=True, separators=(",", ":"))
+
+
+class DiskCache:
+    """Cache persistente (SQLite) de payloads brutos da OMDB"""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int,
+        compact_every: int = 1000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compact_every = compact_every
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._writes_since_compact = 0
+        self.hits = 0
+        self.misses = 0
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        # WAL permite leitores concorrentes de vários workers no mesmo arquivo
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    async def get(self, params: dict) -> Optional[dict]:
+        return await asyncio.to_thread(self.get_sync, params)
+
+    async def set(self, params: dict, payload: dict, ttl: float) -> None:
+        await asyncio.to_thread(self.set_sync, params, payload, ttl)
+
+    async def compact(self) -> int:
+        return await asyncio.to_thread(self.compact_sync)
+
+    def get_sync(self, params: dict) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM omdb_cache WHERE key = ?",
+                (make_key(params),),
+            ).fetchone()
+
+        if row is None or row[1] <= self._clock():
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set_sync(self, params: dict, payload: dict, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        data = json.dumps(payload, separators=(",", ":"))
+        now = self._clock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO omdb_cache "
+                "(key, payload, size, stored_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (make_key(params), data, len(data), now, now + ttl),
+            )
+            self._writes_since_compact += 1
+            should_compact = self._writes_since_compact >= self.compact_every
+
+        if should_compact:
+            self.compact_sync()
+
+    def compact_sync(self) -> int:
+        """Remove entradas expiradas e as mais antigas acima de max_bytes"""
+        with self._lock, self._conn:
+            self._writes_since_compact = 0
+            removed = self._conn.execute(
+                "DELETE FROM omdb_cache WHERE expires_at <= ?", (self._clock(),)
+            ).rowcount
+
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM omdb_cache"
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                cutoff = None
+                excess = total - self.max_bytes
+                rows = self._conn.execute(
+                    "SELECT stored_at, size FROM omdb_cache ORDER BY stored_at"
+                )
+                for stored_at, size in rows:
+                    excess -= size
+                    cutoff = stored_at
+                    if excess <= 0:
+                        break
+                removed += self._conn.execute(
+                    "DELETE FROM omdb_cache WHERE stored_at <= ?", (cutoff,)
+                ).rowcount
+
+        if removed:
+            logger.info(f"OMDB disk cache compacted: {removed} entries removed")
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM omdb_cache"
+            ).fetchone()
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _seed(cache: DiskCache, source: str, ttl: float) -> int:
+    """Carrega um arquivo JSONL com linhas {"params": {...}, "payload": {...}}"""
+    count = 0
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            cache.set_sync(entry["params"], entry["payload"], ttl)
+            count += 1
+    return count
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description="OMDB disk cache maintenance")
+    parser.add_argument("--path", default=settings.OMDB_DISK_CACHE_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    seed_parser = subparsers.add_parser("seed", help="load payloads from JSONL")
+    seed_parser.add_argument("source")
+    seed_parser.add_argument("--ttl", type=float, default=settings.OMDB_DISK_CACHE_TTL)
+    subparsers.add_parser("compact", help="drop expired and oldest entries")
+    subparsers.add_parser("stats", help="print cache statistics")
+    args = parser.parse_args(argv)
+
+    if not args.path:
+        parser.error("OMDB_DISK_CACHE_PATH is not configured, use --path")
+
+    cache = DiskCache(args.path, max_bytes=settings.OMDB_DISK_CACHE_MAX_BYTES)
+    try:
+        if args.command == "seed":
+            print(f"{_seed(cache, args.source, args.ttl)} entries loaded")
+        elif args.command == "compact":
+            print(f"{cache.compact_sync()} entries removed")
+        print(json.dumps(cache.stats()))
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
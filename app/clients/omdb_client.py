@@ -1,20 +1,79 @@
+import asyncio
+import importlib.util
 import logging
-from typing import Optional
+import math
+import re
+from collections.abc import AsyncIterator
+from datetime import date, datetime
+from typing import Any, Optional
 
 import httpx
 
+from app.clients.cache import TTLCache
+from app.clients.disk_cache import DiskCache
+from app.clients.rate_limiter import OMDBRateLimiter
+from app.clients.resilience import CircuitBreaker, RetryPolicy
 from app.core.config import settings
-from app.core.exceptions import ExternalAPIError, MovieNotFoundError
+from app.core.exceptions import (
+    ExternalAPIError,
+    MovieNotFoundError,
+    QuotaExceededError,
+)
+from app.core.titles import normalize_title
 
 logger = logging.getLogger(__name__)
 
+# A busca "s=" da OMDB devolve sempre 10 resultados por página
+SEARCH_PAGE_SIZE = 10
+
+# "1999", "2008–2013" (séries) ou "2019–" (série em exibição)
+_YEAR_RANGE = re.compile(r"^\s*(\d{4})\s*(?:([–-])\s*(\d{4})?)?\s*$")
+_RUNTIME = re.compile(r"^\s*(\d+)\s*min\s*$")
+
+# Marca no cache um título que a OMDB respondeu como inexistente
+_NOT_FOUND = object()
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Cliente HTTP compartilhado (pool com keep-alive) para a OMDB"""
+    http2 = settings.OMDB_HTTP2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("OMDB_HTTP2 enabled but 'h2' is not installed, using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        timeout=settings.OMDB_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=settings.OMDB_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OMDB_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OMDB_KEEPALIVE_EXPIRY,
+        ),
+        http2=http2,
+    )
+
 
 class OMDBClient:
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[TTLCache] = None,
+        disk_cache: Optional[DiskCache] = None,
+        rate_limiter: Optional[OMDBRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        search_cache: Optional[TTLCache] = None,
+    ) -> None:
         self.base_url = settings.OMDB_BASE_URL
         self.api_key = settings.OMDB_API_KEY
-        self.timeout = 10.0
+        self.timeout = settings.OMDB_TIMEOUT
+        self.http_client = http_client
+        self.cache = cache
+        self.disk_cache = disk_cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.search_cache = search_cache
 
     async def search_movie_by_title(self, title: str) -> dict:
         params = {
@@ -23,19 +82,89 @@ class OMDBClient:
             "plot": "full",
             "type": "movie",
         }
+        return await self._lookup(("t", normalize_title(title)), params, f"'{title}'")
+
+    async def get_movie_by_imdb_id(self, imdb_id: str) -> dict:
+        params = {
+            "apikey": self.api_key,
+            "i": imdb_id,
+            "plot": "full",
+            "type": "movie",
+        }
+        return await self._lookup(("i", imdb_id.lower()), params, imdb_id)
+
+    async def search_movies(self, query: str, page: int = 1) -> dict:
+        cache_key = ("s", normalize_title(query), page)
+        if self.search_cache is not None:
+            cached = self.search_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        params = {
+            "apikey": self.api_key,
+            "s": query,
+            "type": "movie",
+            "page": page,
+        }
+        try:
+            data = await self._get(params)
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error: {e}")
+            raise ExternalAPIError(f"Failed to fetch from OMDB: {e}") from e
+        except httpx.RequestError as e:
+            logger.error(f"Request error: {e}")
+            raise ExternalAPIError(f"Failed to connect to OMDB: {e}") from e
+
+        result = self._parse_search_response(query, page, data)
+        if self.search_cache is not None:
+            self.search_cache.set(cache_key, result, settings.OMDB_SEARCH_CACHE_TTL)
+        return result
+
+    async def iter_search(self, query: str, max_pages: int) -> AsyncIterator[dict]:
+        """Entrega as páginas em ordem, buscando a próxima enquanto a atual
+        é consumida"""
+        page = 1
+        current: Optional[asyncio.Future[dict]] = asyncio.ensure_future(
+            self.search_movies(query, page)
+        )
+        try:
+            while current is not None:
+                result = await current
+                current = None
+                if page < min(max_pages, result["total_pages"]):
+                    current = asyncio.ensure_future(self.search_movies(query, page + 1))
+                yield result
+                page += 1
+        finally:
+            if current is not None:
+                current.cancel()
+                # evita "exception was never retrieved" se a página já falhou
+                current.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+    async def _lookup(self, cache_key: tuple, params: dict, label: str) -> dict:
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is _NOT_FOUND:
+                raise MovieNotFoundError(f"Movie {label} not found in OMDB")
+            if cached is not None:
+                return dict(cached)
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.base_url, params=params)
-                response.raise_for_status()
-                data = response.json()
+            data = await self._get(params)
 
-                if data.get("Response") == "False":
-                    error_msg = data.get("Error", "Movie not found")
-                    logger.warning(f"Movie not found: {title} - {error_msg}")
-                    raise MovieNotFoundError(f"Movie '{title}' not found in OMDB")
+            if data.get("Response") == "False":
+                error_msg = data.get("Error", "Movie not found")
+                logger.warning(f"Movie not found: {label} - {error_msg}")
+                if self.cache is not None:
+                    self.cache.set(
+                        cache_key, _NOT_FOUND, settings.OMDB_CACHE_NEGATIVE_TTL
+                    )
+                raise MovieNotFoundError(f"Movie {label} not found in OMDB")
 
-                return self._parse_omdb_response(data)
+            movie_data = self._parse_omdb_response(data)
+            if self.cache is not None:
+                self.cache.set(cache_key, dict(movie_data), settings.OMDB_CACHE_TTL)
+            return movie_data
 
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error: {e}")
@@ -44,7 +173,139 @@ class OMDBClient:
             logger.error(f"Request error: {e}")
             raise ExternalAPIError(f"Failed to connect to OMDB: {e}") from e
 
+    def stats(self) -> dict[str, Any]:
+        return {
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "disk_cache": (
+                self.disk_cache.stats() if self.disk_cache is not None else None
+            ),
+            "rate_limiter": (
+                self.rate_limiter.stats() if self.rate_limiter is not None else None
+            ),
+            "retry": (
+                self.retry_policy.stats() if self.retry_policy is not None else None
+            ),
+            "circuit_breaker": (
+                self.circuit_breaker.stats()
+                if self.circuit_breaker is not None
+                else None
+            ),
+            "search_cache": (
+                self.search_cache.stats() if self.search_cache is not None else None
+            ),
+        }
+
+    async def aclose(self) -> None:
+        if self.http_client is not None:
+            await self.http_client.aclose()
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+
+    async def _get(self, params: dict) -> dict:
+        if self.disk_cache is not None:
+            cached = await self.disk_cache.get(params)
+            if cached is not None:
+                return cached
+
+        try:
+            data = await self._request_with_retry(params)
+        except httpx.HTTPStatusError as e:
+            if not self._is_request_limit_error(e.response):
+                raise
+            logger.error("OMDB request limit reached")
+            retry_after = None
+            if self.rate_limiter is not None:
+                self.rate_limiter.budget.exhaust()
+                retry_after = self.rate_limiter.budget.seconds_until_reset()
+            raise QuotaExceededError(
+                "OMDB request limit reached", retry_after=retry_after
+            ) from e
+
+        if self.disk_cache is not None:
+            ttl = (
+                settings.OMDB_DISK_CACHE_NEGATIVE_TTL
+                if data.get("Response") == "False"
+                else settings.OMDB_DISK_CACHE_TTL
+            )
+            await self.disk_cache.set(params, data, ttl)
+        return data
+
+    async def _request_with_retry(self, params: dict) -> dict:
+        breaker = self.circuit_breaker
+        attempts = self.retry_policy.max_attempts if self.retry_policy else 1
+
+        attempt = 0
+        while True:
+            if breaker is not None:
+                breaker.before_call()
+            try:
+                data = await self._limited_request(params)
+            except (httpx.RequestError, httpx.HTTPStatusError) as e:
+                if not self._is_transient(e):
+                    # 4xx: a OMDB respondeu, então o circuito não conta falha
+                    if breaker is not None:
+                        breaker.record_success()
+                    raise
+                if breaker is not None:
+                    breaker.record_failure()
+                if self.retry_policy is None:
+                    raise
+                if attempt + 1 >= attempts:
+                    self.retry_policy.exhausted += 1
+                    raise
+
+                delay = self.retry_policy.delay(attempt)
+                self.retry_policy.retries += 1
+                attempt += 1
+                logger.warning(f"OMDB request failed ({e}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+            except BaseException:
+                if breaker is not None:
+                    breaker.release_probe()
+                raise
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+                return data
+
+    async def _limited_request(self, params: dict) -> dict:
+        if self.rate_limiter is None:
+            return await self._request(params)
+
+        async with self.rate_limiter.acquire():
+            return await self._request(params)
+
+    async def _request(self, params: dict) -> dict:
+        if self.http_client is not None:
+            return await self._send(self.http_client, params)
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            return await self._send(client, params)
+
+    async def _send(self, client: httpx.AsyncClient, params: dict) -> dict:
+        response = await client.get(self.base_url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _is_transient(error: httpx.HTTPError) -> bool:
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code >= 500
+        return True
+
+    @staticmethod
+    def _is_request_limit_error(response: httpx.Response) -> bool:
+        # a OMDB responde 401 com "Request limit reached!" quando a cota acaba
+        if response.status_code != 401:
+            return False
+        try:
+            error = response.json().get("Error", "")
+        except ValueError:
+            return False
+        return "limit" in str(error).lower()
+
     def _parse_omdb_response(self, data: dict) -> dict:
+        year_start, year_end = self._parse_year_range(data.get("Year"))
         return {
             "imdb_id": data.get("imdbID"),
             "title": data.get("Title"),
@@ -61,8 +322,64 @@ class OMDBClient:
             "awards": data.get("Awards"),
             "language": data.get("Language"),
             "country": data.get("Country"),
+            "year_start": year_start,
+            "year_end": year_end,
+            "runtime_minutes": self._parse_runtime(data.get("Runtime")),
+            "released_date": self._parse_date(data.get("Released")),
+        }
+
+    def _parse_search_response(self, query: str, page: int, data: dict) -> dict:
+        # "Movie not found!" e "Too many results." viram uma página vazia
+        if data.get("Response") == "False":
+            total = 0
+            items = []
+        else:
+            total = int(data.get("totalResults") or 0)
+            items = data.get("Search") or []
+        return {
+            "query": query,
+            "page": page,
+            "total_results": total,
+            "total_pages": math.ceil(total / SEARCH_PAGE_SIZE),
+            "results": [
+                {
+                    "imdb_id": item.get("imdbID"),
+                    "title": item.get("Title"),
+                    "year": item.get("Year"),
+                    "type": item.get("Type"),
+                    "poster": item.get("Poster"),
+                }
+                for item in items
+            ],
         }
 
+    @staticmethod
+    def _parse_year_range(value: Optional[str]) -> tuple[Optional[int], Optional[int]]:
+        """(início, fim) do campo Year; fim None para série ainda em exibição"""
+        match = _YEAR_RANGE.match(value or "")
+        if match is None:
+            return None, None
+        start, dash, end = match.groups()
+        if dash is None:
+            return int(start), int(start)
+        return int(start), int(end) if end else None
+
+    @staticmethod
+    def _parse_runtime(value: Optional[str]) -> Optional[int]:
+        """Minutos do campo Runtime ("136 min")"""
+        match = _RUNTIME.match(value or "")
+        return int(match.group(1)) if match else None
+
+    @staticmethod
+    def _parse_date(value: Optional[str]) -> Optional[date]:
+        """Data do campo Released ("31 Mar 1999")"""
+        if not value or value == "N/A":
+            return None
+        try:
+            return datetime.strptime(value.strip(), "%d %b %Y").date()
+        except ValueError:
+            return None
+
     @staticmethod
     def _parse_float(value: Optional[str]) -> Optional[float]:
         if not value or value == "N/A":
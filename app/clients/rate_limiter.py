@@ -0,0 +1,184 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from app.core.exceptions import QuotaExceededError
+
+
+class TokenBucket:
+    """Limita a taxa de requisições (rate por segundo, com rajada de capacity)"""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # o lock mantém a ordem de chegada entre os que esperam
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limite de concorrência AIMD guiado por latência e taxa de erros"""
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        target_latency: float,
+        backoff: float = 0.7,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency: float, success: bool) -> None:
+        async with self._cond:
+            self.in_flight -= 1
+            if success and latency <= self.target_latency:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            else:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+            self._cond.notify_all()
+
+
+class DailyBudget:
+    """Contador de requisições por dia (UTC); zero significa sem limite"""
+
+    def __init__(
+        self,
+        limit: int,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ) -> None:
+        self.limit = limit
+        self._clock = clock
+        self.used = 0
+        self._day = clock().date()
+
+    def try_consume(self) -> bool:
+        self._roll_over()
+        if self.limit and self.used >= self.limit:
+            return False
+        self.used += 1
+        return True
+
+    def refund(self, day: date) -> None:
+        """Devolve uma requisição consumida em day que não chegou à OMDB"""
+        self._roll_over()
+        if day == self._day and self.used:
+            self.used -= 1
+
+    @property
+    def day(self) -> date:
+        self._roll_over()
+        return self._day
+
+    def exhaust(self) -> None:
+        self._roll_over()
+        if self.limit:
+            self.used = self.limit
+
+    @property
+    def remaining(self) -> int | None:
+        self._roll_over()
+        return max(0, self.limit - self.used) if self.limit else None
+
+    def seconds_until_reset(self) -> float:
+        now = self._clock()
+        tomorrow = datetime.combine(
+            now.date() + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc
+        )
+        return (tomorrow - now).total_seconds()
+
+    def _roll_over(self) -> None:
+        today = self._clock().date()
+        if today != self._day:
+            self._day = today
+            self.used = 0
+
+
+class OMDBRateLimiter:
+    """Limitador único do processo para todas as chamadas à OMDB"""
+
+    def __init__(
+        self,
+        bucket: TokenBucket,
+        concurrency: AdaptiveConcurrencyLimiter,
+        budget: DailyBudget,
+    ) -> None:
+        self.bucket = bucket
+        self.concurrency = concurrency
+        self.budget = budget
+        self.rejected = 0
+        self.errors = 0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        if not self.budget.try_consume():
+            self.rejected += 1
+            retry_after = self.budget.seconds_until_reset()
+            raise QuotaExceededError(
+                "OMDB daily request budget exhausted", retry_after=retry_after
+            )
+
+        day = self.budget.day
+        try:
+            await self.bucket.acquire()
+            await self.concurrency.acquire()
+        except BaseException:
+            # cancelada ou expirada na fila: a OMDB não foi chamada
+            self.budget.refund(day)
+            raise
+        started = time.monotonic()
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            if not success:
+                self.errors += 1
+            await self.concurrency.release(time.monotonic() - started, success)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "rate_per_second": self.bucket.rate,
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+            "daily_limit": self.budget.limit or None,
+            "daily_used": self.budget.used,
+            "daily_remaining": self.budget.remaining,
+            "rejected": self.rejected,
+            "errors": self.errors,
+        }
@@ -0,0 +1,107 @@
+import random
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.core.exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Abre após falhas seguidas e libera uma sonda depois de recovery_timeout"""
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        recovery_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+
+    def before_call(self) -> None:
+        if self.state == CLOSED:
+            return
+
+        if self.state == OPEN:
+            if self._clock() - self.opened_at < self.recovery_timeout:
+                self._reject()
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+
+        # meio-aberto: apenas uma requisição de sonda por vez
+        if self._probe_in_flight:
+            self._reject()
+        self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == OPEN:
+            # chamadas que já estavam em curso quando abriu não adiam a sonda
+            return
+        if self.state == HALF_OPEN or (
+            self.consecutive_failures >= self.failure_threshold
+        ):
+            self.times_opened += 1
+            self.state = OPEN
+            self.opened_at = self._clock()
+
+    def release_probe(self) -> None:
+        """Libera a sonda quando a chamada terminou sem falar com a OMDB"""
+        self._probe_in_flight = False
+
+    def retry_after(self) -> float:
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (self._clock() - self.opened_at))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+    def _reject(self) -> None:
+        self.rejected += 1
+        raise CircuitOpenError(
+            "OMDB circuit breaker is open", retry_after=self.retry_after()
+        )
+
+
+class RetryPolicy:
+    """Novas tentativas com backoff exponencial e jitter completo"""
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float) -> None:
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self.exhausted = 0
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_attempts": self.max_attempts,
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+        }
@@ -0,0 +1,216 @@
+import gzip
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.clients.cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # opcional: sem o pacote, só gzip
+    brotli = None
+
+# em empate de q, a ordem de preferência do servidor
+ENCODINGS = ("br", "gzip")
+
+
+def available_encodings() -> tuple[str, ...]:
+    return ENCODINGS if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Encoding de maior q no Accept-Encoding entre os disponíveis (None:
+    resposta sem compressão)"""
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def weak_etag(etag: str) -> str:
+    """A representação comprimida não é idêntica byte a byte à original"""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class _StreamCompressor:
+    """Compressão incremental para respostas em streaming: cada pedaço sai
+    com flush, para o cliente receber os dados assim que são gerados"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(
+                gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            )
+
+    def process(self, chunk: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(chunk) + self._brotli.flush()
+        return self._zlib.compress(chunk) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """gzip (ou brotli, se instalado) negociado pelo Accept-Encoding
+
+    Respostas menores que minimum_size seguem sem compressão. Com cache, os
+    bytes comprimidos de respostas 200 com ETag ficam guardados por (ETag,
+    encoding) e a mesma página não é comprimida de novo a cada requisição.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+        cache: Optional[TTLCache] = None,
+        cache_ttl: float = 300.0,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""))
+        responder = _CompressionResponder(
+            self, encoding, request_headers.get("if-none-match", ""), send
+        )
+        await self.app(scope, receive, responder.send)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        # mtime=0: mesma entrada, mesmos bytes
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def compress_cached(self, encoding: str, body: bytes, etag: Optional[str]) -> bytes:
+        if self.cache is None or etag is None:
+            return self.compress(encoding, body)
+        key = (etag, encoding)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = self.compress(encoding, body)
+            self.cache.set(key, compressed, self.cache_ttl)
+        return compressed
+
+
+class _CompressionResponder:
+    """Estado de uma resposta: o http.response.start fica retido até o
+    primeiro pedaço do corpo decidir se há compressão"""
+
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        encoding: Optional[str],
+        if_none_match: str,
+        send: Send,
+    ) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self.if_none_match = if_none_match
+        self._send = send
+        self.start: Optional[Message] = None
+        self.started = False
+        self.compressor: Optional[_StreamCompressor] = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.start is None:
+            await self._send(message)
+            return
+
+        if self.started:
+            await self._send_body(message)
+            return
+        self.started = True
+
+        headers = MutableHeaders(scope=self.start)
+        headers.add_vary_header("Accept-Encoding")
+        status = self.start["status"]
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if (
+            self.encoding is None
+            or "content-encoding" in headers
+            or status < 200
+            or status in (204, 304)
+            or (not more_body and len(body) < self.middleware.minimum_size)
+        ):
+            etag = headers.get("etag")
+            if status == 304 and etag and weak_etag(etag) in self.if_none_match:
+                # o 304 confirma o validador que o cliente tem (o da resposta
+                # comprimida); abaixo de minimum_size ele recebeu o forte
+                headers["ETag"] = weak_etag(etag)
+            await self._send(self.start)
+            await self._send(message)
+            return
+
+        etag = headers.get("etag")
+        headers["Content-Encoding"] = self.encoding
+        if etag is not None:
+            headers["ETag"] = weak_etag(etag)
+
+        if not more_body:
+            # só ETags fortes garantem o mesmo corpo byte a byte
+            if status != 200 or (etag is not None and etag.startswith("W/")):
+                etag = None
+            compressed = self.middleware.compress_cached(self.encoding, body, etag)
+            headers["Content-Length"] = str(len(compressed))
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": compressed})
+            return
+
+        # streaming: tamanho desconhecido, comprime pedaço a pedaço
+        del headers["Content-Length"]
+        self.compressor = _StreamCompressor(
+            self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+        )
+        await self._send(self.start)
+        await self._send_body(message)
+
+    async def _send_body(self, message: Message) -> None:
+        if self.compressor is None:
+            await self._send(message)
+            return
+        more_body = message.get("more_body", False)
+        chunk = self.compressor.process(message.get("body", b""))
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self._send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
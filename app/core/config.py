@@ -22,6 +22,12 @@ class Settings(BaseSettings):
     POSTGRES_PORT: int = 5432
     POSTGRES_DB: str
     DATABASE_URL: PostgresDsn | None = None
+    # réplicas de leitura (DSNs postgresql+asyncpg); vazio lê do primário
+    DATABASE_REPLICA_URLS: List[str] = []
+    # após uma escrita, o cliente lê do primário por esse tempo (segundos)
+    DB_READ_YOUR_WRITES_WINDOW: float = 5.0
+    # com o schema gerido pelo Alembic, desligue para os workers não rodarem DDL
+    DB_INIT_ON_STARTUP: bool = True
 
     @field_validator("DATABASE_URL", mode="before")
     @classmethod
@@ -42,6 +48,56 @@ class Settings(BaseSettings):
 
     OMDB_API_KEY: str
     OMDB_BASE_URL: str = "http://www.omdbapi.com/"
+    OMDB_TIMEOUT: float = 10.0
+    OMDB_MAX_CONNECTIONS: int = 100
+    OMDB_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OMDB_KEEPALIVE_EXPIRY: float = 30.0
+    OMDB_HTTP2: bool = False
+
+    OMDB_CACHE_MAX_SIZE: int = 1024
+    OMDB_CACHE_TTL: float = 86400.0
+    OMDB_CACHE_NEGATIVE_TTL: float = 600.0
+
+    OMDB_DISK_CACHE_PATH: str | None = None
+    OMDB_DISK_CACHE_TTL: float = 30 * 86400.0
+    OMDB_DISK_CACHE_NEGATIVE_TTL: float = 86400.0
+    OMDB_DISK_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
+    OMDB_RATE_LIMIT_PER_SECOND: float = 10.0
+    OMDB_RATE_LIMIT_BURST: int = 10
+    OMDB_DAILY_REQUEST_LIMIT: int = 1000
+    OMDB_MAX_CONCURRENCY: int = 10
+    OMDB_MIN_CONCURRENCY: int = 1
+    OMDB_TARGET_LATENCY: float = 1.0
+
+    OMDB_RETRY_ATTEMPTS: int = 3
+    OMDB_RETRY_BASE_DELAY: float = 0.2
+    OMDB_RETRY_MAX_DELAY: float = 2.0
+    OMDB_BREAKER_FAILURE_THRESHOLD: int = 5
+    OMDB_BREAKER_RECOVERY_TIMEOUT: float = 30.0
+
+    OMDB_BATCH_CONCURRENCY: int = 8
+
+    OMDB_SEARCH_MAX_PAGES: int = 10
+    OMDB_SEARCH_CACHE_MAX_SIZE: int = 2048
+    OMDB_SEARCH_CACHE_TTL: float = 3600.0
+
+    MOVIE_COUNT_CACHE_TTL: float = 30.0
+    MOVIE_COUNT_ESTIMATE_THRESHOLD: int = 100_000
+
+    # linhas por lote lido do cursor no servidor (e por flush) no export
+    MOVIE_EXPORT_CHUNK_SIZE: int = 1000
+
+    # max-age do Cache-Control nas leituras com ETag (0: sempre revalida)
+    HTTP_CACHE_MAX_AGE: int = 0
+
+    # gzip (brotli se o pacote estiver instalado) acima deste tamanho (bytes)
+    HTTP_COMPRESSION_MIN_SIZE: int = 1024
+    HTTP_GZIP_LEVEL: int = 6
+    HTTP_BROTLI_QUALITY: int = 5
+    # bytes comprimidos guardados por (ETag, encoding); 0 desativa
+    HTTP_COMPRESSION_CACHE_MAX_SIZE: int = 256
+    HTTP_COMPRESSION_CACHE_TTL: float = 300.0
 
     CORS_ORIGINS: List[str] = ["*"]
 
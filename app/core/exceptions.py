@@ -20,3 +20,31 @@ class ExternalAPIError(MovieAPIException):
     """Erro ao chamar API externa (OMDB)"""
 
     pass
+
+
+class QuotaExceededError(ExternalAPIError):
+    """Cota diária de requisições à OMDB esgotada"""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(ExternalAPIError):
+    """Circuit breaker da OMDB aberto - falha rápida sem chamar a API"""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class InvalidCursorError(MovieAPIException):
+    """Cursor de paginação malformado ou adulterado"""
+
+    pass
+
+
+class InvalidFieldsError(MovieAPIException):
+    """Parâmetro fields com campos que a resposta não tem"""
+
+    pass
@@ -0,0 +1,51 @@
+import hashlib
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import settings
+
+
+def movie_etag(
+    movie_id: int, updated_at: datetime, fields: Optional[Iterable[str]] = None
+) -> str:
+    """ETag forte de um filme: muda a cada escrita (updated_at) e difere por
+    fieldset, já que cada fields= é outra representação"""
+    etag = f"{movie_id}-{updated_at.strftime('%Y%m%d%H%M%S%f')}"
+    if fields is not None:
+        etag += "-" + hashlib.sha1(",".join(fields).encode()).hexdigest()[:8]
+    return f'"{etag}"'
+
+
+def collection_etag(
+    version: tuple[Optional[int], Optional[datetime], Optional[int]],
+    query: Iterable[tuple[str, str]],
+) -> str:
+    """ETag de uma página da listagem: versão da coleção (contador,
+    max(updated_at), max(id)) mais a query string (em qualquer ordem), que
+    define filtros, página e campos"""
+    counter, updated_at, last_id = version
+    stamp = updated_at.isoformat() if updated_at is not None else ""
+    params = "&".join(f"{key}={value}" for key, value in sorted(query))
+    digest = hashlib.sha1(f"{counter}|{stamp}|{last_id}|{params}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparação fraca do If-None-Match (RFC 9110): lista, "*" e W/"..." """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    """ETag e Cache-Control de uma resposta de leitura; com max-age 0 o
+    cliente revalida sempre, mas uma resposta 304 não traz corpo"""
+    return {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.HTTP_CACHE_MAX_AGE}",
+    }
@@ -0,0 +1,23 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from app.core.exceptions import InvalidCursorError
+
+
+def encode_cursor(created_at: datetime, movie_id: int) -> str:
+    """Cursor opaco com a chave (created_at, id) do último item da página"""
+    raw = json.dumps([created_at.isoformat(), movie_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, movie_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(movie_id, int):
+            raise TypeError(movie_id)
+        return datetime.fromisoformat(created_at), movie_id
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
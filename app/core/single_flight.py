@@ -0,0 +1,31 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Agrupa chamadas concorrentes com a mesma chave em uma única execução"""
+
+    def __init__(self) -> None:
+        self._in_flight: dict[Any, asyncio.Task[T]] = {}
+
+    async def do(self, key: Any, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        # shield: cancelar um dos chamadores não cancela o trabalho dos demais
+        return await asyncio.shield(task)
+
+    def in_flight(self, key: Any) -> bool:
+        return key in self._in_flight
+
+    def _forget(self, key: Any, task: asyncio.Task[T]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # evita "Task exception was never retrieved" quando todos cancelaram
+            task.exception()
@@ -0,0 +1,30 @@
+import unicodedata
+
+
+def normalize_title(title: str) -> str:
+    """Chave canônica de um título (sem diferença de caixa ou espaços)"""
+    return " ".join(title.split()).casefold()
+
+
+def title_key(title: str) -> str:
+    """Chave de unicidade no banco: além de caixa e espaços, ignora pontuação
+    e variações Unicode de compatibilidade ("Spider-Man" == "spider man")"""
+    text = unicodedata.normalize("NFKC", title).casefold()
+    text = "".join(
+        " " if unicodedata.category(char).startswith("P") else char for char in text
+    )
+    return " ".join(text.split())
+
+
+def split_names(value: str | None) -> list[str]:
+    """Itens de um campo OMDB separado por vírgulas ("Action, Sci-Fi"), sem
+    vazios, "N/A" ou repetidos (comparados por title_key)"""
+    if not value:
+        return []
+    names: dict[str, str] = {}
+    for name in value.split(","):
+        name = " ".join(name.split())
+        key = title_key(name)
+        if key and name != "N/A":
+            names.setdefault(key, name)
+    return list(names.values())
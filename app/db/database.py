@@ -1,10 +1,22 @@
+import itertools
+import time
 from collections.abc import AsyncGenerator
+from typing import Annotated, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Depends, Request, Response
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
 
+# cookie com o instante até o qual as leituras do cliente vão ao primário
+READ_PRIMARY_COOKIE = "read_primary_until"
+
 
 class Base(DeclarativeBase):
     """Base para todos os models"""
@@ -12,21 +24,34 @@ class Base(DeclarativeBase):
     pass
 
 
-engine = create_async_engine(
-    str(settings.DATABASE_URL),
-    echo=False,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=False,
+        pool_pre_ping=True,
+        pool_size=10,
+        max_overflow=20,
+    )
+
+
+def _create_sessionmaker(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
 
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+
+engine = _create_engine(str(settings.DATABASE_URL))
+
+AsyncSessionLocal = _create_sessionmaker(engine)
+
+# um pool por réplica, escolhidas em round-robin
+replica_engines = [_create_engine(url) for url in settings.DATABASE_REPLICA_URLS]
+ReplicaSessions = [_create_sessionmaker(replica) for replica in replica_engines]
+_replica_index = itertools.count()
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -38,7 +63,65 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def reads_from_primary(request: Request) -> bool:
+    """Cliente escreveu há pouco e ainda pode não ver a escrita na réplica"""
+    try:
+        until = float(request.cookies.get(READ_PRIMARY_COOKIE, 0))
+    except ValueError:
+        return False
+    return until > time.time()
+
+
+def mark_recent_write(response: Response) -> None:
+    """Fixa as leituras do cliente no primário pela janela de read-your-writes"""
+    if not ReplicaSessions or settings.DB_READ_YOUR_WRITES_WINDOW <= 0:
+        return
+    window = settings.DB_READ_YOUR_WRITES_WINDOW
+    response.set_cookie(
+        READ_PRIMARY_COOKIE,
+        f"{time.time() + window:.3f}",
+        max_age=int(window) + 1,
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def _replica_sessionmaker(
+    request: Request,
+) -> Optional[async_sessionmaker[AsyncSession]]:
+    """Próxima réplica do round-robin; None se a leitura deve ir ao primário"""
+    if not ReplicaSessions or reads_from_primary(request):
+        return None
+    return ReplicaSessions[next(_replica_index) % len(ReplicaSessions)]
+
+
+async def get_read_db(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency para leituras - sessão de uma réplica, ou a do primário
+    (get_db) sem réplicas configuradas ou logo após uma escrita do cliente"""
+    sessionmaker = _replica_sessionmaker(request)
+    # a sessão do primário só abre conexão no primeiro uso
+    if sessionmaker is None:
+        yield db
+        return
+
+    async with sessionmaker() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def get_read_sessionmaker(request: Request) -> async_sessionmaker[AsyncSession]:
+    """Dependency para leituras em streaming - a fábrica de sessões (réplica ou
+    primário), para a sessão ser aberta dentro do stream: dependências com
+    yield terminam antes de o corpo da resposta ser enviado"""
+    return _replica_sessionmaker(request) or AsyncSessionLocal
+
+
 async def init_db() -> None:
-    """Cria tabelas no startup"""
+    """Cria tabelas no startup (desenvolvimento; em produção use o Alembic)"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
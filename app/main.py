@@ -1,21 +1,88 @@
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.endpoints import movies
+from app.clients.cache import TTLCache
+from app.clients.disk_cache import DiskCache
+from app.clients.omdb_client import OMDBClient, create_http_client
+from app.clients.rate_limiter import (
+    AdaptiveConcurrencyLimiter,
+    DailyBudget,
+    OMDBRateLimiter,
+    TokenBucket,
+)
+from app.clients.resilience import CircuitBreaker, RetryPolicy
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
 from app.db.database import init_db
 
 
+async def build_omdb_client() -> OMDBClient:
+    """Cliente OMDB do processo com os recursos compartilhados configurados"""
+    cache = None
+    if settings.OMDB_CACHE_MAX_SIZE > 0:
+        cache = TTLCache(settings.OMDB_CACHE_MAX_SIZE)
+
+    search_cache = None
+    if settings.OMDB_SEARCH_CACHE_MAX_SIZE > 0:
+        search_cache = TTLCache(settings.OMDB_SEARCH_CACHE_MAX_SIZE)
+
+    disk_cache = None
+    if settings.OMDB_DISK_CACHE_PATH:
+        disk_cache = DiskCache(
+            settings.OMDB_DISK_CACHE_PATH,
+            max_bytes=settings.OMDB_DISK_CACHE_MAX_BYTES,
+        )
+        await disk_cache.compact()
+
+    rate_limiter = OMDBRateLimiter(
+        bucket=TokenBucket(
+            settings.OMDB_RATE_LIMIT_PER_SECOND, settings.OMDB_RATE_LIMIT_BURST
+        ),
+        concurrency=AdaptiveConcurrencyLimiter(
+            initial=settings.OMDB_MAX_CONCURRENCY,
+            min_limit=settings.OMDB_MIN_CONCURRENCY,
+            max_limit=settings.OMDB_MAX_CONCURRENCY,
+            target_latency=settings.OMDB_TARGET_LATENCY,
+        ),
+        budget=DailyBudget(settings.OMDB_DAILY_REQUEST_LIMIT),
+    )
+
+    return OMDBClient(
+        http_client=create_http_client(),
+        cache=cache,
+        disk_cache=disk_cache,
+        rate_limiter=rate_limiter,
+        retry_policy=RetryPolicy(
+            max_attempts=settings.OMDB_RETRY_ATTEMPTS,
+            base_delay=settings.OMDB_RETRY_BASE_DELAY,
+            max_delay=settings.OMDB_RETRY_MAX_DELAY,
+        ),
+        circuit_breaker=CircuitBreaker(
+            failure_threshold=settings.OMDB_BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=settings.OMDB_BREAKER_RECOVERY_TIMEOUT,
+        ),
+        search_cache=search_cache,
+    )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     if not settings.OMDB_API_KEY:
         raise ValueError("OMDB_API_KEY não configurada!")
 
-    await init_db()
-    yield
+    if settings.DB_INIT_ON_STARTUP:
+        await init_db()
+
+    omdb_client = await build_omdb_client()
+    app.state.omdb_client = omdb_client
+    try:
+        yield
+    finally:
+        await omdb_client.aclose()
 
 
 app = FastAPI(
@@ -24,6 +91,19 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.HTTP_COMPRESSION_MIN_SIZE,
+    gzip_level=settings.HTTP_GZIP_LEVEL,
+    brotli_quality=settings.HTTP_BROTLI_QUALITY,
+    cache=(
+        TTLCache(settings.HTTP_COMPRESSION_CACHE_MAX_SIZE)
+        if settings.HTTP_COMPRESSION_CACHE_MAX_SIZE > 0
+        else None
+    ),
+    cache_ttl=settings.HTTP_COMPRESSION_CACHE_TTL,
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
@@ -38,3 +118,9 @@ app.include_router(movies.router, prefix="/api/v1")
 @app.get("/health")
 async def health_check() -> dict[str, str]:
     return {"status": "healthy"}
+
+
+@app.get("/health/omdb")
+async def omdb_health() -> dict[str, Any]:
+    omdb_client = getattr(app.state, "omdb_client", None)
+    return omdb_client.stats() if omdb_client is not None else {}
@@ -1,21 +1,56 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Float, Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Date,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+)
+from sqlalchemy.orm import Mapped, mapped_column, validates
 
+from app.core.titles import title_key
 from app.db.database import Base
 
 
+# Busca textual (PostgreSQL): coluna gerada com pesos por campo e índice GIN.
+# Fica fora do mapper porque não existe no SQLite; ver MovieRepository.search
+SEARCH_CONFIG = "english"
+SEARCH_VECTOR_COLUMN = "search_vector"
+SEARCH_VECTOR_INDEX = "ix_movies_search_vector"
+SEARCH_VECTOR_EXPRESSION = " || ".join(
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({name}, '')), '{weight}')"
+    for name, weight in (
+        ("title", "A"),
+        ("director", "B"),
+        ("actors", "B"),
+        ("writer", "C"),
+        ("plot", "D"),
+    )
+)
+
+
 class Movie(Base):
     """Model representa tabela movies no banco"""
 
     __tablename__ = "movies"
+    # chave da paginação por cursor: ORDER BY created_at DESC, id DESC
+    __table_args__ = (Index("ix_movies_created_at_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    imdb_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
-    title: Mapped[str] = mapped_column(
-        String(255), unique=True, index=True, nullable=False
+    imdb_id: Mapped[Optional[str]] = mapped_column(
+        String(50), unique=True, index=True, nullable=True
+    )
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    # unicidade e buscas por título usam a forma normalizada (ver title_key)
+    title_normalized: Mapped[str] = mapped_column(
+        Text, unique=True, index=True, nullable=False
     )
     plot: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     released: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
@@ -30,12 +65,62 @@ class Movie(Base):
     country: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     awards: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     imdb_rating: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    # versões tipadas de year/runtime/released para filtros e ordenação
+    year_start: Mapped[Optional[int]] = mapped_column(
+        Integer, index=True, nullable=True
+    )
+    # igual a year_start para filmes; None em série ainda em exibição
+    year_end: Mapped[Optional[int]] = mapped_column(Integer, index=True, nullable=True)
+    runtime_minutes: Mapped[Optional[int]] = mapped_column(
+        Integer, index=True, nullable=True
+    )
+    released_date: Mapped[Optional[date]] = mapped_column(
+        Date, index=True, nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
     )
+    # indexado: max(updated_at) é a versão da coleção (ETag das listagens)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        index=True,
+        nullable=False,
     )
 
+    @validates("title")
+    def _set_title_normalized(self, key: str, title: str) -> str:
+        self.title_normalized = title_key(title)
+        return title
+
     def __repr__(self) -> str:
         return f"<Movie(id={self.id}, title='{self.title}', year='{self.year}')>"
+
+
+class MovieCatalogVersion(Base):
+    """Versão da coleção de filmes (ETag das listagens): uma linha só,
+    incrementada por toda escrita logo antes do commit"""
+
+    __tablename__ = "movie_catalog_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+event.listen(
+    Movie.__table__,
+    "after_create",
+    DDL(
+        f"ALTER TABLE movies ADD COLUMN {SEARCH_VECTOR_COLUMN} tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Movie.__table__,
+    "after_create",
+    DDL(
+        f"CREATE INDEX {SEARCH_VECTOR_INDEX} ON movies "
+        f"USING gin ({SEARCH_VECTOR_COLUMN})"
+    ).execute_if(dialect="postgresql"),
+)
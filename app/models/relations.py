@@ -0,0 +1,94 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Table, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+
+
+class Genre(Base):
+    """Gênero normalizado (Movie.genre separado por vírgulas)"""
+
+    __tablename__ = "genres"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # title_key do nome: filtros ignoram caixa e pontuação
+    name_normalized: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
+
+
+class Person(Base):
+    """Pessoa do elenco ou da direção; o papel fica na associação"""
+
+    __tablename__ = "people"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    name_normalized: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
+
+
+class Language(Base):
+    """Idioma normalizado (Movie.language separado por vírgulas)"""
+
+    __tablename__ = "languages"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    name_normalized: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
+
+
+# Associações: a chave primária começa pelo filme (sincronização por filme) e o
+# índice secundário pelo valor filtrado, cobrindo o movie_id do semi-join
+movie_genres = Table(
+    "movie_genres",
+    Base.metadata,
+    Column(
+        "movie_id",
+        Integer,
+        ForeignKey("movies.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "genre_id",
+        Integer,
+        ForeignKey("genres.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Index("ix_movie_genres_genre_id_movie_id", "genre_id", "movie_id"),
+)
+
+movie_people = Table(
+    "movie_people",
+    Base.metadata,
+    Column(
+        "movie_id",
+        Integer,
+        ForeignKey("movies.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "person_id",
+        Integer,
+        ForeignKey("people.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    # "actor" ou "director"
+    Column("role", String(20), primary_key=True),
+    Index("ix_movie_people_person_id_role_movie_id", "person_id", "role", "movie_id"),
+)
+
+movie_languages = Table(
+    "movie_languages",
+    Base.metadata,
+    Column(
+        "movie_id",
+        Integer,
+        ForeignKey("movies.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "language_id",
+        Integer,
+        ForeignKey("languages.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Index("ix_movie_languages_language_id_movie_id", "language_id", "movie_id"),
+)
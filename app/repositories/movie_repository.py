@@ -1,42 +1,618 @@
-from typing import Optional
+from collections import defaultdict
+from collections.abc import AsyncIterator, Collection, Sequence
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Column,
+    Table,
+    and_,
+    column,
+    delete,
+    func,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.movie import Movie
+from app.clients.omdb_client import OMDBClient
+from app.core.titles import split_names, title_key
+from app.models.movie import (
+    SEARCH_CONFIG,
+    SEARCH_VECTOR_COLUMN,
+    Movie,
+    MovieCatalogVersion,
+)
+from app.models.relations import (
+    Genre,
+    Language,
+    Person,
+    movie_genres,
+    movie_languages,
+    movie_people,
+)
+from app.schemas.movie import MovieFilters, MovieSort
+
+
+# Colunas de dados (tudo menos a chave e os timestamps) usadas no upsert em lote
+_DATA_COLUMNS = [
+    c.name
+    for c in Movie.__table__.columns
+    if c.name not in ("id", "created_at", "updated_at")
+]
+_STAGING_TABLE = "movies_staging"
+# Campos cobertos pela busca textual
+_SEARCH_COLUMNS = [
+    Movie.title,
+    Movie.director,
+    Movie.actors,
+    Movie.writer,
+    Movie.plot,
+]
+
+
+class _Relation(NamedTuple):
+    """Campo OMDB separado por vírgulas e onde ele fica normalizado"""
+
+    field: str
+    model: Any
+    table: Table
+    column: Column
+    role: Optional[str] = None
+
+
+# nome do filtro (MovieFilters) -> relação
+_RELATIONS = {
+    "genre": _Relation("genre", Genre, movie_genres, movie_genres.c.genre_id),
+    "actor": _Relation(
+        "actors", Person, movie_people, movie_people.c.person_id, "actor"
+    ),
+    "director": _Relation(
+        "director", Person, movie_people, movie_people.c.person_id, "director"
+    ),
+    "language": _Relation(
+        "language", Language, movie_languages, movie_languages.c.language_id
+    ),
+}
+# campo de MovieSort (sem o "-") -> coluna
+_SORT_COLUMNS = {
+    "created_at": Movie.created_at,
+    "year": Movie.year_start,
+    "runtime": Movie.runtime_minutes,
+    "released": Movie.released_date,
+}
+_RELATION_FIELDS = sorted({relation.field for relation in _RELATIONS.values()})
+
+
+def _with_typed_fields(movie_data: dict) -> dict:
+    """Completa year_start/year_end, runtime_minutes e released_date a partir
+    de year, runtime e released quando o dict não os traz (só o OMDBClient
+    os preenche; cargas em lote chegam com os campos em texto)"""
+    typed: dict[str, Any] = {}
+    if "year_start" not in movie_data and "year_end" not in movie_data:
+        typed["year_start"], typed["year_end"] = OMDBClient._parse_year_range(
+            movie_data.get("year")
+        )
+    if "runtime_minutes" not in movie_data:
+        typed["runtime_minutes"] = OMDBClient._parse_runtime(movie_data.get("runtime"))
+    if "released_date" not in movie_data:
+        typed["released_date"] = OMDBClient._parse_date(movie_data.get("released"))
+    return {**movie_data, **typed}
 
 
 class MovieRepository:
+    # lotes a partir deste tamanho usam COPY no PostgreSQL
+    COPY_THRESHOLD = 5000
+
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
     async def create(self, movie_data: dict) -> Movie:
-        movie = Movie(**movie_data)
+        movie = Movie(**_with_typed_fields(movie_data))
         self.session.add(movie)
+        await self.session.flush()
+        await self._save_relations({movie.id: movie_data})
+        await self._bump_collection_version()
         await self.session.commit()
         await self.session.refresh(movie)
         return movie
 
-    async def get_by_id(self, movie_id: int) -> Optional[Movie]:
-        result = await self.session.execute(select(Movie).where(Movie.id == movie_id))
+    async def create_or_get(self, movie_data: dict) -> tuple[Movie, bool]:
+        """INSERT ... ON CONFLICT DO NOTHING RETURNING: (filme, True) se
+        inseriu, (filme existente, False) se o título normalizado já existia"""
+        now = datetime.utcnow()
+        title_normalized = title_key(movie_data["title"])
+        row = {
+            **_with_typed_fields(movie_data),
+            "title_normalized": title_normalized,
+            "created_at": now,
+            "updated_at": now,
+        }
+        # sem conflito o RETURNING traz a linha nova; com conflito não há
+        # escrita nem lock na linha existente, que vem de um SELECT à parte
+        stmt = (
+            self._insert()
+            .values(row)
+            .on_conflict_do_nothing(index_elements=[Movie.title_normalized])
+            .returning(Movie)
+        )
+        try:
+            movie = (await self.session.scalars(stmt)).one_or_none()
+        except IntegrityError:
+            # título novo, mas IMDb ID já cadastrado com outra grafia
+            await self.session.rollback()
+            existing = None
+            if movie_data.get("imdb_id"):
+                existing = await self.get_by_imdb_id(movie_data["imdb_id"])
+            if existing is None:
+                raise
+            return existing, False
+
+        if movie is None:
+            existing = await self.session.scalars(
+                select(Movie).where(Movie.title_normalized == title_normalized)
+            )
+            return existing.one(), False
+
+        await self._save_relations({movie.id: movie_data})
+        await self._bump_collection_version()
+        await self.session.commit()
+        return movie, True
+
+    async def create_many(self, movies_data: list[dict]) -> list[Movie]:
+        """Insert em lote; filmes já existentes são ignorados (ON CONFLICT)"""
+        if not movies_data:
+            return []
+        # insert em lote não passa pelo @validates do model
+        rows = [
+            {
+                **_with_typed_fields(movie_data),
+                "title_normalized": title_key(movie_data["title"]),
+            }
+            for movie_data in movies_data
+        ]
+        stmt = self._insert().on_conflict_do_nothing().returning(Movie)
+        result = await self.session.scalars(stmt, rows)
+        movies = list(result.all())
+        await self._save_relations(
+            {
+                movie.id: {name: getattr(movie, name) for name in _RELATION_FIELDS}
+                for movie in movies
+            }
+        )
+        if movies:
+            await self._bump_collection_version()
+        await self.session.commit()
+        return movies
+
+    async def bulk_upsert(
+        self,
+        movies_data: list[dict],
+        batch_size: int = 1000,
+        use_copy: Optional[bool] = None,
+    ) -> dict[str, int]:
+        """Grava muitos filmes: insere os novos, atualiza os que mudaram e conta
+        como ignorados os idênticos, repetidos no lote ou com IMDb ID de outro
+        título. Um upsert, a sincronização das associações e um commit por lote"""
+        postgres = self.session.bind.dialect.name == "postgresql"
+        if use_copy is None:
+            use_copy = postgres and batch_size >= self.COPY_THRESHOLD
+        elif use_copy and not postgres:
+            raise ValueError("COPY upserts require PostgreSQL")
+        upsert = self._copy_upsert if use_copy else self._multirow_upsert
+
+        counts = {"inserted": 0, "updated": 0, "skipped": 0}
+        for start in range(0, len(movies_data), batch_size):
+            batch = movies_data[start : start + batch_size]
+            now = datetime.utcnow()
+            rows = await self._prepare_rows(batch, now)
+            written: list[Any] = []
+            existing: set[str] = set()
+            if rows:
+                if not postgres:
+                    # sem xmax: as chaves que já existiam saem de um SELECT prévio
+                    existing = await self._existing_keys(
+                        [row["title_normalized"] for row in rows]
+                    )
+                written = await upsert(rows)
+                by_key = {row["title_normalized"]: row for row in rows}
+                await self._save_relations(
+                    {row.id: by_key[row.title_normalized] for row in written},
+                    replace=True,
+                )
+                if written:
+                    await self._bump_collection_version()
+                await self.session.commit()
+
+            inserted = sum(
+                1
+                for row in written
+                if (row.inserted if postgres else row.title_normalized not in existing)
+            )
+            counts["inserted"] += inserted
+            counts["updated"] += len(written) - inserted
+            counts["skipped"] += len(batch) - len(written)
+        return counts
+
+    async def get_by_id(
+        self, movie_id: int, columns: Optional[Sequence[str]] = None
+    ) -> Optional[Movie]:
+        result = await self.session.execute(
+            self._select(columns).where(Movie.id == movie_id)
+        )
+        return self._one_or_none(result, columns)
+
+    async def get_version(self, movie_id: int) -> Optional[datetime]:
+        """updated_at do filme, sem carregar a linha (ETag)"""
+        result = await self.session.execute(
+            select(Movie.updated_at).where(Movie.id == movie_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_collection_version(
+        self,
+    ) -> tuple[Optional[int], Optional[datetime], Optional[int]]:
+        """(contador, max(updated_at), max(id)). O contador muda no commit de
+        toda escrita da API, inclusive a de uma transação mais antiga que
+        termina depois de outra; os máximos, lidos pelos índices, pegam
+        escritas feitas direto no banco"""
+        counter = select(MovieCatalogVersion.version).where(MovieCatalogVersion.id == 1)
+        result = await self.session.execute(
+            select(
+                counter.scalar_subquery(),
+                select(func.max(Movie.updated_at)).scalar_subquery(),
+                select(func.max(Movie.id)).scalar_subquery(),
+            )
+        )
+        return tuple(result.one())
+
+    async def get_by_imdb_id(self, imdb_id: str) -> Optional[Movie]:
+        result = await self.session.execute(
+            select(Movie).where(Movie.imdb_id == imdb_id)
+        )
         return result.scalar_one_or_none()
 
     async def get_by_title(self, title: str) -> Optional[Movie]:
         result = await self.session.execute(
-            select(Movie).where(Movie.title.ilike(title))
+            select(Movie).where(Movie.title_normalized == title_key(title))
         )
         return result.scalar_one_or_none()
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> list[Movie]:
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[MovieFilters] = None,
+        sort: MovieSort = MovieSort.CREATED_DESC,
+        columns: Optional[Sequence[str]] = None,
+    ) -> list[Movie]:
+        stmt = self._where(self._select(columns), filters)
         result = await self.session.execute(
-            select(Movie).offset(skip).limit(limit).order_by(Movie.created_at.desc())
+            stmt.order_by(*self._order_by(sort)).offset(skip).limit(limit)
+        )
+        return self._all(result, columns)
+
+    async def get_page(
+        self,
+        limit: int = 100,
+        after: Optional[tuple[datetime, int]] = None,
+        filters: Optional[MovieFilters] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> list[Movie]:
+        """Paginação por chave (created_at, id): custo constante em qualquer página"""
+        stmt = self._where(self._select(columns), filters).order_by(
+            Movie.created_at.desc(), Movie.id.desc()
         )
+        if after is not None:
+            stmt = stmt.where(tuple_(Movie.created_at, Movie.id) < after)
+        result = await self.session.execute(stmt.limit(limit))
+        return self._all(result, columns)
+
+    async def stream(
+        self, filters: Optional[MovieFilters] = None, chunk_size: int = 1000
+    ) -> AsyncIterator[list[Movie]]:
+        """Filmes por id em lotes de chunk_size, lidos de um cursor no servidor:
+        a memória não cresce com o catálogo"""
+        stmt = self._where(select(Movie), filters).order_by(Movie.id)
+        result = await self.session.stream_scalars(
+            stmt.execution_options(yield_per=chunk_size)
+        )
+        async for chunk in result.partitions():
+            yield list(chunk)
+
+    async def search(self, query: str, skip: int = 0, limit: int = 20) -> list[Movie]:
+        """Busca textual em título, diretor, atores, roteiristas e sinopse,
+        do mais relevante para o menos relevante"""
+        if self.session.bind.dialect.name == "postgresql":
+            # websearch_to_tsquery aceita "aspas", OR e -exclusão sem erro de sintaxe
+            tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+            vector = literal_column(SEARCH_VECTOR_COLUMN)
+            stmt = (
+                select(Movie)
+                .where(vector.op("@@")(tsquery))
+                .order_by(func.ts_rank_cd(vector, tsquery).desc(), Movie.id.desc())
+            )
+        else:
+            # sem tsvector (SQLite): todos os termos em algum dos campos
+            terms = query.lower().split()
+            if not terms:
+                return []
+            matches = [
+                or_(
+                    *(
+                        func.lower(col).contains(term, autoescape=True)
+                        for col in _SEARCH_COLUMNS
+                    )
+                )
+                for term in terms
+            ]
+            stmt = (
+                select(Movie)
+                .where(and_(*matches))
+                .order_by(Movie.title_normalized, Movie.id.desc())
+            )
+        result = await self.session.execute(stmt.offset(skip).limit(limit))
         return list(result.scalars().all())
 
-    async def count(self) -> int:
-        result = await self.session.execute(select(Movie))
-        return len(list(result.scalars().all()))
+    async def count(self, filters: Optional[MovieFilters] = None) -> int:
+        stmt = self._where(select(func.count()).select_from(Movie), filters)
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
+
+    async def estimate_count(self) -> Optional[int]:
+        """Estimativa do planner (pg_class.reltuples); None se indisponível"""
+        if self.session.bind.dialect.name != "postgresql":
+            return None
+        result = await self.session.execute(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = to_regclass(:table)"
+            ),
+            {"table": Movie.__tablename__},
+        )
+        estimate = result.scalar_one_or_none()
+        # -1 enquanto a tabela nunca passou por VACUUM/ANALYZE
+        if estimate is None or estimate < 0:
+            return None
+        return estimate
 
     async def exists_by_title(self, title: str) -> bool:
         movie = await self.get_by_title(title)
         return movie is not None
+
+    async def get_existing_titles(self, titles: list[str]) -> set[str]:
+        """Chaves (title_key) dos títulos que já existem, numa única consulta"""
+        if not titles:
+            return set()
+        return await self._existing_keys({title_key(title) for title in titles})
+
+    async def _existing_keys(self, keys: Collection[str]) -> set[str]:
+        result = await self.session.execute(
+            select(Movie.title_normalized).where(Movie.title_normalized.in_(keys))
+        )
+        return set(result.scalars().all())
+
+    async def _prepare_rows(self, batch: list[dict], now: datetime) -> list[dict]:
+        rows: dict[str, dict] = {}
+        for movie_data in batch:
+            movie_data = _with_typed_fields(movie_data)
+            row = {name: movie_data.get(name) for name in _DATA_COLUMNS}
+            row["title_normalized"] = title_key(movie_data["title"])
+            row["created_at"] = row["updated_at"] = now
+            # o mesmo filme duas vezes no lote: vale a última versão
+            rows[row["title_normalized"]] = row
+
+        # ON CONFLICT só cobre title_normalized; um IMDb ID que já pertence a
+        # outro título quebraria o lote inteiro, então essas linhas ficam de fora
+        imdb_owner: dict[str, str] = {}
+        imdb_ids = {row["imdb_id"] for row in rows.values() if row["imdb_id"]}
+        if imdb_ids:
+            result = await self.session.execute(
+                select(Movie.imdb_id, Movie.title_normalized).where(
+                    Movie.imdb_id.in_(imdb_ids)
+                )
+            )
+            imdb_owner = dict(result.tuples().all())
+
+        accepted = []
+        for key, row in rows.items():
+            imdb_id = row["imdb_id"]
+            if imdb_id:
+                if imdb_owner.setdefault(imdb_id, key) != key:
+                    continue
+            accepted.append(row)
+        return accepted
+
+    def _bulk_upsert_statement(self, insert: Any) -> Any:
+        movies = Movie.__table__
+        returning = [movies.c.id, movies.c.title_normalized]
+        if self.session.bind.dialect.name == "postgresql":
+            # xmax = 0 só na versão recém-inserida; a do DO UPDATE leva o xid
+            returning.append(literal_column("movies.xmax = 0").label("inserted"))
+        changed = [
+            movies.c[name].is_distinct_from(insert.excluded[name])
+            for name in _DATA_COLUMNS
+            if name != "title_normalized"
+        ]
+        return insert.on_conflict_do_update(
+            index_elements=[movies.c.title_normalized],
+            set_={
+                **{
+                    name: insert.excluded[name]
+                    for name in _DATA_COLUMNS
+                    if name != "title_normalized"
+                },
+                "updated_at": insert.excluded.updated_at,
+            },
+            # linhas idênticas não são reescritas nem voltam no RETURNING
+            where=or_(*changed),
+        ).returning(*returning)
+
+    async def _multirow_upsert(self, rows: list[dict]) -> list[Any]:
+        # executemany + RETURNING vira INSERT de várias linhas (insertmanyvalues)
+        stmt = self._bulk_upsert_statement(self._insert(Movie.__table__))
+        result = await self.session.execute(stmt, rows)
+        return list(result.all())
+
+    async def _copy_upsert(self, rows: list[dict]) -> list[Any]:
+        """COPY para uma tabela temporária e um único INSERT ... SELECT
+        (só PostgreSQL; bulk_upsert recusa antes nos outros bancos)"""
+        columns = [*_DATA_COLUMNS, "created_at", "updated_at"]
+        await self.session.execute(
+            text(
+                f"CREATE TEMP TABLE {_STAGING_TABLE} ON COMMIT DROP AS "
+                f"SELECT {', '.join(columns)} FROM movies WITH NO DATA"
+            )
+        )
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            _STAGING_TABLE,
+            records=[tuple(row[name] for name in columns) for row in rows],
+            columns=columns,
+        )
+
+        staging = table(_STAGING_TABLE, *(column(name) for name in columns))
+        insert = postgresql.insert(Movie.__table__).from_select(
+            columns, select(*staging.c)
+        )
+        result = await self.session.execute(self._bulk_upsert_statement(insert))
+        return list(result.all())
+
+    async def _save_relations(
+        self, movies: dict[int, Any], replace: bool = False
+    ) -> None:
+        """Grava gêneros, elenco, direção e idiomas dos filmes (id -> dados)
+        nas tabelas normalizadas; replace apaga antes as associações antigas"""
+        if not movies:
+            return
+        if replace:
+            for association in (movie_genres, movie_people, movie_languages):
+                await self.session.execute(
+                    delete(association).where(association.c.movie_id.in_(movies))
+                )
+
+        names: dict[Any, dict[str, str]] = defaultdict(dict)
+        links: list[tuple[_Relation, int, str]] = []
+        for movie_id, movie_data in movies.items():
+            for relation in _RELATIONS.values():
+                for name in split_names(movie_data.get(relation.field)):
+                    key = title_key(name)
+                    names[relation.model].setdefault(key, name)
+                    links.append((relation, movie_id, key))
+
+        ids = {
+            model: await self._upsert_names(model, keys)
+            for model, keys in names.items()
+        }
+
+        rows: dict[Table, list[dict]] = defaultdict(list)
+        for relation, movie_id, key in links:
+            row = {"movie_id": movie_id, relation.column.name: ids[relation.model][key]}
+            if relation.role is not None:
+                row["role"] = relation.role
+            rows[relation.table].append(row)
+        for association, association_rows in rows.items():
+            await self.session.execute(
+                self._insert(association).on_conflict_do_nothing(), association_rows
+            )
+
+    async def _upsert_names(self, model: Any, names: dict[str, str]) -> dict[str, int]:
+        """Insere os nomes que faltam e devolve chave normalizada -> id"""
+        table = model.__table__
+        # ordem fixa para transações concorrentes travarem as linhas na mesma ordem
+        await self.session.execute(
+            self._insert(table).on_conflict_do_nothing(
+                index_elements=[table.c.name_normalized]
+            ),
+            [{"name": names[key], "name_normalized": key} for key in sorted(names)],
+        )
+        result = await self.session.execute(
+            select(table.c.name_normalized, table.c.id).where(
+                table.c.name_normalized.in_(names)
+            )
+        )
+        return dict(result.tuples().all())
+
+    def _select(self, columns: Optional[Sequence[str]]) -> Any:
+        """SELECT da entidade inteira, ou só das colunas pedidas (mais id,
+        created_at e updated_at, usados no cursor e no ETag) sem hidratar
+        objetos Movie"""
+        if columns is None:
+            return select(Movie)
+        names = dict.fromkeys(["id", "created_at", "updated_at", *columns])
+        return select(*(Movie.__table__.c[name] for name in names))
+
+    def _all(self, result: Any, columns: Optional[Sequence[str]]) -> list[Any]:
+        return list(result.scalars().all() if columns is None else result.all())
+
+    def _one_or_none(self, result: Any, columns: Optional[Sequence[str]]) -> Any:
+        if columns is None:
+            return result.scalar_one_or_none()
+        return result.one_or_none()
+
+    def _order_by(self, sort: MovieSort) -> tuple[Any, Any]:
+        descending = sort.value.startswith("-")
+        column = _SORT_COLUMNS[sort.value.lstrip("-")]
+        order = column.desc() if descending else column.asc()
+        # created_at é NOT NULL: sem NULLS LAST o PostgreSQL lê o índice de trás
+        if column.nullable:
+            order = order.nulls_last()
+        return order, Movie.id.desc() if descending else Movie.id.asc()
+
+    def _where(self, stmt: Any, filters: Optional[MovieFilters]) -> Any:
+        """Aplica os filtros: intervalos pelas colunas tipadas e relações como
+        semi-joins pelos índices das associações"""
+        if filters is None:
+            return stmt
+        if filters.year_from is not None:
+            # year_end nulo com year_start conhecido: série ainda em exibição
+            stmt = stmt.where(
+                or_(
+                    Movie.year_end >= filters.year_from,
+                    and_(Movie.year_end.is_(None), Movie.year_start.is_not(None)),
+                )
+            )
+        if filters.year_to is not None:
+            stmt = stmt.where(Movie.year_start <= filters.year_to)
+        if filters.min_runtime is not None:
+            stmt = stmt.where(Movie.runtime_minutes >= filters.min_runtime)
+        for name, relation in _RELATIONS.items():
+            value = getattr(filters, name)
+            if value is None:
+                continue
+            movie_ids = (
+                select(relation.table.c.movie_id)
+                .join(relation.model, relation.model.id == relation.column)
+                .where(relation.model.name_normalized == title_key(value))
+            )
+            if relation.role is not None:
+                movie_ids = movie_ids.where(relation.table.c.role == relation.role)
+            stmt = stmt.where(Movie.id.in_(movie_ids))
+        return stmt
+
+    async def _bump_collection_version(self) -> None:
+        """Incrementa a versão da coleção na transação da escrita. Chamado logo
+        antes do commit: a trava da linha dura só até ele, e o novo valor fica
+        visível junto com a escrita"""
+        stmt = self._insert(MovieCatalogVersion).values(id=1, version=1)
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[MovieCatalogVersion.id],
+                set_={"version": MovieCatalogVersion.version + 1},
+            )
+        )
+
+    def _insert(self, target: Any = Movie) -> Any:
+        dialect = self.session.bind.dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(target)
+        if dialect == "sqlite":
+            return sqlite.insert(target)
+        raise RuntimeError(f"Unsupported dialect for upserts: {dialect}")
@@ -1,7 +1,13 @@
-from datetime import datetime
-from typing import Optional
+import csv
+import io
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Annotated, Any, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, create_model
+
+from app.core.exceptions import InvalidFieldsError
 
 
 class MovieCreate(BaseModel):
@@ -16,6 +22,32 @@ class MovieCreate(BaseModel):
     )
 
 
+IMDB_ID_PATTERN = r"^tt\d{7,10}$"
+
+
+class MovieImdbCreate(BaseModel):
+    """Schema para criar filme a partir do IMDb ID"""
+
+    imdb_id: str = Field(
+        ...,
+        pattern=IMDB_ID_PATTERN,
+        description="IMDb ID",
+        examples=["tt0133093"],
+    )
+
+
+class MovieBatchCreate(BaseModel):
+    """Schema para importar vários filmes de uma vez"""
+
+    titles: list[Annotated[str, Field(min_length=1, max_length=255)]] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="Movie titles",
+        examples=[["The Matrix", "Inception"]],
+    )
+
+
 class MovieResponse(BaseModel):
     """Schema de resposta - todos os campos"""
 
@@ -37,15 +69,248 @@ class MovieResponse(BaseModel):
     awards: Optional[str] = None
     language: Optional[str] = None
     country: Optional[str] = None
+    year_start: Optional[int] = None
+    year_end: Optional[int] = None
+    runtime_minutes: Optional[int] = None
+    released_date: Optional[date] = None
     created_at: datetime
     updated_at: datetime
 
 
+class MovieCountMode(str, Enum):
+    """Como o total da listagem é calculado"""
+
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATE = "estimate"
+
+
+class MovieSort(str, Enum):
+    """Ordenação da listagem; "-" indica decrescente e valores nulos vão por
+    último. Só a ordem padrão aceita cursor"""
+
+    CREATED_DESC = "-created_at"
+    YEAR = "year"
+    YEAR_DESC = "-year"
+    RUNTIME = "runtime"
+    RUNTIME_DESC = "-runtime"
+    RELEASED = "released"
+    RELEASED_DESC = "-released"
+
+
+class MovieFilters(BaseModel):
+    """Filtros da listagem; cada um casa um item da lista do campo OMDB,
+    sem diferença de caixa ou pontuação ("sci-fi" encontra "Sci-Fi")"""
+
+    genre: Optional[str] = Field(default=None, max_length=255)
+    actor: Optional[str] = Field(default=None, max_length=255)
+    director: Optional[str] = Field(default=None, max_length=255)
+    language: Optional[str] = Field(default=None, max_length=255)
+    # intervalo [year_start, year_end] da obra cruza [year_from, year_to]
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    min_runtime: Optional[int] = Field(default=None, ge=0)
+
+    @property
+    def active(self) -> bool:
+        return any(value is not None for value in self.model_dump().values())
+
+
 class MovieListResponse(BaseModel):
     """Schema para lista de filmes"""
 
     movies: list[MovieResponse]
     total: int
+    total_estimated: bool = Field(
+        default=False,
+        description="True when total comes from the count cache or table statistics",
+    )
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor for the next page; null on the last page",
+    )
+
+
+class MovieSearchResponse(BaseModel):
+    """Schema para resultado da busca textual, ordenado por relevância"""
+
+    movies: list[MovieResponse]
+    has_more: bool = Field(
+        default=False, description="True when another page of results exists"
+    )
+
+
+def parse_fieldset(value: str) -> tuple[str, ...]:
+    """Campos de MovieResponse pedidos em fields= ("title,year"), na ordem do
+    schema e sempre com id"""
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested - MovieResponse.model_fields.keys()
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(
+        name for name in MovieResponse.model_fields if name == "id" or name in requested
+    )
+
+
+@lru_cache(maxsize=128)
+def sparse_movie_response(fields: tuple[str, ...]) -> type[BaseModel]:
+    """MovieResponse só com os campos pedidos (um model por combinação)"""
+    return create_model(
+        "MovieSparseResponse",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (MovieResponse.model_fields[name].annotation, ...) for name in fields},
+    )
+
+
+@lru_cache(maxsize=128)
+def sparse_movie_list_response(fields: tuple[str, ...]) -> type[MovieListResponse]:
+    """MovieListResponse cujos filmes usam sparse_movie_response"""
+    return create_model(
+        "MovieSparseListResponse",
+        __base__=MovieListResponse,
+        movies=(list[sparse_movie_response(fields)], ...),
+    )
+
+
+# Caminho rápido de serialização: uma validação a partir dos atributos do ORM e
+# JSON direto em bytes pelo pydantic-core, sem o response_model do FastAPI
+# validar e o json.dumps serializar de novo
+
+
+@lru_cache(maxsize=128)
+def movie_adapter(fields: Optional[tuple[str, ...]] = None) -> TypeAdapter:
+    """TypeAdapter de um filme (MovieResponse ou o model esparso)"""
+    return TypeAdapter(
+        MovieResponse if fields is None else sparse_movie_response(fields)
+    )
+
+
+@lru_cache(maxsize=128)
+def movie_list_adapter(fields: Optional[tuple[str, ...]] = None) -> TypeAdapter:
+    """TypeAdapter de list[MovieResponse] (ou do model esparso)"""
+    movie_model = MovieResponse if fields is None else sparse_movie_response(fields)
+    return TypeAdapter(list[movie_model])
+
+
+def dump_movie(movie: Any, fields: Optional[tuple[str, ...]] = None) -> bytes:
+    """JSON de um filme (objeto Movie ou linha projetada)"""
+    adapter = movie_adapter(fields)
+    return adapter.dump_json(adapter.validate_python(movie, from_attributes=True))
+
+
+def dump_movies(
+    envelope: type[BaseModel],
+    movies: list[Any],
+    fields: Optional[tuple[str, ...]] = None,
+    **values: Any,
+) -> bytes:
+    """JSON de um envelope com a lista de filmes (MovieListResponse,
+    MovieSearchResponse...); os filmes passam por uma única validação e o
+    envelope é montado sem validar de novo"""
+    validated = movie_list_adapter(fields).validate_python(movies, from_attributes=True)
+    return (
+        envelope.model_construct(movies=validated, **values).model_dump_json().encode()
+    )
+
+
+class MovieExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+# colunas do CSV, na ordem do MovieResponse
+MOVIE_EXPORT_COLUMNS = tuple(MovieResponse.model_fields)
+
+
+def dump_movies_ndjson(movies: list[Any]) -> bytes:
+    """Um filme JSON por linha"""
+    adapter = movie_adapter()
+    return b"".join(
+        adapter.dump_json(movie) + b"\n"
+        for movie in movie_list_adapter().validate_python(movies, from_attributes=True)
+    )
+
+
+def dump_movies_csv(movies: list[Any], header: bool = False) -> bytes:
+    """Linhas CSV (MOVIE_EXPORT_COLUMNS); campos vazios para None"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(MOVIE_EXPORT_COLUMNS)
+    for movie in movie_list_adapter().validate_python(movies, from_attributes=True):
+        writer.writerow(movie.model_dump(mode="json").values())
+    return buffer.getvalue().encode()
+
+
+class MovieBatchStatus(str, Enum):
+    CREATED = "created"
+    EXISTS = "exists"
+    NOT_FOUND = "not_found"
+    ERROR = "error"
+
+
+class MovieBatchItem(BaseModel):
+    """Resultado da importação de um título"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    title: str
+    status: MovieBatchStatus
+    movie: Optional[MovieResponse] = None
+    detail: Optional[str] = None
+
+
+class MovieBatchResponse(BaseModel):
+    """Schema de resposta da importação em lote"""
+
+    results: list[MovieBatchItem]
+    created: int
+    existing: int
+    not_found: int
+    errors: int
+
+
+_batch_items_adapter = TypeAdapter(list[MovieBatchItem])
+
+
+def dump_movie_batch(results: list[dict]) -> bytes:
+    """JSON do MovieBatchResponse: os itens passam por uma única validação e
+    as contagens saem deles"""
+    items = _batch_items_adapter.validate_python(results, from_attributes=True)
+    counts = {status: 0 for status in MovieBatchStatus}
+    for item in items:
+        counts[item.status] += 1
+    return (
+        MovieBatchResponse.model_construct(
+            results=items,
+            created=counts[MovieBatchStatus.CREATED],
+            existing=counts[MovieBatchStatus.EXISTS],
+            not_found=counts[MovieBatchStatus.NOT_FOUND],
+            errors=counts[MovieBatchStatus.ERROR],
+        )
+        .model_dump_json()
+        .encode()
+    )
+
+
+class OMDBSearchItem(BaseModel):
+    """Resultado resumido da busca na OMDB"""
+
+    imdb_id: Optional[str] = None
+    title: Optional[str] = None
+    year: Optional[str] = None
+    type: Optional[str] = None
+    poster: Optional[str] = None
+
+
+class OMDBSearchPage(BaseModel):
+    """Uma página (até 10 itens) da busca na OMDB"""
+
+    query: str
+    page: int
+    total_results: int
+    total_pages: int
+    results: list[OMDBSearchItem]
 
 
 class ErrorResponse(BaseModel):
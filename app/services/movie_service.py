@@ -1,13 +1,47 @@
+import asyncio
 import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import datetime
+from typing import Optional
 
+from app.clients.cache import TTLCache
 from app.clients.omdb_client import OMDBClient
-from app.core.exceptions import MovieAlreadyExistsError, MovieNotFoundError
+from app.core.config import settings
+from app.core.exceptions import (
+    ExternalAPIError,
+    MovieAlreadyExistsError,
+    MovieNotFoundError,
+)
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.single_flight import SingleFlight
+from app.core.titles import title_key
 from app.models.movie import Movie
 from app.repositories.movie_repository import MovieRepository
+from app.schemas.movie import MovieCountMode, MovieFilters, MovieSort
 
 logger = logging.getLogger(__name__)
 
 
+class _FetchedMovie:
+    """Resultado de uma consulta à OMDB dividido pelos chamadores do mesmo
+    título; cada um grava pela própria sessão, um de cada vez"""
+
+    def __init__(self, data: dict) -> None:
+        self.data = data
+        self.lock = asyncio.Lock()
+        self.created_id: Optional[int] = None
+
+
+# Compartilhado pelo processo: requisições simultâneas do mesmo título
+# dividem a mesma consulta à OMDB; só os dados circulam entre elas, nunca
+# a sessão ou os objetos de outra requisição
+_fetch_flights: SingleFlight[_FetchedMovie] = SingleFlight()
+
+# Total de filmes para o modo "cached"; invalidado quando este processo insere
+_count_cache = TTLCache(max_size=1)
+_COUNT_KEY = "movies"
+
+
 class MovieService:
     def __init__(self, repository: MovieRepository, omdb_client: OMDBClient) -> None:
         self.repository = repository
@@ -18,23 +52,229 @@ class MovieService:
             logger.warning(f"Duplicate movie: {title}")
             raise MovieAlreadyExistsError(f"Movie '{title}' already exists")
 
-        logger.info(f"Fetching from OMDB: {title}")
-        movie_data = await self.omdb_client.search_movie_by_title(title)
+        key = title_key(title)
+        if _fetch_flights.in_flight(key):
+            logger.info(f"Joining in-flight OMDB lookup: {title}")
+        fetched = await _fetch_flights.do(
+            key, lambda: self._fetch(self.omdb_client.search_movie_by_title, title)
+        )
+        return await self._insert_movie(fetched, f"'{title}'")
+
+    async def create_movie_by_imdb_id(self, imdb_id: str) -> Movie:
+        if await self.repository.get_by_imdb_id(imdb_id):
+            logger.warning(f"Duplicate movie: {imdb_id}")
+            raise MovieAlreadyExistsError(f"Movie {imdb_id} already exists")
+
+        key = ("imdb", imdb_id.lower())
+        fetched = await _fetch_flights.do(
+            key, lambda: self._fetch(self.omdb_client.get_movie_by_imdb_id, imdb_id)
+        )
+        return await self._insert_movie(fetched, imdb_id)
+
+    @staticmethod
+    async def _fetch(
+        search: Callable[[str], Awaitable[dict]], query: str
+    ) -> _FetchedMovie:
+        logger.info(f"Fetching from OMDB: {query}")
+        return _FetchedMovie(await search(query))
 
-        movie = await self.repository.create(movie_data)
+    async def _insert_movie(self, fetched: _FetchedMovie, label: str) -> Movie:
+        """Insert atômico; outra grafia ou requisição concorrente que já gravou
+        o mesmo filme (título ou IMDb ID) vira MovieAlreadyExistsError. Quem
+        dividiu a consulta recebe o filme que outro chamador dela inseriu"""
+        async with fetched.lock:
+            movie, created = await self.repository.create_or_get(fetched.data)
+            if created:
+                fetched.created_id = movie.id
+
+        if not created:
+            if movie.id is not None and movie.id == fetched.created_id:
+                logger.info(f"Movie created by joined lookup: {movie.id}")
+                return movie
+            logger.warning(f"Duplicate movie: {label} ({movie.id} - {movie.title})")
+            raise MovieAlreadyExistsError(f"Movie {label} already exists")
+
+        _count_cache.delete(_COUNT_KEY)
         logger.info(f"Movie created: {movie.id} - {movie.title}")
         return movie
 
-    async def get_movie_by_id(self, movie_id: int) -> Movie:
-        movie = await self.repository.get_by_id(movie_id)
+    async def create_movies(self, titles: list[str]) -> list[dict]:
+        """Importa vários títulos: uma consulta de existência, buscas paralelas
+        limitadas na OMDB e um único insert em lote"""
+        unique: dict[str, str] = {}
+        for title in titles:
+            unique.setdefault(title_key(title), title)
+
+        existing = await self.repository.get_existing_titles(list(unique.values()))
+
+        results: dict[str, dict] = {}
+        missing: list[tuple[str, str]] = []
+        for key, title in unique.items():
+            if key in existing:
+                results[key] = {"title": title, "status": "exists"}
+            else:
+                missing.append((key, title))
+
+        fetched: dict[str, dict] = {}
+        semaphore = asyncio.Semaphore(settings.OMDB_BATCH_CONCURRENCY)
+
+        async def fetch(key: str, title: str) -> None:
+            async with semaphore:
+                try:
+                    fetched[key] = await self.omdb_client.search_movie_by_title(title)
+                except MovieNotFoundError as e:
+                    results[key] = {
+                        "title": title,
+                        "status": "not_found",
+                        "detail": str(e),
+                    }
+                except ExternalAPIError as e:
+                    results[key] = {"title": title, "status": "error", "detail": str(e)}
+
+        logger.info(f"Batch import: {len(existing)} existing, fetching {len(missing)}")
+        await asyncio.gather(*(fetch(key, title) for key, title in missing))
+
+        # títulos diferentes podem resolver para o mesmo filme na OMDB
+        rows: dict[str, dict] = {}
+        for movie_data in fetched.values():
+            rows.setdefault(title_key(movie_data["title"]), movie_data)
+        created_movies = await self.repository.create_many(list(rows.values()))
+        if created_movies:
+            _count_cache.delete(_COUNT_KEY)
+        created = {movie.title_normalized: movie for movie in created_movies}
+
+        for key, movie_data in fetched.items():
+            movie = created.pop(title_key(movie_data["title"]), None)
+            status = "created" if movie is not None else "exists"
+            results[key] = {"title": unique[key], "status": status, "movie": movie}
+
+        logger.info(f"Batch import: {len(created_movies)} movies created")
+        return [results[key] for key in unique]
+
+    async def bulk_upsert_movies(
+        self,
+        movies_data: list[dict],
+        batch_size: int = 1000,
+        use_copy: Optional[bool] = None,
+    ) -> dict[str, int]:
+        """Backfill do catálogo com dados já obtidos (sem OMDB); as contagens
+        vêm de MovieRepository.bulk_upsert"""
+        counts = await self.repository.bulk_upsert(
+            movies_data, batch_size=batch_size, use_copy=use_copy
+        )
+        if counts["inserted"]:
+            _count_cache.delete(_COUNT_KEY)
+        logger.info(
+            f"Bulk upsert: {counts['inserted']} inserted, "
+            f"{counts['updated']} updated, {counts['skipped']} skipped"
+        )
+        return counts
+
+    async def get_movie_by_id(
+        self, movie_id: int, fields: Optional[tuple[str, ...]] = None
+    ) -> Movie:
+        movie = await self.repository.get_by_id(movie_id, columns=fields)
         if not movie:
             logger.warning(f"Movie not found: {movie_id}")
             raise MovieNotFoundError(f"Movie {movie_id} not found")
         return movie
 
+    async def get_movie_version(self, movie_id: int) -> Optional[datetime]:
+        return await self.repository.get_version(movie_id)
+
+    async def get_collection_version(
+        self,
+    ) -> tuple[Optional[int], Optional[datetime], Optional[int]]:
+        return await self.repository.get_collection_version()
+
+    async def get_movie_by_imdb_id(self, imdb_id: str) -> Movie:
+        movie = await self.repository.get_by_imdb_id(imdb_id)
+        if not movie:
+            logger.warning(f"Movie not found: {imdb_id}")
+            raise MovieNotFoundError(f"Movie {imdb_id} not found")
+        return movie
+
     async def get_all_movies(
-        self, skip: int = 0, limit: int = 100
-    ) -> tuple[list[Movie], int]:
-        movies = await self.repository.get_all(skip=skip, limit=limit)
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        count_mode: MovieCountMode = MovieCountMode.EXACT,
+        cursor: Optional[str] = None,
+        filters: Optional[MovieFilters] = None,
+        sort: MovieSort = MovieSort.CREATED_DESC,
+        fields: Optional[tuple[str, ...]] = None,
+    ) -> tuple[list[Movie], int, bool, Optional[str]]:
+        """Página de filmes, total, se o total é aproximado e o próximo cursor;
+        com fields, as linhas trazem só essas colunas (mais id e created_at)"""
+        if filters is not None and not filters.active:
+            filters = None
+        if cursor is not None:
+            # uma linha a mais indica se existe próxima página
+            movies = await self.repository.get_page(
+                limit=limit + 1,
+                after=decode_cursor(cursor),
+                filters=filters,
+                columns=fields,
+            )
+            has_more = len(movies) > limit
+            movies = movies[:limit]
+            total, estimated = await self.count_movies(count_mode, filters)
+        else:
+            movies = await self.repository.get_all(
+                skip=skip, limit=limit, filters=filters, sort=sort, columns=fields
+            )
+            total, estimated = await self.count_movies(count_mode, filters)
+            # total aproximado não serve para saber se há mais linhas
+            if estimated:
+                has_more = len(movies) == limit
+            else:
+                has_more = skip + len(movies) < total
+
+        next_cursor = None
+        # o cursor guarda a chave (created_at, id) e só vale na ordem padrão
+        if has_more and movies and sort == MovieSort.CREATED_DESC:
+            next_cursor = encode_cursor(movies[-1].created_at, movies[-1].id)
+        return movies, total, estimated, next_cursor
+
+    async def search_movies(
+        self, query: str, skip: int = 0, limit: int = 20
+    ) -> tuple[list[Movie], bool]:
+        """Página da busca textual e se existe próxima página (sem COUNT)"""
+        movies = await self.repository.search(query, skip=skip, limit=limit + 1)
+        return movies[:limit], len(movies) > limit
+
+    def export_movies(
+        self, filters: Optional[MovieFilters] = None
+    ) -> AsyncIterator[list[Movie]]:
+        """Catálogo inteiro em lotes de MOVIE_EXPORT_CHUNK_SIZE, sem COUNT"""
+        if filters is not None and not filters.active:
+            filters = None
+        return self.repository.stream(
+            filters, chunk_size=settings.MOVIE_EXPORT_CHUNK_SIZE
+        )
+
+    async def count_movies(
+        self,
+        count_mode: MovieCountMode = MovieCountMode.EXACT,
+        filters: Optional[MovieFilters] = None,
+    ) -> tuple[int, bool]:
+        # estimativa e cache valem para a tabela inteira; filtros contam exato
+        if filters is not None and filters.active:
+            return await self.repository.count(filters=filters), False
+
+        if count_mode == MovieCountMode.ESTIMATE:
+            estimate = await self.repository.estimate_count()
+            # abaixo do limite o COUNT exato é barato e a estimativa é imprecisa
+            if estimate is not None and (
+                estimate >= settings.MOVIE_COUNT_ESTIMATE_THRESHOLD
+            ):
+                return estimate, True
+
+        if count_mode == MovieCountMode.CACHED:
+            cached = _count_cache.get(_COUNT_KEY)
+            if cached is not None:
+                return cached, True
+
         total = await self.repository.count()
-        return movies, total
+        _count_cache.set(_COUNT_KEY, total, settings.MOVIE_COUNT_CACHE_TTL)
+        return total, False
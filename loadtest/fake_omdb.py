@@ -0,0 +1,239 @@
+"""Servidor local que imita a OMDB para testes de carga sem gastar a cota real.
+
+    python -m loadtest.fake_omdb --port 8001 --latency 0.05 --error-rate 0.01
+
+e rode a API com OMDB_BASE_URL=http://localhost:8001/.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.core.titles import normalize_title
+
+FIXTURES_PATH = Path(__file__).parent / "fixtures" / "movies.json"
+SEARCH_PAGE_SIZE = 10
+# Quantidade de resultados sintéticos devolvidos por uma busca "s=" sem fixture
+SYNTHETIC_SEARCH_RESULTS = 30
+
+
+@dataclass
+class FakeOMDBConfig:
+    """Comportamento do servidor falso (latência, falhas e cota)"""
+
+    latency: float = 0.05
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    # 0 desativa; acima disso responde 401 "Request limit reached!" como a OMDB
+    request_limit: int = 0
+    # títulos fora das fixtures viram filmes sintéticos (ou "Movie not found!")
+    synthesize: bool = True
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> "FakeOMDBConfig":
+        seed = os.environ.get("FAKE_OMDB_SEED")
+        return cls(
+            latency=float(os.environ.get("FAKE_OMDB_LATENCY", cls.latency)),
+            jitter=float(os.environ.get("FAKE_OMDB_JITTER", cls.jitter)),
+            error_rate=float(os.environ.get("FAKE_OMDB_ERROR_RATE", cls.error_rate)),
+            request_limit=int(
+                os.environ.get("FAKE_OMDB_REQUEST_LIMIT", cls.request_limit)
+            ),
+            synthesize=os.environ.get("FAKE_OMDB_SYNTHESIZE", "true").lower()
+            in ("1", "true", "yes"),
+            seed=int(seed) if seed else None,
+        )
+
+
+def load_fixtures(path: Path = FIXTURES_PATH) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def synthetic_movie(title: str) -> dict:
+    """Payload determinístico para um título qualquer (mesmo título, mesmo ID)"""
+    digest = hashlib.sha1(normalize_title(title).encode()).hexdigest()
+    number = int(digest, 16) % 10**10
+    return {
+        "Title": title,
+        "Year": str(1950 + number % 75),
+        "Rated": "PG-13",
+        "Released": "01 Jan 2000",
+        "Runtime": f"{80 + number % 100} min",
+        "Genre": "Drama",
+        "Director": "Load Test Director",
+        "Writer": "Load Test Writer",
+        "Actors": "Actor One, Actor Two, Actor Three",
+        "Plot": f"Synthetic plot for {title}. " * 8,
+        "Language": "English",
+        "Country": "United States",
+        "Awards": "N/A",
+        "Poster": "N/A",
+        "imdbRating": f"{1 + number % 90 / 10:.1f}",
+        "imdbID": f"tt{number:010d}",
+        "Type": "movie",
+        "Response": "True",
+    }
+
+
+class FakeOMDB:
+    """Estado do servidor falso: catálogo, contadores e regras de falha"""
+
+    def __init__(self, config: FakeOMDBConfig, fixtures: list[dict]) -> None:
+        self.config = config
+        self._random = random.Random(config.seed)
+        self._by_title = {normalize_title(m["Title"]): m for m in fixtures}
+        self._by_id = {m["imdbID"].lower(): m for m in fixtures}
+        self.requests = 0
+        self.errors = 0
+        self.limited = 0
+
+    async def handle(self, params: dict[str, str]) -> tuple[int, dict]:
+        self.requests += 1
+        delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.config.request_limit and self.requests > self.config.request_limit:
+            self.limited += 1
+            return 401, {"Response": "False", "Error": "Request limit reached!"}
+        if not params.get("apikey"):
+            return 401, {"Response": "False", "Error": "No API key provided."}
+        if self._random.random() < self.config.error_rate:
+            self.errors += 1
+            return 500, {"Response": "False", "Error": "Internal error"}
+
+        if "i" in params:
+            return 200, self._by_imdb_id(params["i"])
+        if "t" in params:
+            return 200, self._by_title_param(params["t"])
+        if "s" in params:
+            return 200, self._search(params["s"], int(params.get("page") or 1))
+        return 200, {"Response": "False", "Error": "Incorrect IMDb ID."}
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "limited": self.limited,
+            "catalog": len(self._by_title),
+        }
+
+    def _by_imdb_id(self, imdb_id: str) -> dict:
+        movie = self._by_id.get(imdb_id.lower())
+        if movie is None:
+            return {"Response": "False", "Error": "Incorrect IMDb ID."}
+        return movie
+
+    def _by_title_param(self, title: str) -> dict:
+        key = normalize_title(title)
+        movie = self._by_title.get(key)
+        if movie is None:
+            if not self.config.synthesize:
+                return {"Response": "False", "Error": "Movie not found!"}
+            movie = synthetic_movie(title)
+            self._by_title[key] = movie
+            self._by_id[movie["imdbID"].lower()] = movie
+        return movie
+
+    def _search(self, query: str, page: int) -> dict:
+        key = normalize_title(query)
+        matches = [m for k, m in self._by_title.items() if key in k]
+        if not matches and self.config.synthesize:
+            matches = [
+                synthetic_movie(f"{query} {n}")
+                for n in range(1, SYNTHETIC_SEARCH_RESULTS + 1)
+            ]
+        start = (page - 1) * SEARCH_PAGE_SIZE
+        items = matches[start : start + SEARCH_PAGE_SIZE]
+        if not items:
+            return {"Response": "False", "Error": "Movie not found!"}
+        return {
+            "Search": [
+                {
+                    "Title": m["Title"],
+                    "Year": m["Year"],
+                    "imdbID": m["imdbID"],
+                    "Type": m["Type"],
+                    "Poster": m["Poster"],
+                }
+                for m in items
+            ],
+            "totalResults": str(len(matches)),
+            "Response": "True",
+        }
+
+
+def create_app(
+    config: Optional[FakeOMDBConfig] = None,
+    fixtures: Optional[list[dict]] = None,
+) -> FastAPI:
+    fake = FakeOMDB(
+        config or FakeOMDBConfig.from_env(),
+        fixtures if fixtures is not None else load_fixtures(),
+    )
+    fake_app = FastAPI(title="Fake OMDB")
+    fake_app.state.fake = fake
+
+    @fake_app.get("/")
+    async def omdb(request: Request) -> JSONResponse:
+        status_code, payload = await fake.handle(dict(request.query_params))
+        return JSONResponse(payload, status_code=status_code)
+
+    @fake_app.get("/_stats")
+    async def stats() -> dict[str, Any]:
+        return fake.stats()
+
+    return fake_app
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    import uvicorn
+
+    defaults = FakeOMDBConfig.from_env()
+    parser = argparse.ArgumentParser(description="Local stand-in for the OMDB API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=defaults.latency)
+    parser.add_argument("--jitter", type=float, default=defaults.jitter)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--request-limit", type=int, default=defaults.request_limit)
+    parser.add_argument(
+        "--no-synthesize",
+        dest="synthesize",
+        action="store_false",
+        default=defaults.synthesize,
+        help="answer 'Movie not found!' for titles missing from the fixtures",
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_PATH)
+    args = parser.parse_args(argv)
+
+    config = FakeOMDBConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        request_limit=args.request_limit,
+        synthesize=args.synthesize,
+        seed=args.seed,
+    )
+    uvicorn.run(
+        create_app(config, load_fixtures(args.fixtures)),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Teste de carga em taxa fixa contra /api/v1/movies.
+
+    python -m loadtest.run --base-url http://localhost:8000 --rate 50 --duration 30
+
+As requisições são disparadas em horários fixos (carga em malha aberta), e a
+latência é medida a partir do horário agendado, então uma API lenta não
+esconde a própria fila.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import httpx
+
+DEFAULT_MIX = "create=0.2,get=0.6,list=0.2"
+KINDS = ("create", "get", "list")
+
+
+@dataclass
+class Sample:
+    kind: str
+    status: int
+    latency: float
+
+
+@dataclass
+class LoadTestResult:
+    samples: list[Sample] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def summary(self) -> dict[str, Any]:
+        report: dict[str, Any] = {
+            "elapsed": round(self.elapsed, 3),
+            "throughput": (
+                round(len(self.samples) / self.elapsed, 2) if self.elapsed else 0.0
+            ),
+            "overall": _stats(self.samples),
+        }
+        for kind in KINDS:
+            samples = [s for s in self.samples if s.kind == kind]
+            if samples:
+                report[kind] = _stats(samples)
+        return report
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentil pelo método nearest-rank (valores já ordenados)"""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in KINDS:
+            raise ValueError(f"Unknown request kind '{kind}', expected {KINDS}")
+        weights[kind] = float(weight)
+    if sum(weights.values()) <= 0:
+        raise ValueError("Request mix weights must add up to more than zero")
+    return weights
+
+
+def _stats(samples: list[Sample]) -> dict[str, Any]:
+    latencies = sorted(s.latency * 1000 for s in samples)
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for s in samples if s.status == 0 or s.status >= 500),
+        "statuses": _count_statuses(samples),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+    }
+
+
+def _count_statuses(samples: list[Sample]) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for sample in samples:
+        counts[str(sample.status)] = counts.get(str(sample.status), 0) + 1
+    return dict(sorted(counts.items()))
+
+
+class LoadTest:
+    """Dispara requisições em taxa fixa e coleta a latência de cada uma"""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        rate: float,
+        duration: float,
+        mix: dict[str, float],
+        seed: Optional[int] = None,
+    ) -> None:
+        self.client = client
+        self.rate = rate
+        self.duration = duration
+        self.mix = mix
+        self._random = random.Random(seed)
+        # prefixo por execução para que títulos criados nunca colidam com 409
+        self._run_id = uuid.uuid4().hex[:8]
+        self._counter = 0
+        self.movie_ids: list[int] = []
+
+    async def warm_up(self, count: int) -> None:
+        """Cria alguns filmes para que as leituras por ID tenham alvo"""
+        for _ in range(count):
+            await self._send("create")
+
+    async def run(self) -> LoadTestResult:
+        result = LoadTestResult()
+        total = int(self.rate * self.duration)
+        kinds = self._random.choices(
+            list(self.mix), weights=list(self.mix.values()), k=total
+        )
+
+        started = time.perf_counter()
+        tasks = []
+        for n, kind in enumerate(kinds):
+            scheduled = started + n / self.rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self._timed(kind, scheduled)))
+
+        result.samples = list(await asyncio.gather(*tasks))
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    async def _timed(self, kind: str, scheduled: float) -> Sample:
+        if kind == "get" and not self.movie_ids:
+            # sem IDs para ler, a requisição vira uma listagem e conta como tal
+            kind = "list"
+        status = await self._send(kind)
+        return Sample(kind, status, time.perf_counter() - scheduled)
+
+    async def _send(self, kind: str) -> int:
+        try:
+            if kind == "create":
+                self._counter += 1
+                response = await self.client.post(
+                    "/api/v1/movies",
+                    json={"title": f"Load Test {self._run_id} {self._counter}"},
+                )
+                if response.status_code == 201:
+                    self.movie_ids.append(response.json()["id"])
+            elif kind == "get":
+                movie_id = self._random.choice(self.movie_ids)
+                response = await self.client.get(f"/api/v1/movies/{movie_id}")
+            else:
+                response = await self.client.get("/api/v1/movies", params={"limit": 20})
+        except httpx.HTTPError:
+            return 0
+        return response.status_code
+
+
+def format_report(report: dict[str, Any]) -> str:
+    lines = [
+        f"elapsed {report['elapsed']}s, throughput {report['throughput']} req/s",
+        f"{'kind':<8}{'reqs':>8}{'errors':>8}{'p50':>10}{'p95':>10}"
+        f"{'p99':>10}{'max':>10}",
+    ]
+    for kind in ("overall", *KINDS):
+        stats = report.get(kind)
+        if stats is None:
+            continue
+        lines.append(
+            f"{kind:<8}{stats['requests']:>8}{stats['errors']:>8}"
+            f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}"
+            f"{stats['p99_ms']:>10}{stats['max_ms']:>10}"
+        )
+    return "\n".join(lines)
+
+
+async def _main(args: argparse.Namespace) -> dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.connections)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        load_test = LoadTest(
+            client, args.rate, args.duration, parse_mix(args.mix), seed=args.seed
+        )
+        await load_test.warm_up(args.warmup)
+        result = await load_test.run()
+    return result.summary()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Fixed-rate load test for the API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--rate", type=float, default=20.0, help="requests/second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--warmup", type=int, default=10, help="movies to pre-create")
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", help="write the report here")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(_main(args))
+    print(format_report(report))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
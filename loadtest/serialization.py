@@ -0,0 +1,121 @@
+"""Microbenchmark da serialização de uma página da listagem de filmes.
+
+    python -m loadtest.serialization --items 100 --rounds 200
+
+Compara o caminho antigo (model_validate por filme, revalidação pelo
+response_model do FastAPI e json.dumps do JSONResponse) com dump_movies
+(uma validação pelo TypeAdapter e JSON em bytes pelo pydantic-core).
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Optional
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models.movie import Movie
+from app.schemas.movie import MovieListResponse, MovieResponse, dump_movies
+
+# o mesmo campo que o FastAPI monta para response_model=MovieListResponse
+_LIST_FIELD = create_model_field(name="Response", type_=MovieListResponse)
+
+
+def build_movies(count: int) -> list[Movie]:
+    """Objetos Movie transientes com todos os campos preenchidos"""
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        Movie(
+            id=i,
+            imdb_id=f"tt{i:07d}",
+            title=f"Movie {i}",
+            title_normalized=f"movie {i}",
+            plot="A computer hacker learns about the true nature of reality. " * 3,
+            released="31 Mar 1999",
+            year="1999",
+            year_start=1999,
+            year_end=1999,
+            runtime="136 min",
+            runtime_minutes=136,
+            released_date=date(1999, 3, 31),
+            genre="Action, Sci-Fi",
+            director="Lana Wachowski, Lilly Wachowski",
+            writer="Lilly Wachowski, Lana Wachowski",
+            actors="Keanu Reeves, Laurence Fishburne, Carrie-Anne Moss",
+            language="English",
+            country="United States, Australia",
+            awards="Won 4 Oscars. 42 wins & 51 nominations total",
+            imdb_rating=8.7,
+            rated="R",
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+async def _legacy(movies: list[Movie]) -> bytes:
+    """Caminho antigo: o handler valida e o FastAPI valida e serializa de novo"""
+    body = MovieListResponse(
+        movies=[MovieResponse.model_validate(m) for m in movies],
+        total=len(movies),
+    )
+    content = await serialize_response(field=_LIST_FIELD, response_content=body)
+    return JSONResponse(content).body
+
+
+async def _fast(movies: list[Movie]) -> bytes:
+    return dump_movies(MovieListResponse, movies, total=len(movies))
+
+
+async def _time(
+    run: Callable[[list[Movie]], Any], movies: list[Movie], rounds: int
+) -> float:
+    """Média em milissegundos por página"""
+    await run(movies)  # aquecimento
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await run(movies)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+async def benchmark(items: int, rounds: int) -> dict[str, Any]:
+    movies = build_movies(items)
+    if json.loads(await _legacy(movies)) != json.loads(await _fast(movies)):
+        raise AssertionError("Both paths must produce the same document")
+
+    legacy_ms = await _time(_legacy, movies, rounds)
+    fast_ms = await _time(_fast, movies, rounds)
+    return {
+        "items": items,
+        "rounds": rounds,
+        "legacy_ms": round(legacy_ms, 3),
+        "fast_ms": round(fast_ms, 3),
+        "speedup": round(legacy_ms / fast_ms, 2) if fast_ms else 0.0,
+    }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    return (
+        f"{report['items']} movies/page, {report['rounds']} rounds\n"
+        f"{'legacy':<8}{report['legacy_ms']:>10} ms/page\n"
+        f"{'fast':<8}{report['fast_ms']:>10} ms/page\n"
+        f"speedup {report['speedup']}x"
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="List page serialization benchmark")
+    parser.add_argument("--items", type=int, default=100, help="movies per page")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    print(format_report(asyncio.run(benchmark(args.items, args.rounds))))
+
+
+if __name__ == "__main__":
+    main()
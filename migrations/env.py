@@ -0,0 +1,78 @@
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import SchemaItem
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.database import Base
+from app.models import movie, relations  # noqa: F401 - registra os models
+from app.models.movie import SEARCH_VECTOR_COLUMN, SEARCH_VECTOR_INDEX
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get(
+    "configure_logger", True
+):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_object(
+    object: SchemaItem,
+    name: str | None,
+    type_: str,
+    reflected: bool,
+    compare_to: SchemaItem | None,
+) -> bool:
+    """A busca textual é criada por DDL próprio (só PostgreSQL), fora do metadata"""
+    return name not in (SEARCH_VECTOR_COLUMN, SEARCH_VECTOR_INDEX)
+
+
+def get_url() -> str:
+    url = config.get_main_option("sqlalchemy.url")
+    if url:
+        return url
+    from app.core.config import settings
+
+    return str(settings.DATABASE_URL)
+
+
+def run_migrations_offline() -> None:
+    """Gera o SQL sem conectar (alembic upgrade --sql)"""
+    context.configure(
+        url=get_url(),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # SQLite não tem ALTER COLUMN; o modo batch recria a tabela
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    engine = create_async_engine(get_url())
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
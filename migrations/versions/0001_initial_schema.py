@@ -0,0 +1,54 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2024-11-20 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import context, op
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # bancos criados pelo antigo create_all já têm a tabela: só adota
+    if not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table("movies"):
+        return
+
+    op.create_table(
+        "movies",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("imdb_id", sa.String(length=50), nullable=True),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("plot", sa.Text(), nullable=True),
+        sa.Column("released", sa.String(length=50), nullable=True),
+        sa.Column("year", sa.String(length=10), nullable=True),
+        sa.Column("runtime", sa.String(length=50), nullable=True),
+        sa.Column("genre", sa.String(length=255), nullable=True),
+        sa.Column("director", sa.String(length=255), nullable=True),
+        sa.Column("rated", sa.String(length=20), nullable=True),
+        sa.Column("writer", sa.Text(), nullable=True),
+        sa.Column("actors", sa.Text(), nullable=True),
+        sa.Column("language", sa.String(length=255), nullable=True),
+        sa.Column("country", sa.String(length=255), nullable=True),
+        sa.Column("awards", sa.Text(), nullable=True),
+        sa.Column("imdb_rating", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_movies_id", "movies", ["id"])
+    op.create_index("ix_movies_title", "movies", ["title"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_movies_title", table_name="movies")
+    op.drop_index("ix_movies_id", table_name="movies")
+    op.drop_table("movies")
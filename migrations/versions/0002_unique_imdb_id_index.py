@@ -0,0 +1,63 @@
+"""unique index on movies.imdb_id
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2024-11-21 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import context, op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+movies = sa.table("movies", sa.column("imdb_id", sa.String))
+
+
+def upgrade() -> None:
+    # um índice CONCURRENTLY que falha fica INVALID, e o if_not_exists faria
+    # o próximo upgrade passar por cima dele: as duplicatas param aqui antes
+    if not context.is_offline_mode():
+        duplicates = (
+            op.get_bind()
+            .execute(
+                sa.select(movies.c.imdb_id)
+                .where(movies.c.imdb_id.is_not(None))
+                .group_by(movies.c.imdb_id)
+                .having(sa.func.count() > 1)
+                .limit(20)
+            )
+            .scalars()
+            .all()
+        )
+        if duplicates:
+            raise RuntimeError(
+                "Movies sharing an IMDb ID must be merged before this "
+                f"migration: {duplicates}"
+            )
+
+    # CONCURRENTLY não bloqueia escritas, mas não roda dentro de transação
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_movies_imdb_id",
+            "movies",
+            ["imdb_id"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_movies_imdb_id",
+            table_name="movies",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
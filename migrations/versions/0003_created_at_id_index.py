@@ -0,0 +1,37 @@
+"""composite index for keyset pagination
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-11-22 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_movies_created_at_id",
+            "movies",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_movies_created_at_id",
+            table_name="movies",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,112 @@
+"""normalized title column with a unique index
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2024-11-23 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import context, op
+
+from app.core.titles import title_key
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 1000
+
+movies = sa.table(
+    "movies",
+    sa.column("id", sa.Integer),
+    sa.column("title", sa.String),
+    sa.column("title_normalized", sa.Text),
+)
+
+
+def upgrade() -> None:
+    if context.is_offline_mode():
+        raise RuntimeError("The title_normalized backfill needs a live connection")
+
+    bind = op.get_bind()
+    columns = {c["name"] for c in sa.inspect(bind).get_columns("movies")}
+    if "title_normalized" not in columns:
+        op.add_column("movies", sa.Column("title_normalized", sa.Text(), nullable=True))
+
+    # title_key é Python (NFKC, casefold, pontuação Unicode): backfill em lotes
+    while True:
+        rows = bind.execute(
+            sa.select(movies.c.id, movies.c.title)
+            .where(movies.c.title_normalized.is_(None))
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            movies.update()
+            .where(movies.c.id == sa.bindparam("movie_id"))
+            .values(title_normalized=sa.bindparam("key")),
+            [{"movie_id": row.id, "key": title_key(row.title)} for row in rows],
+        )
+
+    duplicates = (
+        bind.execute(
+            sa.select(movies.c.title_normalized)
+            .group_by(movies.c.title_normalized)
+            .having(sa.func.count() > 1)
+            .limit(20)
+        )
+        .scalars()
+        .all()
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Titles that only differ by case/punctuation must be merged before "
+            f"this migration: {duplicates}"
+        )
+
+    with op.batch_alter_table("movies") as batch_op:
+        batch_op.alter_column(
+            "title_normalized", existing_type=sa.Text(), nullable=False
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_movies_title_normalized",
+            "movies",
+            ["title_normalized"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # a unicidade passa para title_normalized
+        op.drop_index(
+            "ix_movies_title",
+            table_name="movies",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_movies_title",
+            "movies",
+            ["title"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_movies_title_normalized",
+            table_name="movies",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    with op.batch_alter_table("movies") as batch_op:
+        batch_op.drop_column("title_normalized")
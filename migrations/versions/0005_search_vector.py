@@ -0,0 +1,62 @@
+"""generated tsvector column and GIN index for full-text search
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2024-11-24 00:00:00
+
+PostgreSQL only. Adding a STORED generated column rewrites the table under an
+ACCESS EXCLUSIVE lock; run it in a maintenance window on large tables. The GIN
+index itself is built concurrently.
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# cópia congelada de app.models.movie.SEARCH_VECTOR_EXPRESSION
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(director, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(actors, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(writer, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(plot, '')), 'D')"
+)
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    op.execute(
+        "ALTER TABLE movies ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_movies_search_vector",
+            "movies",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_movies_search_vector",
+            table_name="movies",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.execute("ALTER TABLE movies DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,163 @@
+"""normalized genre, people and language relations
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2024-11-25 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import context, op
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.titles import split_names, title_key
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 1000
+
+# tabela de nomes -> (associação, coluna da associação)
+NAME_TABLES = {
+    "genres": ("movie_genres", "genre_id"),
+    "people": ("movie_people", "person_id"),
+    "languages": ("movie_languages", "language_id"),
+}
+
+# campo do filme -> (tabela de nomes, papel)
+FIELDS = {
+    "genre": ("genres", None),
+    "actors": ("people", "actor"),
+    "director": ("people", "director"),
+    "language": ("languages", None),
+}
+
+movies = sa.table(
+    "movies",
+    sa.column("id", sa.Integer),
+    *(sa.column(field, sa.Text) for field in FIELDS),
+)
+
+
+def _name_table(name: str) -> sa.Table:
+    return sa.table(
+        name,
+        sa.column("id", sa.Integer),
+        sa.column("name", sa.String),
+        sa.column("name_normalized", sa.Text),
+    )
+
+
+def upgrade() -> None:
+    if context.is_offline_mode():
+        raise RuntimeError("The relations backfill needs a live connection")
+
+    # bancos criados pelo create_all já têm as tabelas
+    inspector = sa.inspect(op.get_bind())
+    for name in NAME_TABLES:
+        if inspector.has_table(name):
+            continue
+        op.create_table(
+            name,
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(length=255), nullable=False),
+            sa.Column("name_normalized", sa.Text(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("name_normalized"),
+        )
+
+    for name, (association, column) in NAME_TABLES.items():
+        key_columns = ["movie_id", column]
+        if association == "movie_people":
+            key_columns.append("role")
+        if not inspector.has_table(association):
+            op.create_table(
+                association,
+                sa.Column("movie_id", sa.Integer(), nullable=False),
+                sa.Column(column, sa.Integer(), nullable=False),
+                *(
+                    [sa.Column("role", sa.String(length=20), nullable=False)]
+                    if "role" in key_columns
+                    else []
+                ),
+                sa.ForeignKeyConstraint(
+                    ["movie_id"], ["movies.id"], ondelete="CASCADE"
+                ),
+                sa.ForeignKeyConstraint([column], [f"{name}.id"], ondelete="CASCADE"),
+                sa.PrimaryKeyConstraint(*key_columns),
+            )
+        # tabelas novas e vazias: o índice não precisa de CONCURRENTLY
+        index_columns = [column, *key_columns[2:], "movie_id"]
+        op.create_index(
+            f"ix_{association}_{'_'.join(index_columns)}",
+            association,
+            index_columns,
+            if_not_exists=True,
+        )
+
+    _backfill(op.get_bind())
+
+
+def _backfill(bind: sa.Connection) -> None:
+    dialect = postgresql if bind.dialect.name == "postgresql" else sqlite
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(movies)
+            .where(movies.c.id > last_id)
+            .order_by(movies.c.id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        names: dict[str, dict[str, str]] = {name: {} for name in NAME_TABLES}
+        links = []
+        for row in rows:
+            for field, (name_table, role) in FIELDS.items():
+                for value in split_names(getattr(row, field)):
+                    key = title_key(value)
+                    names[name_table].setdefault(key, value)
+                    links.append((name_table, row.id, key, role))
+
+        ids: dict[str, dict[str, int]] = {}
+        for name_table, table_names in names.items():
+            if not table_names:
+                continue
+            target = _name_table(name_table)
+            bind.execute(
+                dialect.insert(target).on_conflict_do_nothing(),
+                [{"name": v, "name_normalized": k} for k, v in table_names.items()],
+            )
+            ids[name_table] = dict(
+                bind.execute(
+                    sa.select(target.c.name_normalized, target.c.id).where(
+                        target.c.name_normalized.in_(table_names)
+                    )
+                )
+                .tuples()
+                .all()
+            )
+
+        association_rows: dict[str, list[dict]] = {}
+        for name_table, movie_id, key, role in links:
+            association, column = NAME_TABLES[name_table]
+            link = {"movie_id": movie_id, column: ids[name_table][key]}
+            if role is not None:
+                link["role"] = role
+            association_rows.setdefault(association, []).append(link)
+        for association, links_rows in association_rows.items():
+            target = sa.table(association, *(sa.column(c) for c in links_rows[0]))
+            bind.execute(dialect.insert(target).on_conflict_do_nothing(), links_rows)
+
+
+def downgrade() -> None:
+    for association in ("movie_genres", "movie_people", "movie_languages"):
+        op.drop_table(association)
+    for name in NAME_TABLES:
+        op.drop_table(name)
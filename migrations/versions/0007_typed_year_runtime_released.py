@@ -0,0 +1,105 @@
+"""typed year range, runtime and release date columns
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2024-11-26 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import context, op
+
+from app.clients.omdb_client import OMDBClient
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH = 1000
+
+COLUMNS = {
+    "year_start": sa.Integer(),
+    "year_end": sa.Integer(),
+    "runtime_minutes": sa.Integer(),
+    "released_date": sa.Date(),
+}
+
+movies = sa.table(
+    "movies",
+    sa.column("id", sa.Integer),
+    sa.column("year", sa.String),
+    sa.column("runtime", sa.String),
+    sa.column("released", sa.String),
+    *(sa.column(name, type_) for name, type_ in COLUMNS.items()),
+)
+
+
+def upgrade() -> None:
+    if context.is_offline_mode():
+        raise RuntimeError("The typed columns backfill needs a live connection")
+
+    bind = op.get_bind()
+    # bancos criados pelo create_all já têm as colunas
+    existing = {c["name"] for c in sa.inspect(bind).get_columns("movies")}
+    # colunas nulas sem default: só metadado, sem reescrever a tabela
+    for name, type_ in COLUMNS.items():
+        if name not in existing:
+            op.add_column("movies", sa.Column(name, type_, nullable=True))
+
+    # mesmo parser da gravação (OMDBClient._parse_omdb_response)
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(movies.c.id, movies.c.year, movies.c.runtime, movies.c.released)
+            .where(movies.c.id > last_id)
+            .order_by(movies.c.id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        values = []
+        for row in rows:
+            year_start, year_end = OMDBClient._parse_year_range(row.year)
+            values.append(
+                {
+                    "movie_id": row.id,
+                    "year_start": year_start,
+                    "year_end": year_end,
+                    "runtime_minutes": OMDBClient._parse_runtime(row.runtime),
+                    "released_date": OMDBClient._parse_date(row.released),
+                }
+            )
+        bind.execute(
+            movies.update()
+            .where(movies.c.id == sa.bindparam("movie_id"))
+            .values({name: sa.bindparam(name) for name in COLUMNS}),
+            values,
+        )
+
+    with op.get_context().autocommit_block():
+        for name in COLUMNS:
+            op.create_index(
+                f"ix_movies_{name}",
+                "movies",
+                [name],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in COLUMNS:
+            op.drop_index(
+                f"ix_movies_{name}",
+                table_name="movies",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    with op.batch_alter_table("movies") as batch_op:
+        for name in COLUMNS:
+            batch_op.drop_column(name)
@@ -0,0 +1,37 @@
+"""index on updated_at for the collection version (list ETags)
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2024-11-27 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_movies_updated_at",
+            "movies",
+            ["updated_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_movies_updated_at",
+            table_name="movies",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,36 @@
+"""collection version counter for list ETags
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2024-11-28 00:00:00
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import context, op
+
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # bancos criados pelo create_all já têm a tabela
+    if not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table(
+        "movie_catalog_version"
+    ):
+        return
+    # a linha única é criada pelo primeiro upsert do MovieRepository
+    op.create_table(
+        "movie_catalog_version",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("movie_catalog_version")
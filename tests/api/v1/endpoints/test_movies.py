@@ -1,10 +1,21 @@
+import csv
+import io
+import json
+
 import pytest
 from unittest.mock import AsyncMock, patch
 
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.database import READ_PRIMARY_COOKIE, Base
+from app.services.movie_service import _count_cache
+
 from app.core.exceptions import (
+    CircuitOpenError,
     MovieAlreadyExistsError,
     MovieNotFoundError,
     ExternalAPIError,
+    QuotaExceededError,
 )
 
 
@@ -55,6 +66,27 @@ class TestMovieEndpoints:
             assert response.status_code == 409
             assert "already exists" in response.json()["detail"].lower()
 
+    @pytest.mark.asyncio
+    async def test_create_movie_duplicate_race(self, client, sample_movie_data):
+        """Test that a duplicate slipping past the existence check is a 409"""
+        with (
+            patch(
+                "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+                new_callable=AsyncMock,
+            ) as mock_search,
+            patch(
+                "app.repositories.movie_repository.MovieRepository.exists_by_title",
+                new_callable=AsyncMock,
+                return_value=False,
+            ),
+        ):
+            mock_search.return_value = sample_movie_data
+            first = await client.post("/api/v1/movies", json={"title": "The Matrix"})
+            second = await client.post("/api/v1/movies", json={"title": "Matrix"})
+
+        assert first.status_code == 201
+        assert second.status_code == 409
+
     @pytest.mark.asyncio
     async def test_create_movie_not_found_in_omdb(self, client):
         """Test creating movie not found in OMDB"""
@@ -85,6 +117,38 @@ class TestMovieEndpoints:
             assert response.status_code == 502
             assert "API Error" in response.json()["detail"]
 
+    @pytest.mark.asyncio
+    async def test_create_movie_quota_exceeded(self, client):
+        """Test creating movie when the OMDB quota is exhausted"""
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+            new_callable=AsyncMock,
+        ) as mock_search:
+            mock_search.side_effect = QuotaExceededError(
+                "OMDB daily request budget exhausted", retry_after=59.5
+            )
+
+            response = await client.post("/api/v1/movies", json={"title": "Test Movie"})
+
+            assert response.status_code == 429
+            assert response.headers["retry-after"] == "60"
+
+    @pytest.mark.asyncio
+    async def test_create_movie_circuit_open(self, client):
+        """Test creating movie while the OMDB circuit breaker is open"""
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+            new_callable=AsyncMock,
+        ) as mock_search:
+            mock_search.side_effect = CircuitOpenError(
+                "OMDB circuit breaker is open", retry_after=4.2
+            )
+
+            response = await client.post("/api/v1/movies", json={"title": "Test Movie"})
+
+            assert response.status_code == 503
+            assert response.headers["retry-after"] == "5"
+
     @pytest.mark.asyncio
     async def test_create_movie_invalid_input(self, client):
         """Test creating movie with invalid input"""
@@ -99,6 +163,107 @@ class TestMovieEndpoints:
 
         assert response.status_code == 422
 
+    @pytest.mark.asyncio
+    async def test_create_movies_batch(self, client, sample_movie_data):
+        """Test bulk import with per-title status"""
+
+        async def search(title):
+            if title == "Missing":
+                raise MovieNotFoundError("Movie 'Missing' not found in OMDB")
+            return {**sample_movie_data, "title": title, "imdb_id": None}
+
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+            new_callable=AsyncMock,
+        ) as mock_search:
+            mock_search.side_effect = search
+            await client.post("/api/v1/movies", json={"title": "The Matrix"})
+
+            response = await client.post(
+                "/api/v1/movies/batch",
+                json={"titles": ["The Matrix", "Inception", "Missing"]},
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [(r["title"], r["status"]) for r in data["results"]] == [
+            ("The Matrix", "exists"),
+            ("Inception", "created"),
+            ("Missing", "not_found"),
+        ]
+        assert data["results"][1]["movie"]["id"] is not None
+        assert (data["created"], data["existing"], data["not_found"]) == (1, 1, 1)
+        assert data["errors"] == 0
+
+        list_response = await client.get("/api/v1/movies")
+        assert list_response.json()["total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_create_movies_batch_invalid(self, client):
+        """Test batch validation"""
+        response = await client.post("/api/v1/movies/batch", json={"titles": []})
+        assert response.status_code == 422
+
+        response = await client.post("/api/v1/movies/batch", json={"titles": [""]})
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_create_and_get_movie_by_imdb_id(self, client, sample_movie_data):
+        """Test creating and fetching a movie by IMDb ID"""
+        with patch(
+            "app.clients.omdb_client.OMDBClient.get_movie_by_imdb_id",
+            new_callable=AsyncMock,
+        ) as mock_get:
+            mock_get.return_value = sample_movie_data
+
+            create_resp = await client.post(
+                "/api/v1/movies/by-imdb", json={"imdb_id": "tt0133093"}
+            )
+            duplicate_resp = await client.post(
+                "/api/v1/movies/by-imdb", json={"imdb_id": "tt0133093"}
+            )
+
+        assert create_resp.status_code == 201
+        assert create_resp.json()["imdb_id"] == "tt0133093"
+        assert duplicate_resp.status_code == 409
+        mock_get.assert_called_once_with("tt0133093")
+
+        response = await client.get("/api/v1/movies/by-imdb/tt0133093")
+        assert response.status_code == 200
+        assert response.json()["id"] == create_resp.json()["id"]
+
+    @pytest.mark.asyncio
+    async def test_get_movie_by_imdb_id_not_found(self, client):
+        """Test fetching an unknown IMDb ID"""
+        response = await client.get("/api/v1/movies/by-imdb/tt9999999")
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_imdb_id_validation(self, client):
+        """Test that malformed IMDb IDs are rejected"""
+        response = await client.get("/api/v1/movies/by-imdb/abc")
+        assert response.status_code == 422
+
+        response = await client.post("/api/v1/movies/by-imdb", json={"imdb_id": "1"})
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_create_movie_other_spelling_conflict(
+        self, client, sample_movie_data
+    ):
+        """Test that another spelling resolving to a stored movie returns 409"""
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+            new_callable=AsyncMock,
+        ) as mock_search:
+            mock_search.return_value = sample_movie_data
+            await client.post("/api/v1/movies", json={"title": "The Matrix"})
+
+            response = await client.post("/api/v1/movies", json={"title": "Matrix"})
+
+        assert response.status_code == 409
+
     @pytest.mark.asyncio
     async def test_get_movie_by_id_success(self, client, sample_movie_data):
         """Test getting movie by ID successfully"""
@@ -153,9 +318,13 @@ class TestMovieEndpoints:
 
             # Create movies
             await client.post("/api/v1/movies", json={"title": "The Matrix"})
-            
+
             # Modify sample data for second movie
-            mock_search.return_value = {**sample_movie_data, "title": "Inception"}
+            mock_search.return_value = {
+                **sample_movie_data,
+                "title": "Inception",
+                "imdb_id": None,
+            }
             await client.post("/api/v1/movies", json={"title": "Inception"})
 
             # List movies
@@ -175,7 +344,11 @@ class TestMovieEndpoints:
         ) as mock_search:
             # Create 3 movies
             for i, title in enumerate(["Movie 1", "Movie 2", "Movie 3"]):
-                mock_search.return_value = {**sample_movie_data, "title": title}
+                mock_search.return_value = {
+                    **sample_movie_data,
+                    "title": title,
+                    "imdb_id": None,
+                }
                 await client.post("/api/v1/movies", json={"title": title})
 
             # Test skip and limit
@@ -186,6 +359,411 @@ class TestMovieEndpoints:
             assert len(data["movies"]) == 2
             assert data["total"] == 3
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["exact", "cached", "estimate"])
+    async def test_list_movies_count_modes(self, client, sample_movie_data, mode):
+        """Test that every count mode reports the total and whether it is exact"""
+        _count_cache.clear()
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+            new_callable=AsyncMock,
+        ) as mock_search:
+            mock_search.return_value = sample_movie_data
+            await client.post("/api/v1/movies", json={"title": "The Matrix"})
+
+        response = await client.get("/api/v1/movies", params={"count": mode})
+
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+        assert response.json()["total_estimated"] is False
+
+    @pytest.mark.asyncio
+    async def test_list_movies_invalid_count_mode(self, client):
+        """Test validation of the count mode"""
+        response = await client.get("/api/v1/movies", params={"count": "guess"})
+
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_list_movies_cursor_pagination(self, client, sample_movie_data):
+        """Test walking the whole list with next_cursor"""
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+            new_callable=AsyncMock,
+        ) as mock_search:
+            for i in range(5):
+                mock_search.return_value = {
+                    **sample_movie_data,
+                    "title": f"Movie {i}",
+                    "imdb_id": None,
+                }
+                await client.post("/api/v1/movies", json={"title": f"Movie {i}"})
+
+        titles = []
+        params = {"limit": 2}
+        while True:
+            response = await client.get("/api/v1/movies", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            titles += [movie["title"] for movie in data["movies"]]
+            if data["next_cursor"] is None:
+                break
+            params = {"limit": 2, "cursor": data["next_cursor"]}
+
+        assert titles == [f"Movie {i}" for i in reversed(range(5))]
+
+    @pytest.mark.asyncio
+    async def test_list_movies_invalid_cursor(self, client):
+        """Test that a malformed cursor is rejected"""
+        response = await client.get("/api/v1/movies", params={"cursor": "garbage"})
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_list_movies_cursor_with_skip(self, client):
+        """Test that skip and cursor cannot be combined"""
+        response = await client.get(
+            "/api/v1/movies", params={"cursor": "abc", "skip": 10}
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_reads_use_replica_after_write_window(
+        self, client, sample_movie_data
+    ):
+        """Test reads hit the replica except right after the client wrote"""
+        replica = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with replica.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = [async_sessionmaker(replica, class_=AsyncSession)]
+
+        with (
+            patch("app.db.database.ReplicaSessions", sessions),
+            patch(
+                "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+                new_callable=AsyncMock,
+                return_value=sample_movie_data,
+            ),
+        ):
+            response = await client.post("/api/v1/movies", json={"title": "Matrix"})
+            assert READ_PRIMARY_COOKIE in response.cookies
+
+            # o cookie fixa a leitura no primário, que já tem o filme
+            response = await client.get("/api/v1/movies")
+            assert response.json()["total"] == 1
+
+            # sem o cookie a leitura vai à réplica (vazia neste teste)
+            client.cookies.clear()
+            response = await client.get("/api/v1/movies")
+            assert response.json()["total"] == 0
+
+        await replica.dispose()
+
+    @pytest.mark.asyncio
+    async def test_list_movies_filters(self, client, sample_movie_data):
+        """Test genre/actor/director/language filters on the list endpoint"""
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+            new_callable=AsyncMock,
+        ) as mock_search:
+            mock_search.side_effect = [
+                sample_movie_data,
+                {
+                    **sample_movie_data,
+                    "title": "Amélie",
+                    "imdb_id": "tt0211915",
+                    "genre": "Comedy, Romance",
+                    "actors": "Audrey Tautou",
+                    "director": "Jean-Pierre Jeunet",
+                    "language": "French",
+                },
+            ]
+            await client.post("/api/v1/movies", json={"title": "The Matrix"})
+            await client.post("/api/v1/movies", json={"title": "Amélie"})
+
+        matrix = await client.get(
+            "/api/v1/movies", params={"genre": "sci-fi", "actor": "keanu reeves"}
+        )
+        french = await client.get(
+            "/api/v1/movies",
+            params={"language": "French", "director": "Jean-Pierre Jeunet"},
+        )
+        none = await client.get("/api/v1/movies", params={"genre": "Horror"})
+
+        assert [m["title"] for m in matrix.json()["movies"]] == ["The Matrix"]
+        assert matrix.json()["total"] == 1
+        assert [m["title"] for m in french.json()["movies"]] == ["Amélie"]
+        assert none.json() == {
+            "movies": [],
+            "total": 0,
+            "total_estimated": False,
+            "next_cursor": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_list_movies_year_runtime_and_sort(self, client, sample_movie_data):
+        """Test typed range filters and sort on the list endpoint"""
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+            new_callable=AsyncMock,
+        ) as mock_search:
+            mock_search.side_effect = [
+                {
+                    **sample_movie_data,
+                    "year_start": 1999,
+                    "year_end": 1999,
+                    "runtime_minutes": 136,
+                },
+                {
+                    **sample_movie_data,
+                    "title": "The Matrix Reloaded",
+                    "imdb_id": "tt0234215",
+                    "year_start": 2003,
+                    "year_end": 2003,
+                    "runtime_minutes": 138,
+                },
+            ]
+            await client.post("/api/v1/movies", json={"title": "The Matrix"})
+            await client.post("/api/v1/movies", json={"title": "Reloaded"})
+
+        by_year = await client.get(
+            "/api/v1/movies", params={"sort": "year", "min_runtime": 130}
+        )
+        recent = await client.get("/api/v1/movies", params={"year_from": 2000})
+
+        assert [m["year_start"] for m in by_year.json()["movies"]] == [1999, 2003]
+        assert [m["title"] for m in recent.json()["movies"]] == ["The Matrix Reloaded"]
+
+    @pytest.mark.asyncio
+    async def test_list_movies_cursor_requires_default_sort(self, client):
+        """Test that the keyset cursor cannot be combined with another sort"""
+        response = await client.get(
+            "/api/v1/movies", params={"sort": "-year", "cursor": "abc"}
+        )
+        invalid = await client.get("/api/v1/movies", params={"sort": "title"})
+
+        assert response.status_code == 400
+        assert invalid.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_sparse_fieldsets(self, client, sample_movie_data):
+        """Test fields= on the list and get endpoints"""
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+            new_callable=AsyncMock,
+            return_value=sample_movie_data,
+        ):
+            created = await client.post("/api/v1/movies", json={"title": "Matrix"})
+        movie_id = created.json()["id"]
+
+        listing = await client.get(
+            "/api/v1/movies", params={"fields": "title,year,imdb_rating"}
+        )
+        single = await client.get(f"/api/v1/movies/{movie_id}?fields=title")
+
+        assert listing.status_code == 200
+        assert listing.json() == {
+            "movies": [
+                {
+                    "id": movie_id,
+                    "title": "The Matrix",
+                    "year": "1999",
+                    "imdb_rating": 8.7,
+                }
+            ],
+            "total": 1,
+            "total_estimated": False,
+            "next_cursor": None,
+        }
+        assert single.json() == {"id": movie_id, "title": "The Matrix"}
+
+    @pytest.mark.asyncio
+    async def test_sparse_fieldsets_cursor(self, client, sample_movie_data):
+        """Test that a projected page still hands out a keyset cursor"""
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+            new_callable=AsyncMock,
+        ) as mock_search:
+            mock_search.side_effect = [
+                {**sample_movie_data, "title": f"Movie {i}", "imdb_id": None}
+                for i in range(3)
+            ]
+            for i in range(3):
+                await client.post("/api/v1/movies", json={"title": f"Movie {i}"})
+
+        first = await client.get(
+            "/api/v1/movies", params={"fields": "title", "limit": 2}
+        )
+        second = await client.get(
+            "/api/v1/movies",
+            params={
+                "fields": "title",
+                "limit": 2,
+                "cursor": first.json()["next_cursor"],
+            },
+        )
+
+        assert [m["title"] for m in first.json()["movies"]] == ["Movie 2", "Movie 1"]
+        assert second.json()["movies"] == [
+            {"id": second.json()["movies"][0]["id"], "title": "Movie 0"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_sparse_fieldsets_invalid(self, client):
+        """Test that unknown fields are a 400"""
+        listing = await client.get("/api/v1/movies", params={"fields": "title,foo"})
+        single = await client.get("/api/v1/movies/1", params={"fields": "bar"})
+
+        assert listing.status_code == 400
+        assert "foo" in listing.json()["detail"]
+        assert single.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_get_movie_conditional(self, client, sample_movie_data):
+        """Test ETag, Cache-Control and 304 on GET /movies/{id}"""
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+            new_callable=AsyncMock,
+            return_value=sample_movie_data,
+        ):
+            created = await client.post("/api/v1/movies", json={"title": "Matrix"})
+        url = f"/api/v1/movies/{created.json()['id']}"
+
+        first = await client.get(url)
+        etag = first.headers["etag"]
+        cached = await client.get(url, headers={"If-None-Match": etag})
+        sparse = await client.get(url, params={"fields": "title"})
+        stale = await client.get(url, headers={"If-None-Match": '"1-0"'})
+
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "private, max-age=0"
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+        assert sparse.headers["etag"] != etag
+        assert stale.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_get_movie_conditional_not_found(self, client):
+        """Test If-None-Match on a missing movie still returns 404"""
+        response = await client.get(
+            "/api/v1/movies/999", headers={"If-None-Match": "*"}
+        )
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_list_movies_conditional(self, client, sample_movie_data):
+        """Test the list ETag follows the collection version and query"""
+        first = await client.get("/api/v1/movies", params={"limit": 10})
+        etag = first.headers["etag"]
+        cached = await client.get(
+            "/api/v1/movies", params={"limit": 10}, headers={"If-None-Match": etag}
+        )
+        other_page = await client.get(
+            "/api/v1/movies", params={"limit": 5}, headers={"If-None-Match": etag}
+        )
+
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+            new_callable=AsyncMock,
+            return_value=sample_movie_data,
+        ):
+            await client.post("/api/v1/movies", json={"title": "Matrix"})
+        changed = await client.get(
+            "/api/v1/movies", params={"limit": 10}, headers={"If-None-Match": etag}
+        )
+
+        assert cached.status_code == 304
+        assert other_page.status_code == 200
+        assert changed.status_code == 200
+        assert changed.json()["total"] == 1
+        assert changed.headers["etag"] != etag
+
+    @pytest.mark.asyncio
+    async def test_search_movies(self, client, sample_movie_data):
+        """Test full-text search over stored movies"""
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+            new_callable=AsyncMock,
+            return_value=sample_movie_data,
+        ):
+            await client.post("/api/v1/movies", json={"title": "The Matrix"})
+
+        response = await client.get("/api/v1/movies/search", params={"q": "reeves"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [m["title"] for m in data["movies"]] == ["The Matrix"]
+        assert data["has_more"] is False
+
+    @pytest.mark.asyncio
+    async def test_search_movies_invalid_query(self, client):
+        """Test search parameter validation"""
+        missing = await client.get("/api/v1/movies/search")
+        bad_limit = await client.get(
+            "/api/v1/movies/search", params={"q": "x", "limit": 101}
+        )
+
+        assert missing.status_code == 422
+        assert bad_limit.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_export_movies_ndjson(self, client, sample_movie_data):
+        """Test the export streams every movie as NDJSON across chunks"""
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+            new_callable=AsyncMock,
+        ) as mock_search:
+            for title in ("The Matrix", "Inception", "Alien"):
+                mock_search.return_value = {
+                    **sample_movie_data,
+                    "title": title,
+                    "imdb_id": None,
+                }
+                await client.post("/api/v1/movies", json={"title": title})
+
+        with patch("app.core.config.settings.MOVIE_EXPORT_CHUNK_SIZE", 2):
+            response = await client.get("/api/v1/movies/export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert 'filename="movies.ndjson"' in response.headers["content-disposition"]
+        movies = [json.loads(line) for line in response.text.splitlines()]
+        assert [m["title"] for m in movies] == ["The Matrix", "Inception", "Alien"]
+        assert movies[0]["genre"] == "Action, Sci-Fi"
+
+    @pytest.mark.asyncio
+    async def test_export_movies_csv(self, client, sample_movie_data):
+        """Test the CSV export has a header row and honours filters"""
+        response = await client.get("/api/v1/movies/export?format=csv")
+        assert response.text.splitlines()[0].startswith("id,imdb_id,title")
+
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movie_by_title",
+            new_callable=AsyncMock,
+            return_value=sample_movie_data,
+        ):
+            await client.post("/api/v1/movies", json={"title": "The Matrix"})
+
+        response = await client.get("/api/v1/movies/export?format=csv")
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["title"] == "The Matrix"
+        assert rows[0]["imdb_rating"] == "8.7"
+
+        response = await client.get("/api/v1/movies/export?format=csv&genre=Drama")
+        assert len(response.text.splitlines()) == 1
+
+    @pytest.mark.asyncio
+    async def test_export_movies_invalid_format(self, client):
+        """Test that unknown export formats are rejected"""
+        response = await client.get("/api/v1/movies/export?format=xml")
+
+        assert response.status_code == 422
+
     @pytest.mark.asyncio
     async def test_list_movies_invalid_pagination(self, client):
         """Test listing movies with invalid pagination parameters"""
@@ -217,7 +795,11 @@ class TestMovieEndpoints:
             new_callable=AsyncMock,
         ) as mock_search:
             special_title = "Movie: The Sequel (2024)"
-            mock_search.return_value = {**sample_movie_data, "title": special_title}
+            mock_search.return_value = {
+                **sample_movie_data,
+                "title": special_title,
+                "imdb_id": None,
+            }
 
             response = await client.post(
                 "/api/v1/movies", json={"title": special_title}
@@ -233,3 +815,104 @@ class TestMovieEndpoints:
 
         # FastAPI CORS middleware should add these headers
         assert response.status_code == 200
+
+    @staticmethod
+    def _search_page(query: str, page: int, total_pages: int = 3) -> dict:
+        return {
+            "query": query,
+            "page": page,
+            "total_results": total_pages * 10,
+            "total_pages": total_pages,
+            "results": [
+                {
+                    "imdb_id": f"tt{page:07d}",
+                    "title": f"{query} {page}",
+                    "year": "1999",
+                    "type": "movie",
+                    "poster": "N/A",
+                }
+            ],
+        }
+
+    @pytest.mark.asyncio
+    async def test_search_omdb_streams_pages(self, client):
+        """Test that OMDB search streams one NDJSON line per page"""
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movies",
+            new_callable=AsyncMock,
+        ) as mock_search:
+            mock_search.side_effect = lambda query, page=1: self._search_page(
+                query, page
+            )
+
+            response = await client.get(
+                "/api/v1/movies/omdb/search", params={"q": "Matrix", "max_pages": 5}
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        pages = [json.loads(line) for line in response.text.splitlines()]
+        assert [page["page"] for page in pages] == [1, 2, 3]
+        assert pages[0]["results"][0]["title"] == "Matrix 1"
+
+    @pytest.mark.asyncio
+    async def test_search_omdb_default_single_page(self, client):
+        """Test that only the first page is fetched by default"""
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movies",
+            new_callable=AsyncMock,
+        ) as mock_search:
+            mock_search.side_effect = lambda query, page=1: self._search_page(
+                query, page
+            )
+
+            response = await client.get(
+                "/api/v1/movies/omdb/search", params={"q": "Matrix"}
+            )
+
+        assert len(response.text.splitlines()) == 1
+        mock_search.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_search_omdb_first_page_error(self, client):
+        """Test that a failure on the first page maps to an HTTP error"""
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movies",
+            new_callable=AsyncMock,
+        ) as mock_search:
+            mock_search.side_effect = ExternalAPIError("Connection failed")
+
+            response = await client.get(
+                "/api/v1/movies/omdb/search", params={"q": "Matrix"}
+            )
+
+        assert response.status_code == 502
+
+    @pytest.mark.asyncio
+    async def test_search_omdb_later_page_error(self, client):
+        """Test that a failure after the first page ends the stream with an error"""
+
+        async def fake_search(query, page=1):
+            if page > 1:
+                raise QuotaExceededError("OMDB daily request budget exhausted")
+            return self._search_page(query, page)
+
+        with patch(
+            "app.clients.omdb_client.OMDBClient.search_movies",
+            side_effect=fake_search,
+        ):
+            response = await client.get(
+                "/api/v1/movies/omdb/search", params={"q": "Matrix", "max_pages": 3}
+            )
+
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0]["page"] == 1
+        assert "budget exhausted" in lines[-1]["error"]
+
+    @pytest.mark.asyncio
+    async def test_search_omdb_requires_query(self, client):
+        """Test that the search query is required"""
+        response = await client.get("/api/v1/movies/omdb/search")
+
+        assert response.status_code == 422
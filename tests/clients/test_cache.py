@@ -0,0 +1,94 @@
+import pytest
+
+from app.clients.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    """Test suite for TTLCache"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def test_get_missing_returns_default(self, clock):
+        """Test that a missing key counts as a miss"""
+        cache = TTLCache(2, clock=clock)
+
+        assert cache.get("missing") is None
+        assert cache.get("missing", "default") == "default"
+        assert cache.misses == 2
+        assert cache.hits == 0
+
+    def test_set_and_get(self, clock):
+        """Test storing and reading a value"""
+        cache = TTLCache(2, clock=clock)
+
+        cache.set("a", 1, ttl=10)
+
+        assert cache.get("a") == 1
+        assert cache.hits == 1
+
+    def test_entry_expires_after_ttl(self, clock):
+        """Test that entries expire after their own ttl"""
+        cache = TTLCache(2, clock=clock)
+        cache.set("short", 1, ttl=5)
+        cache.set("long", 2, ttl=50)
+
+        clock.now = 10
+
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+        assert cache.expirations == 1
+        assert len(cache) == 1
+
+    def test_lru_eviction(self, clock):
+        """Test that the least recently used entry is evicted"""
+        cache = TTLCache(2, clock=clock)
+        cache.set("a", 1, ttl=10)
+        cache.set("b", 2, ttl=10)
+        cache.get("a")
+
+        cache.set("c", 3, ttl=10)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+    def test_non_positive_ttl_is_not_stored(self, clock):
+        """Test that a ttl of zero disables caching for that entry"""
+        cache = TTLCache(2, clock=clock)
+
+        cache.set("a", 1, ttl=0)
+
+        assert len(cache) == 0
+
+    def test_invalid_max_size(self):
+        """Test that max_size must be positive"""
+        with pytest.raises(ValueError):
+            TTLCache(0)
+
+    def test_stats(self, clock):
+        """Test the counters exposed by stats"""
+        cache = TTLCache(1, clock=clock)
+        cache.set("a", 1, ttl=10)
+        cache.set("b", 2, ttl=10)
+        cache.get("a")
+        cache.get("b")
+
+        assert cache.stats() == {
+            "size": 1,
+            "max_size": 1,
+            "hits": 1,
+            "misses": 1,
+            "evictions": 1,
+            "expirations": 0,
+        }
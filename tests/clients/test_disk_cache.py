@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from app.clients.disk_cache import DiskCache, _seed, make_key
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestDiskCache:
+    """Test suite for DiskCache"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def disk_cache(self, tmp_path, clock):
+        cache = DiskCache(str(tmp_path / "omdb.sqlite"), max_bytes=10_000, clock=clock)
+        yield cache
+        cache.close()
+
+    def test_make_key_ignores_api_key_and_title_case(self):
+        """Test that keys do not depend on the api key or title spelling"""
+        first = make_key({"apikey": "a", "t": "The Matrix", "type": "movie"})
+        second = make_key({"type": "movie", "t": "the  matrix", "apikey": "b"})
+
+        assert first == second
+        assert "apikey" not in first
+
+    @pytest.mark.asyncio
+    async def test_set_and_get(self, disk_cache, omdb_response_success):
+        """Test storing and reading a raw payload"""
+        params = {"apikey": "key", "t": "The Matrix"}
+
+        await disk_cache.set(params, omdb_response_success, ttl=60)
+        result = await disk_cache.get(params)
+
+        assert result == omdb_response_success
+        assert disk_cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_a_miss(self, disk_cache, clock):
+        """Test that expired payloads are not returned"""
+        params = {"t": "The Matrix"}
+        await disk_cache.set(params, {"Response": "True"}, ttl=60)
+
+        clock.now += 61
+
+        assert await disk_cache.get(params) is None
+        assert disk_cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_survives_reopen(self, tmp_path, omdb_response_success):
+        """Test that entries persist across process restarts"""
+        path = str(tmp_path / "omdb.sqlite")
+        first = DiskCache(path, max_bytes=10_000)
+        await first.set({"t": "The Matrix"}, omdb_response_success, ttl=60)
+        first.close()
+
+        second = DiskCache(path, max_bytes=10_000)
+        try:
+            assert await second.get({"t": "The Matrix"}) == omdb_response_success
+        finally:
+            second.close()
+
+    @pytest.mark.asyncio
+    async def test_compact_removes_expired_and_oldest(self, tmp_path, clock):
+        """Test that compaction drops expired entries and enforces max_bytes"""
+        cache = DiskCache(str(tmp_path / "omdb.sqlite"), max_bytes=60, clock=clock)
+        try:
+            await cache.set({"t": "expired"}, {"v": "x"}, ttl=1)
+            for i in range(4):
+                clock.now += 1
+                await cache.set({"t": f"movie {i}"}, {"v": "x" * 10}, ttl=600)
+
+            removed = await cache.compact()
+
+            assert removed == 2
+            assert cache.stats()["bytes"] <= 60
+            assert await cache.get({"t": "movie 0"}) is None
+            assert await cache.get({"t": "movie 1"}) is not None
+        finally:
+            cache.close()
+
+    def test_seed_from_jsonl(self, disk_cache, tmp_path, omdb_response_success):
+        """Test offline seeding from a JSONL file"""
+        source = tmp_path / "seed.jsonl"
+        source.write_text(
+            json.dumps(
+                {"params": {"t": "The Matrix"}, "payload": omdb_response_success}
+            )
+            + "\n\n"
+        )
+
+        assert _seed(disk_cache, str(source), ttl=60) == 1
+        assert disk_cache.get_sync({"t": "the matrix"}) == omdb_response_success
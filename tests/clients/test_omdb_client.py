@@ -1,9 +1,26 @@
+import asyncio
+from datetime import date
+
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 import httpx
 
-from app.clients.omdb_client import OMDBClient
-from app.core.exceptions import ExternalAPIError, MovieNotFoundError
+from app.clients.cache import TTLCache
+from app.clients.disk_cache import DiskCache
+from app.clients.omdb_client import OMDBClient, create_http_client
+from app.clients.rate_limiter import (
+    AdaptiveConcurrencyLimiter,
+    DailyBudget,
+    OMDBRateLimiter,
+    TokenBucket,
+)
+from app.clients.resilience import CircuitBreaker, RetryPolicy
+from app.core.exceptions import (
+    CircuitOpenError,
+    ExternalAPIError,
+    MovieNotFoundError,
+    QuotaExceededError,
+)
 
 
 class TestOMDBClient:
@@ -76,6 +93,400 @@ class TestOMDBClient:
 
             assert "Failed to connect to OMDB" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    async def test_get_movie_by_imdb_id_success(
+        self, omdb_client, omdb_response_success
+    ):
+        """Test lookup by IMDb ID uses the i= parameter"""
+        with patch("httpx.AsyncClient.get") as mock_get:
+            mock_response = MagicMock()
+            mock_response.json.return_value = omdb_response_success
+            mock_response.raise_for_status = MagicMock()
+            mock_get.return_value = mock_response
+
+            result = await omdb_client.get_movie_by_imdb_id("tt0133093")
+
+            params = mock_get.call_args.kwargs["params"]
+            assert params["i"] == "tt0133093"
+            assert "t" not in params
+        assert result["imdb_id"] == "tt0133093"
+
+    @pytest.mark.asyncio
+    async def test_get_movie_by_imdb_id_not_found(
+        self, omdb_client, omdb_response_not_found
+    ):
+        """Test lookup by unknown IMDb ID"""
+        with patch("httpx.AsyncClient.get") as mock_get:
+            mock_response = MagicMock()
+            mock_response.json.return_value = omdb_response_not_found
+            mock_response.raise_for_status = MagicMock()
+            mock_get.return_value = mock_response
+
+            with pytest.raises(MovieNotFoundError) as exc_info:
+                await omdb_client.get_movie_by_imdb_id("tt0000000")
+
+        assert "tt0000000" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_search_movie_uses_injected_http_client(self, omdb_response_success):
+        """Test that a shared http client is reused instead of a new one"""
+        mock_response = MagicMock()
+        mock_response.json.return_value = omdb_response_success
+        mock_response.raise_for_status = MagicMock()
+        http_client = MagicMock()
+        http_client.get = AsyncMock(return_value=mock_response)
+
+        omdb_client = OMDBClient(http_client=http_client)
+        with patch("httpx.AsyncClient") as mock_client_cls:
+            result = await omdb_client.search_movie_by_title("The Matrix")
+
+            mock_client_cls.assert_not_called()
+
+        assert result["title"] == "The Matrix"
+        http_client.get.assert_awaited_once()
+        assert http_client.get.call_args.kwargs["params"]["t"] == "The Matrix"
+
+    @pytest.mark.asyncio
+    async def test_search_movie_cache_hit(self, omdb_response_success):
+        """Test that a cached title does not go to the network again"""
+        omdb_client = OMDBClient(cache=TTLCache(10))
+        with patch("httpx.AsyncClient.get") as mock_get:
+            mock_response = MagicMock()
+            mock_response.json.return_value = omdb_response_success
+            mock_response.raise_for_status = MagicMock()
+            mock_get.return_value = mock_response
+
+            first = await omdb_client.search_movie_by_title("The Matrix")
+            second = await omdb_client.search_movie_by_title("the  matrix")
+
+            mock_get.assert_called_once()
+
+        assert first == second
+        assert second is not first
+        assert omdb_client.cache.hits == 1
+        assert omdb_client.stats()["cache"]["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_search_movie_negative_cache(self, omdb_response_not_found):
+        """Test that not found answers are cached too"""
+        omdb_client = OMDBClient(cache=TTLCache(10))
+        with patch("httpx.AsyncClient.get") as mock_get:
+            mock_response = MagicMock()
+            mock_response.json.return_value = omdb_response_not_found
+            mock_response.raise_for_status = MagicMock()
+            mock_get.return_value = mock_response
+
+            for _ in range(2):
+                with pytest.raises(MovieNotFoundError):
+                    await omdb_client.search_movie_by_title("NonExistentMovie")
+
+            mock_get.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_search_movie_errors_are_not_cached(self, omdb_response_success):
+        """Test that upstream failures are retried on the next call"""
+        omdb_client = OMDBClient(cache=TTLCache(10))
+        with patch("httpx.AsyncClient.get") as mock_get:
+            mock_response = MagicMock()
+            mock_response.json.return_value = omdb_response_success
+            mock_response.raise_for_status = MagicMock()
+            mock_get.side_effect = [
+                httpx.RequestError("Connection failed"),
+                mock_response,
+            ]
+
+            with pytest.raises(ExternalAPIError):
+                await omdb_client.search_movie_by_title("The Matrix")
+            result = await omdb_client.search_movie_by_title("The Matrix")
+
+        assert result["title"] == "The Matrix"
+        assert mock_get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_search_movie_disk_cache(self, tmp_path, omdb_response_success):
+        """Test that raw payloads are served from the disk tier"""
+        disk_cache = DiskCache(str(tmp_path / "omdb.sqlite"), max_bytes=100_000)
+        try:
+            with patch("httpx.AsyncClient.get") as mock_get:
+                mock_response = MagicMock()
+                mock_response.json.return_value = omdb_response_success
+                mock_response.raise_for_status = MagicMock()
+                mock_get.return_value = mock_response
+
+                await OMDBClient(disk_cache=disk_cache).search_movie_by_title(
+                    "The Matrix"
+                )
+                # um novo cliente (ex.: após restart) reaproveita o arquivo
+                result = await OMDBClient(disk_cache=disk_cache).search_movie_by_title(
+                    "The Matrix"
+                )
+
+                mock_get.assert_called_once()
+            assert result["title"] == "The Matrix"
+        finally:
+            disk_cache.close()
+
+    @pytest.mark.asyncio
+    async def test_search_movie_budget_exhausted_fails_fast(self):
+        """Test that no request is sent once the daily budget is used"""
+        rate_limiter = OMDBRateLimiter(
+            bucket=TokenBucket(rate=100, capacity=100),
+            concurrency=AdaptiveConcurrencyLimiter(5, 1, 5, target_latency=1.0),
+            budget=DailyBudget(1),
+        )
+        rate_limiter.budget.exhaust()
+        omdb_client = OMDBClient(rate_limiter=rate_limiter)
+
+        with patch("httpx.AsyncClient.get") as mock_get:
+            with pytest.raises(QuotaExceededError):
+                await omdb_client.search_movie_by_title("The Matrix")
+
+            mock_get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_search_movie_request_limit_reached(self, omdb_client):
+        """Test that OMDB's 401 'Request limit reached!' maps to quota error"""
+        response = httpx.Response(
+            401,
+            json={"Response": "False", "Error": "Request limit reached!"},
+            request=httpx.Request("GET", "http://omdb.test"),
+        )
+        with patch("httpx.AsyncClient.get") as mock_get:
+            mock_get.return_value = response
+
+            with pytest.raises(QuotaExceededError):
+                await omdb_client.search_movie_by_title("The Matrix")
+
+    @pytest.mark.asyncio
+    async def test_search_movie_retries_transient_errors(self, omdb_response_success):
+        """Test that connection errors and 5xx are retried"""
+        retry_policy = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+        omdb_client = OMDBClient(retry_policy=retry_policy)
+        success = MagicMock()
+        success.json.return_value = omdb_response_success
+        success.raise_for_status = MagicMock()
+        with patch("httpx.AsyncClient.get") as mock_get:
+            mock_get.side_effect = [
+                httpx.RequestError("Connection failed"),
+                httpx.HTTPStatusError(
+                    "Bad Gateway",
+                    request=MagicMock(),
+                    response=MagicMock(status_code=502),
+                ),
+                success,
+            ]
+
+            result = await omdb_client.search_movie_by_title("The Matrix")
+
+        assert result["title"] == "The Matrix"
+        assert mock_get.call_count == 3
+        assert omdb_client.stats()["retry"]["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_search_movie_does_not_retry_client_errors(self):
+        """Test that 4xx responses are not retried"""
+        omdb_client = OMDBClient(
+            retry_policy=RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+        )
+        with patch("httpx.AsyncClient.get") as mock_get:
+            mock_get.side_effect = httpx.HTTPStatusError(
+                "Bad Request",
+                request=MagicMock(),
+                response=MagicMock(status_code=400),
+            )
+
+            with pytest.raises(ExternalAPIError):
+                await omdb_client.search_movie_by_title("The Matrix")
+
+        mock_get.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_search_movie_retries_exhausted(self):
+        """Test that the last error is surfaced after all attempts"""
+        retry_policy = RetryPolicy(max_attempts=2, base_delay=0, max_delay=0)
+        omdb_client = OMDBClient(retry_policy=retry_policy)
+        with patch("httpx.AsyncClient.get") as mock_get:
+            mock_get.side_effect = httpx.RequestError("Connection failed")
+
+            with pytest.raises(ExternalAPIError) as exc_info:
+                await omdb_client.search_movie_by_title("The Matrix")
+
+        assert "Failed to connect to OMDB" in str(exc_info.value)
+        assert mock_get.call_count == 2
+        assert retry_policy.exhausted == 1
+
+    @pytest.mark.asyncio
+    async def test_search_movie_circuit_breaker_fails_fast(self):
+        """Test that an open circuit stops calling OMDB"""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        omdb_client = OMDBClient(circuit_breaker=breaker)
+        with patch("httpx.AsyncClient.get") as mock_get:
+            mock_get.side_effect = httpx.RequestError("Connection failed")
+
+            for _ in range(2):
+                with pytest.raises(ExternalAPIError):
+                    await omdb_client.search_movie_by_title("The Matrix")
+
+            with pytest.raises(CircuitOpenError):
+                await omdb_client.search_movie_by_title("The Matrix")
+
+        assert mock_get.call_count == 2
+        assert omdb_client.stats()["circuit_breaker"]["state"] == "open"
+
+    @staticmethod
+    def _search_payload(page: int, total: int = 25) -> dict:
+        return {
+            "Search": [
+                {
+                    "Title": f"Matrix {page}-{i}",
+                    "Year": "1999",
+                    "imdbID": f"tt{page:03d}{i:04d}",
+                    "Type": "movie",
+                    "Poster": "N/A",
+                }
+                for i in range(10)
+            ],
+            "totalResults": str(total),
+            "Response": "True",
+        }
+
+    @pytest.mark.asyncio
+    async def test_search_movies_parses_page(self, omdb_client):
+        """Test that an OMDB search page is parsed with pagination info"""
+        with patch("httpx.AsyncClient.get") as mock_get:
+            mock_response = MagicMock()
+            mock_response.json.return_value = self._search_payload(2)
+            mock_response.raise_for_status = MagicMock()
+            mock_get.return_value = mock_response
+
+            result = await omdb_client.search_movies("matrix", page=2)
+
+        assert result["page"] == 2
+        assert result["total_results"] == 25
+        assert result["total_pages"] == 3
+        assert len(result["results"]) == 10
+        assert result["results"][0]["imdb_id"] == "tt0020000"
+        assert mock_get.call_args.kwargs["params"]["s"] == "matrix"
+        assert mock_get.call_args.kwargs["params"]["page"] == 2
+
+    @pytest.mark.asyncio
+    async def test_search_movies_no_results(self, omdb_client):
+        """Test that OMDB errors such as 'Too many results.' yield an empty page"""
+        with patch("httpx.AsyncClient.get") as mock_get:
+            mock_response = MagicMock()
+            mock_response.json.return_value = {
+                "Response": "False",
+                "Error": "Too many results.",
+            }
+            mock_response.raise_for_status = MagicMock()
+            mock_get.return_value = mock_response
+
+            result = await omdb_client.search_movies("a")
+
+        assert result["results"] == []
+        assert result["total_pages"] == 0
+
+    @pytest.mark.asyncio
+    async def test_search_movies_cache(self):
+        """Test that search pages are served from their own cache"""
+        omdb_client = OMDBClient(cache=TTLCache(10), search_cache=TTLCache(10))
+        with patch("httpx.AsyncClient.get") as mock_get:
+            mock_response = MagicMock()
+            mock_response.json.return_value = self._search_payload(1)
+            mock_response.raise_for_status = MagicMock()
+            mock_get.return_value = mock_response
+
+            await omdb_client.search_movies("The Matrix")
+            await omdb_client.search_movies("  the   MATRIX ")
+
+        assert mock_get.call_count == 1
+        assert len(omdb_client.cache) == 0
+        assert omdb_client.stats()["search_cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_iter_search_prefetches_next_page(self, omdb_client):
+        """Test that the next page is requested before the current one is consumed"""
+        requested = []
+
+        async def fake_search(query, page=1):
+            requested.append(page)
+            return omdb_client._parse_search_response(
+                query, page, self._search_payload(page)
+            )
+
+        with patch.object(omdb_client, "search_movies", side_effect=fake_search):
+            pages = omdb_client.iter_search("matrix", max_pages=10)
+            first = await anext(pages)
+            await asyncio.sleep(0)
+            assert first["page"] == 1
+            assert requested == [1, 2]
+
+            rest = [page["page"] async for page in pages]
+
+        # 25 resultados = 3 páginas, mesmo com max_pages maior
+        assert rest == [2, 3]
+        assert requested == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_iter_search_respects_max_pages(self, omdb_client):
+        """Test that no page beyond max_pages is requested"""
+        with patch.object(
+            omdb_client,
+            "search_movies",
+            side_effect=lambda query, page=1: omdb_client._parse_search_response(
+                query, page, self._search_payload(page, total=500)
+            ),
+            new_callable=AsyncMock,
+        ) as mock_search:
+            pages = [page async for page in omdb_client.iter_search("matrix", 2)]
+
+        assert [page["page"] for page in pages] == [1, 2]
+        assert mock_search.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_iter_search_cancels_prefetch_on_close(self, omdb_client):
+        """Test that closing the generator early cancels the pending prefetch"""
+        started = asyncio.Event()
+
+        async def fake_search(query, page=1):
+            if page > 1:
+                started.set()
+                await asyncio.sleep(10)
+            return omdb_client._parse_search_response(
+                query, page, self._search_payload(page)
+            )
+
+        with patch.object(omdb_client, "search_movies", side_effect=fake_search):
+            pages = omdb_client.iter_search("matrix", max_pages=3)
+            await anext(pages)
+            await started.wait()
+            await pages.aclose()
+
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        await asyncio.sleep(0)
+        assert all(t.done() for t in tasks)
+
+    @pytest.mark.asyncio
+    async def test_create_http_client_pool_limits(self):
+        """Test that the shared client is configured from settings"""
+        with patch("app.clients.omdb_client.settings") as mock_settings:
+            mock_settings.OMDB_TIMEOUT = 5.0
+            mock_settings.OMDB_MAX_CONNECTIONS = 50
+            mock_settings.OMDB_MAX_KEEPALIVE_CONNECTIONS = 10
+            mock_settings.OMDB_KEEPALIVE_EXPIRY = 15.0
+            mock_settings.OMDB_HTTP2 = False
+
+            client = create_http_client()
+
+        try:
+            assert client.timeout.read == 5.0
+            pool = client._transport._pool
+            assert pool._max_connections == 50
+            assert pool._max_keepalive_connections == 10
+            assert pool._keepalive_expiry == 15.0
+        finally:
+            await client.aclose()
+
     def test_parse_float_valid(self, omdb_client):
         """Test parsing valid float value"""
         result = omdb_client._parse_float("8.7")
@@ -106,6 +517,44 @@ class TestOMDBClient:
         assert result["imdb_rating"] == 8.7
         assert result["rated"] == "R"
 
+    def test_parse_omdb_response_typed_fields(self, omdb_client, omdb_response_success):
+        """Test typed year, runtime and release date alongside the raw strings"""
+        result = omdb_client._parse_omdb_response(omdb_response_success)
+
+        assert (result["year_start"], result["year_end"]) == (1999, 1999)
+        assert result["runtime_minutes"] == 136
+        assert result["released_date"] == date(1999, 3, 31)
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("1999", (1999, 1999)),
+            ("2008–2013", (2008, 2013)),
+            ("2008-2013", (2008, 2013)),
+            ("2019–", (2019, None)),
+            ("N/A", (None, None)),
+            (None, (None, None)),
+        ],
+    )
+    def test_parse_year_range(self, omdb_client, value, expected):
+        """Test movie years and series-style year ranges"""
+        assert omdb_client._parse_year_range(value) == expected
+
+    @pytest.mark.parametrize(
+        "value, expected", [("136 min", 136), ("N/A", None), ("2 h", None)]
+    )
+    def test_parse_runtime(self, omdb_client, value, expected):
+        """Test runtime minutes parsing"""
+        assert omdb_client._parse_runtime(value) == expected
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [("31 Mar 1999", date(1999, 3, 31)), ("N/A", None), ("1999", None)],
+    )
+    def test_parse_date(self, omdb_client, value, expected):
+        """Test release date parsing"""
+        assert omdb_client._parse_date(value) == expected
+
     def test_parse_omdb_response_missing_rated(self, omdb_client):
         """Test parsing response with missing 'Rated' field"""
         response = {
@@ -0,0 +1,226 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.clients.rate_limiter import (
+    AdaptiveConcurrencyLimiter,
+    DailyBudget,
+    OMDBRateLimiter,
+    TokenBucket,
+)
+from app.core.exceptions import ExternalAPIError, QuotaExceededError
+
+
+class FakeClock:
+    def __init__(self, now) -> None:
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_limiter(daily_limit: int = 0, max_concurrency: int = 2) -> OMDBRateLimiter:
+    return OMDBRateLimiter(
+        bucket=TokenBucket(rate=1000, capacity=1000),
+        concurrency=AdaptiveConcurrencyLimiter(
+            initial=max_concurrency,
+            min_limit=1,
+            max_limit=max_concurrency,
+            target_latency=1.0,
+        ),
+        budget=DailyBudget(daily_limit),
+    )
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket"""
+
+    @pytest.mark.asyncio
+    async def test_burst_does_not_wait(self):
+        """Test that up to capacity tokens are served immediately"""
+        clock = FakeClock(0.0)
+        bucket = TokenBucket(rate=1, capacity=3, clock=clock)
+
+        for _ in range(3):
+            await asyncio.wait_for(bucket.acquire(), timeout=0.1)
+
+    @pytest.mark.asyncio
+    async def test_waits_when_empty(self, monkeypatch):
+        """Test that an empty bucket sleeps until a token is refilled"""
+        clock = FakeClock(0.0)
+        bucket = TokenBucket(rate=2, capacity=1, clock=clock)
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+            clock.now += delay
+
+        monkeypatch.setattr("app.clients.rate_limiter.asyncio.sleep", fake_sleep)
+
+        await bucket.acquire()
+        await bucket.acquire()
+
+        assert sleeps == [0.5]
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test suite for AdaptiveConcurrencyLimiter"""
+
+    @pytest.mark.asyncio
+    async def test_limits_in_flight_requests(self):
+        """Test that acquire blocks once the limit is reached"""
+        limiter = AdaptiveConcurrencyLimiter(2, 1, 2, target_latency=1.0)
+        await limiter.acquire()
+        await limiter.acquire()
+
+        blocked = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert not blocked.done()
+
+        await limiter.release(latency=0.1, success=True)
+        await asyncio.wait_for(blocked, timeout=0.1)
+        assert limiter.in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_decreases_on_errors_and_slow_calls(self):
+        """Test multiplicative decrease on failures and high latency"""
+        limiter = AdaptiveConcurrencyLimiter(10, 1, 10, target_latency=1.0)
+
+        await limiter.acquire()
+        await limiter.release(latency=0.1, success=False)
+        assert limiter.limit == pytest.approx(7.0)
+
+        await limiter.acquire()
+        await limiter.release(latency=5.0, success=True)
+        assert limiter.limit == pytest.approx(4.9)
+
+    @pytest.mark.asyncio
+    async def test_increases_on_fast_success_up_to_max(self):
+        """Test additive increase bounded by max_limit"""
+        limiter = AdaptiveConcurrencyLimiter(1, 1, 2, target_latency=1.0)
+
+        for _ in range(10):
+            await limiter.acquire()
+            await limiter.release(latency=0.1, success=True)
+
+        assert limiter.limit == 2
+
+
+class TestDailyBudget:
+    """Test suite for DailyBudget"""
+
+    def test_consumes_until_limit(self):
+        """Test that the budget refuses requests past the limit"""
+        budget = DailyBudget(2)
+
+        assert budget.try_consume()
+        assert budget.try_consume()
+        assert not budget.try_consume()
+        assert budget.remaining == 0
+
+    def test_resets_on_next_utc_day(self):
+        """Test that the counter resets at UTC midnight"""
+        clock = FakeClock(datetime(2024, 1, 1, 23, 59, tzinfo=timezone.utc))
+        budget = DailyBudget(1, clock=clock)
+        budget.try_consume()
+
+        assert budget.seconds_until_reset() == 60
+        clock.now += timedelta(minutes=2)
+
+        assert budget.try_consume()
+
+    def test_unlimited(self):
+        """Test that a zero limit disables the budget"""
+        budget = DailyBudget(0)
+
+        assert all(budget.try_consume() for _ in range(100))
+        assert budget.remaining is None
+
+    def test_refund_same_day_only(self):
+        """Test that a refund returns quota only on the day it was consumed"""
+        clock = FakeClock(datetime(2024, 1, 1, 23, 59, tzinfo=timezone.utc))
+        budget = DailyBudget(2, clock=clock)
+        day = budget.day
+        budget.try_consume()
+
+        budget.refund(day)
+        assert budget.remaining == 2
+
+        budget.try_consume()
+        clock.now += timedelta(minutes=2)
+        budget.try_consume()
+        budget.refund(day)
+        assert budget.remaining == 1
+
+    def test_exhaust(self):
+        """Test forcing the budget to be exhausted"""
+        budget = DailyBudget(10)
+
+        budget.exhaust()
+
+        assert not budget.try_consume()
+
+
+class TestOMDBRateLimiter:
+    """Test suite for OMDBRateLimiter"""
+
+    @pytest.mark.asyncio
+    async def test_fast_fail_when_budget_exhausted(self):
+        """Test that an exhausted budget raises a distinct error immediately"""
+        limiter = make_limiter(daily_limit=1)
+        async with limiter.acquire():
+            pass
+
+        with pytest.raises(QuotaExceededError) as exc_info:
+            async with limiter.acquire():
+                pass
+
+        assert isinstance(exc_info.value, ExternalAPIError)
+        assert exc_info.value.retry_after > 0
+        assert limiter.stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_records_errors(self):
+        """Test that failures inside the block are counted and released"""
+        limiter = make_limiter()
+
+        with pytest.raises(RuntimeError):
+            async with limiter.acquire():
+                raise RuntimeError("boom")
+
+        stats = limiter.stats()
+        assert stats["errors"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["daily_used"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_while_queued_refunds_budget(self):
+        """Test that a request cancelled before reaching OMDB gives its quota back"""
+        limiter = make_limiter(daily_limit=5, max_concurrency=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.acquire():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        async def queued():
+            async with limiter.acquire():
+                pass
+
+        waiter = asyncio.create_task(queued())
+        await asyncio.sleep(0)
+        assert limiter.stats()["daily_used"] == 2
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        await holder
+
+        stats = limiter.stats()
+        assert stats["daily_used"] == 1
+        assert stats["in_flight"] == 0
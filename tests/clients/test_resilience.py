@@ -0,0 +1,120 @@
+import pytest
+
+from app.clients.resilience import CircuitBreaker, RetryPolicy
+from app.core.exceptions import CircuitOpenError, ExternalAPIError
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Test suite for CircuitBreaker"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def breaker(self, clock):
+        return CircuitBreaker(failure_threshold=3, recovery_timeout=10, clock=clock)
+
+    def test_opens_after_threshold(self, breaker):
+        """Test that consecutive failures open the circuit"""
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record_failure()
+
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.before_call()
+
+        assert isinstance(exc_info.value, ExternalAPIError)
+        assert exc_info.value.retry_after == 10
+        assert breaker.stats()["times_opened"] == 1
+        assert breaker.stats()["rejected"] == 1
+
+    def test_late_failure_does_not_extend_open_window(self, breaker, clock):
+        """Test that failures from calls in flight when it opened keep the window"""
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 6
+
+        breaker.record_failure()
+
+        assert breaker.retry_after() == 4
+        assert breaker.times_opened == 1
+        clock.now = 11
+        breaker.before_call()
+        assert breaker.state == "half_open"
+
+    def test_success_resets_failures(self, breaker):
+        """Test that a success resets the failure counter"""
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == "closed"
+
+    def test_half_open_probe_success_closes(self, breaker, clock):
+        """Test that a successful probe closes the circuit"""
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 11
+
+        breaker.before_call()
+        assert breaker.state == "half_open"
+        # apenas uma sonda por vez
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+        breaker.before_call()
+
+    def test_half_open_probe_failure_reopens(self, breaker, clock):
+        """Test that a failed probe opens the circuit again"""
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 11
+
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+        assert breaker.times_opened == 2
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_release_probe(self, breaker, clock):
+        """Test that releasing the probe lets another request through"""
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 11
+        breaker.before_call()
+
+        breaker.release_probe()
+
+        breaker.before_call()
+        assert breaker.state == "half_open"
+
+
+class TestRetryPolicy:
+    """Test suite for RetryPolicy"""
+
+    def test_delay_is_jittered_and_capped(self):
+        """Test full jitter bounded by max_delay"""
+        policy = RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=1.0)
+
+        for attempt in range(6):
+            delay = policy.delay(attempt)
+            assert 0 <= delay <= min(1.0, 0.5 * 2**attempt)
+
+    def test_at_least_one_attempt(self):
+        """Test that max_attempts is never below one"""
+        assert RetryPolicy(max_attempts=0, base_delay=0, max_delay=0).max_attempts == 1
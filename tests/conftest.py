@@ -6,7 +6,7 @@ import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from app.db.database import Base, get_db
+from app.db.database import Base, get_db, get_read_sessionmaker
 from app.main import app
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -49,6 +49,10 @@ async def client(test_db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield test_db
 
     app.dependency_overrides[get_db] = override_get_db
+    # sessões abertas dentro de streams (export) usam o mesmo banco de teste
+    app.dependency_overrides[get_read_sessionmaker] = lambda: async_sessionmaker(
+        test_db.bind, class_=AsyncSession, expire_on_commit=False
+    )
 
     async with AsyncClient(
         transport=ASGITransport(app=app), base_url="http://test"
@@ -0,0 +1,153 @@
+import gzip
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.clients.cache import TTLCache
+from app.core.compression import (
+    CompressionMiddleware,
+    negotiate_encoding,
+    weak_etag,
+)
+from app.core.http_cache import etag_matches
+
+BIG_BODY = b'{"plot": "' + b"A computer hacker learns about reality. " * 100 + b'"}'
+ETAG = '"page-1"'
+
+
+def make_app(cache: TTLCache | None = None) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, cache=cache)
+
+    @app.get("/big")
+    async def big(request: Request) -> Response:
+        if etag_matches(request.headers.get("if-none-match"), ETAG):
+            return Response(status_code=304, headers={"ETag": ETAG})
+        return Response(BIG_BODY, media_type="application/json", headers={"ETag": ETAG})
+
+    @app.get("/small")
+    async def small() -> Response:
+        return Response(b'{"id": 1}', media_type="application/json")
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def lines():
+            for i in range(3):
+                yield f'{{"id": {i}}}\n'.encode()
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return app
+
+
+def make_client(app: FastAPI) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+class TestNegotiateEncoding:
+    """Test suite for Accept-Encoding negotiation"""
+
+    def test_gzip_without_brotli(self):
+        """Test gzip is picked when brotli is not installed"""
+        with patch("app.core.compression.brotli", None):
+            assert negotiate_encoding("gzip, deflate, br") == "gzip"
+            assert negotiate_encoding("br") is None
+
+    def test_brotli_preferred_when_available(self):
+        """Test br wins ties but not a higher gzip q-value"""
+        with patch("app.core.compression.brotli", MagicMock()):
+            assert negotiate_encoding("gzip, br") == "br"
+            assert negotiate_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+            assert negotiate_encoding("*") == "br"
+
+    def test_refused_or_missing(self):
+        """Test q=0, identity and an empty header disable compression"""
+        with patch("app.core.compression.brotli", None):
+            assert negotiate_encoding("") is None
+            assert negotiate_encoding("identity") is None
+            assert negotiate_encoding("gzip;q=0") is None
+            assert negotiate_encoding("*, gzip;q=0") is None
+
+    def test_weak_etag(self):
+        """Test weakening keeps already weak validators"""
+        assert weak_etag('"a"') == 'W/"a"'
+        assert weak_etag('W/"a"') == 'W/"a"'
+
+
+class TestCompressionMiddleware:
+    """Test suite for the response compression middleware"""
+
+    @pytest.mark.asyncio
+    async def test_compresses_large_responses(self):
+        """Test large bodies are gzipped with a weak ETag and Vary"""
+        async with make_client(make_app()) as client:
+            response = await client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == weak_etag(ETAG)
+        assert int(response.headers["content-length"]) < len(BIG_BODY)
+        assert response.content == BIG_BODY
+
+    @pytest.mark.asyncio
+    async def test_skips_small_and_unsupported(self):
+        """Test small bodies and clients without gzip get identity bodies"""
+        async with make_client(make_app()) as client:
+            small = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+            identity = await client.get("/big", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in small.headers
+        assert small.headers["vary"] == "Accept-Encoding"
+        assert "content-encoding" not in identity.headers
+        assert identity.headers["etag"] == ETAG
+        assert identity.content == BIG_BODY
+
+    @pytest.mark.asyncio
+    async def test_caches_compressed_bytes_per_etag(self):
+        """Test the same ETag is compressed only once"""
+        cache = TTLCache(max_size=8)
+        async with make_client(make_app(cache)) as client:
+            with patch("app.core.compression.gzip.compress", wraps=gzip.compress) as (
+                compress
+            ):
+                for _ in range(3):
+                    response = await client.get(
+                        "/big", headers={"Accept-Encoding": "gzip"}
+                    )
+                    assert response.content == BIG_BODY
+
+        compress.assert_called_once()
+        assert cache.stats()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_not_modified_echoes_weak_etag(self):
+        """Test revalidating the compressed variant returns a 304"""
+        async with make_client(make_app()) as client:
+            first = await client.get("/big", headers={"Accept-Encoding": "gzip"})
+            cached = await client.get(
+                "/big",
+                headers={
+                    "Accept-Encoding": "gzip",
+                    "If-None-Match": first.headers["etag"],
+                },
+            )
+
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == first.headers["etag"]
+        assert "content-encoding" not in cached.headers
+
+    @pytest.mark.asyncio
+    async def test_streams_compressed_chunks(self):
+        """Test streaming responses are compressed chunk by chunk"""
+        async with make_client(make_app()) as client:
+            async with client.stream(
+                "GET", "/stream", headers={"Accept-Encoding": "gzip"}
+            ) as response:
+                raw = b"".join([chunk async for chunk in response.aiter_raw()])
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert gzip.decompress(raw) == b'{"id": 0}\n{"id": 1}\n{"id": 2}\n'
@@ -32,6 +32,15 @@ class TestSettings:
             assert settings.OMDB_API_KEY == "test_key"
             assert settings.OMDB_BASE_URL == "http://www.omdbapi.com/"
             assert settings.CORS_ORIGINS == ["*"]
+            assert settings.OMDB_CACHE_MAX_SIZE == 1024
+            assert settings.OMDB_CACHE_TTL == 86400.0
+            assert settings.OMDB_CACHE_NEGATIVE_TTL == 600.0
+            assert settings.DATABASE_REPLICA_URLS == []
+            assert settings.DB_READ_YOUR_WRITES_WINDOW == 5.0
+            assert settings.HTTP_CACHE_MAX_AGE == 0
+            assert settings.MOVIE_EXPORT_CHUNK_SIZE == 1000
+            assert settings.HTTP_COMPRESSION_MIN_SIZE == 1024
+            assert settings.HTTP_COMPRESSION_CACHE_MAX_SIZE == 256
 
     def test_database_url_assembly(self):
         """Test DATABASE_URL is properly assembled"""
@@ -1,10 +1,14 @@
 import pytest
 
 from app.core.exceptions import (
+    CircuitOpenError,
     MovieAPIException,
     MovieNotFoundError,
     MovieAlreadyExistsError,
     ExternalAPIError,
+    InvalidCursorError,
+    InvalidFieldsError,
+    QuotaExceededError,
 )
 
 
@@ -35,9 +39,35 @@ class TestExceptions:
         assert str(exc) == "API error"
         assert isinstance(exc, MovieAPIException)
 
+    def test_quota_exceeded_error(self):
+        """Test QuotaExceededError"""
+        exc = QuotaExceededError("Quota exhausted", retry_after=10.0)
+        assert str(exc) == "Quota exhausted"
+        assert exc.retry_after == 10.0
+        assert isinstance(exc, ExternalAPIError)
+
+    def test_circuit_open_error(self):
+        """Test CircuitOpenError"""
+        exc = CircuitOpenError("Circuit open", retry_after=3.0)
+        assert str(exc) == "Circuit open"
+        assert exc.retry_after == 3.0
+        assert isinstance(exc, ExternalAPIError)
+
     def test_exception_inheritance_chain(self):
         """Test that all exceptions inherit from MovieAPIException"""
         assert issubclass(MovieNotFoundError, MovieAPIException)
         assert issubclass(MovieAlreadyExistsError, MovieAPIException)
         assert issubclass(ExternalAPIError, MovieAPIException)
         assert issubclass(MovieAPIException, Exception)
+
+    def test_invalid_cursor_error(self):
+        """Test InvalidCursorError"""
+        exc = InvalidCursorError("Invalid pagination cursor")
+        assert str(exc) == "Invalid pagination cursor"
+        assert isinstance(exc, MovieAPIException)
+
+    def test_invalid_fields_error(self):
+        """Test InvalidFieldsError"""
+        exc = InvalidFieldsError("Unknown fields: foo")
+        assert str(exc) == "Unknown fields: foo"
+        assert isinstance(exc, MovieAPIException)
@@ -0,0 +1,59 @@
+from datetime import datetime
+from unittest.mock import patch
+
+from app.core.http_cache import (
+    cache_headers,
+    collection_etag,
+    etag_matches,
+    movie_etag,
+)
+
+UPDATED_AT = datetime(2024, 5, 17, 12, 30, 45, 123456)
+
+
+class TestHttpCache:
+    """Test suite for ETag helpers"""
+
+    def test_movie_etag(self):
+        """Test the movie ETag is strong and tracks updated_at and fields"""
+        etag = movie_etag(1, UPDATED_AT)
+
+        assert etag == '"1-20240517123045123456"'
+        assert movie_etag(1, datetime(2024, 5, 17, 12, 30, 46)) != etag
+        assert movie_etag(1, UPDATED_AT, ("id", "title")) != etag
+        assert movie_etag(1, UPDATED_AT, ("id", "title")) != movie_etag(
+            1, UPDATED_AT, ("id", "year")
+        )
+
+    def test_collection_etag(self):
+        """Test the collection ETag ignores query order but not its values"""
+        version = (3, UPDATED_AT, 10)
+        etag = collection_etag(version, [("limit", "10"), ("skip", "0")])
+
+        assert etag == collection_etag(version, [("skip", "0"), ("limit", "10")])
+        assert etag != collection_etag(version, [("skip", "10"), ("limit", "10")])
+        assert etag != collection_etag(
+            (3, UPDATED_AT, 9), [("limit", "10"), ("skip", "0")]
+        )
+        # a mesma linha mais nova, mas outra escrita commitou depois
+        assert etag != collection_etag(
+            (4, UPDATED_AT, 10), [("limit", "10"), ("skip", "0")]
+        )
+        assert collection_etag((None, None, None), []).startswith('"')
+
+    def test_etag_matches(self):
+        """Test If-None-Match parsing"""
+        etag = '"abc"'
+
+        assert etag_matches('"abc"', etag)
+        assert etag_matches('"x", W/"abc"', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"abcd"', etag)
+        assert not etag_matches(None, etag)
+
+    def test_cache_headers(self):
+        """Test ETag and Cache-Control headers"""
+        with patch("app.core.http_cache.settings.HTTP_CACHE_MAX_AGE", 60):
+            headers = cache_headers('"abc"')
+
+        assert headers == {"ETag": '"abc"', "Cache-Control": "private, max-age=60"}
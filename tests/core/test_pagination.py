@@ -0,0 +1,28 @@
+from datetime import datetime
+
+import pytest
+
+from app.core.exceptions import InvalidCursorError
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+class TestPagination:
+    """Test suite for the opaque pagination cursor"""
+
+    def test_round_trip(self):
+        """Test that a cursor decodes back to its key"""
+        created_at = datetime(2024, 5, 17, 12, 30, 45, 123456)
+
+        cursor = encode_cursor(created_at, 42)
+
+        assert decode_cursor(cursor) == (created_at, 42)
+        assert "=" not in cursor
+
+    @pytest.mark.parametrize(
+        "cursor",
+        ["", "not-base64!", "bnVsbA", "WyJ4IiwxXQ", "WyIyMDI0LTAxLTAxIiwieCJd"],
+    )
+    def test_invalid_cursor(self, cursor):
+        """Test that malformed cursors raise InvalidCursorError"""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
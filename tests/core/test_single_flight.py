@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from app.core.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test suite for SingleFlight"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test that concurrent callers with the same key run fn once"""
+        flights = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "result"
+
+        waiters = [asyncio.create_task(flights.do("key", work)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert flights.in_flight("key")
+
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert calls == 1
+        assert results == ["result"] * 5
+        assert not flights.in_flight("key")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_the_same_error(self):
+        """Test that every waiter receives the error raised by fn"""
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            raise ValueError("boom")
+
+        waiters = [asyncio.create_task(flights.do("key", work)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert len({id(r) for r in results}) == 1
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_independently(self):
+        """Test that different keys are not coalesced"""
+        flights = SingleFlight()
+        calls = []
+
+        async def work(key):
+            calls.append(key)
+            return key
+
+        results = await asyncio.gather(
+            flights.do("a", lambda: work("a")), flights.do("b", lambda: work("b"))
+        )
+
+        assert results == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_cached(self):
+        """Test that a finished call is not reused by later callers"""
+        flights = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flights.do("key", work) == 1
+        assert await flights.do("key", work) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        """Test that cancelling one caller keeps the shared work running"""
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flights.do("key", work))
+        second = asyncio.create_task(flights.do("key", work))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        release.set()
+
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
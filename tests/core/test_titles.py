@@ -0,0 +1,40 @@
+import pytest
+
+from app.core.titles import normalize_title, split_names, title_key
+
+
+class TestTitles:
+    """Test suite for title normalization"""
+
+    def test_normalize_title(self):
+        """Test that case and whitespace variants share one lookup key"""
+        assert normalize_title("  The   MATRIX ") == "the matrix"
+        assert normalize_title("The Matrix") == normalize_title("the matrix")
+
+    def test_normalize_title_keeps_punctuation(self):
+        """Test that the OMDB lookup key only folds case and whitespace"""
+        assert normalize_title("  Spider-Man ") == "spider-man"
+
+    @pytest.mark.parametrize(
+        "variant",
+        ["Spider-Man", "spider man", "SPIDER–MAN", "  Spider - Man!  ", "Spider:Man"],
+    )
+    def test_title_key_ignores_punctuation(self, variant):
+        """Test that punctuation and spacing variants share one key"""
+        assert title_key(variant) == "spider man"
+
+    def test_title_key_folds_case_and_compatibility_forms(self):
+        """Test casefolding and Unicode compatibility normalization"""
+        assert title_key("STRASSE") == title_key("straße")
+        assert title_key("Ｔｈｅ Ｍａｔｒｉｘ") == "the matrix"
+
+    def test_title_key_keeps_accents(self):
+        """Test that accented letters are not stripped"""
+        assert title_key("Amélie") == "amélie"
+
+    def test_split_names(self):
+        """Test splitting OMDB comma-separated lists"""
+        assert split_names("Action, Sci-Fi") == ["Action", "Sci-Fi"]
+        assert split_names(" Keanu  Reeves ,, keanu reeves, N/A") == ["Keanu Reeves"]
+        assert split_names("N/A") == []
+        assert split_names(None) == []
@@ -0,0 +1,100 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from fastapi import Response
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.database import (
+    READ_PRIMARY_COOKIE,
+    AsyncSessionLocal,
+    Base,
+    get_read_db,
+    get_read_sessionmaker,
+    mark_recent_write,
+    reads_from_primary,
+)
+
+
+def make_request(cookies: dict | None = None) -> MagicMock:
+    request = MagicMock()
+    request.cookies = cookies or {}
+    return request
+
+
+@pytest_asyncio.fixture
+async def replica_sessions():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = [async_sessionmaker(engine, class_=AsyncSession)]
+    with patch("app.db.database.ReplicaSessions", sessions):
+        yield sessions
+    await engine.dispose()
+
+
+class TestReadRouting:
+    """Test suite for read-replica session routing"""
+
+    @pytest.mark.asyncio
+    async def test_without_replicas_uses_primary(self, test_db):
+        """Test that reads share the primary session when no replica is set"""
+        with patch("app.db.database.ReplicaSessions", []):
+            sessions = get_read_db(make_request(), test_db)
+            assert await anext(sessions) is test_db
+            await sessions.aclose()
+
+    @pytest.mark.asyncio
+    async def test_with_replicas_uses_replica(self, test_db, replica_sessions):
+        """Test that reads go to a replica session"""
+        sessions = get_read_db(make_request(), test_db)
+        session = await anext(sessions)
+        assert session is not test_db
+        await sessions.aclose()
+
+    @pytest.mark.asyncio
+    async def test_recent_write_uses_primary(self, test_db, replica_sessions):
+        """Test the read-your-writes window pins reads to the primary"""
+        cookies = {READ_PRIMARY_COOKIE: str(time.time() + 5)}
+        sessions = get_read_db(make_request(cookies), test_db)
+        assert await anext(sessions) is test_db
+        await sessions.aclose()
+
+    def test_read_sessionmaker(self, replica_sessions):
+        """Test streaming reads get a replica factory unless pinned to primary"""
+        assert get_read_sessionmaker(make_request()) is replica_sessions[0]
+
+        cookies = {READ_PRIMARY_COOKIE: str(time.time() + 5)}
+        assert get_read_sessionmaker(make_request(cookies)) is AsyncSessionLocal
+
+        with patch("app.db.database.ReplicaSessions", []):
+            assert get_read_sessionmaker(make_request()) is AsyncSessionLocal
+
+    def test_reads_from_primary_cookie(self):
+        """Test expired and malformed cookies fall back to the replicas"""
+        assert reads_from_primary(
+            make_request({READ_PRIMARY_COOKIE: str(time.time() + 5)})
+        )
+        assert not reads_from_primary(
+            make_request({READ_PRIMARY_COOKIE: str(time.time() - 1)})
+        )
+        assert not reads_from_primary(make_request({READ_PRIMARY_COOKIE: "abc"}))
+        assert not reads_from_primary(make_request())
+
+    def test_mark_recent_write(self, replica_sessions):
+        """Test that a write sets the read-your-writes cookie"""
+        response = Response()
+        mark_recent_write(response)
+
+        cookie = response.headers["set-cookie"]
+        assert cookie.startswith(f"{READ_PRIMARY_COOKIE}=")
+        assert "HttpOnly" in cookie
+
+    def test_mark_recent_write_without_replicas(self):
+        """Test that no cookie is set when reads already hit the primary"""
+        response = Response()
+        with patch("app.db.database.ReplicaSessions", []):
+            mark_recent_write(response)
+
+        assert "set-cookie" not in response.headers
@@ -0,0 +1,89 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.clients.omdb_client import OMDBClient
+from app.core.exceptions import MovieNotFoundError, QuotaExceededError
+from loadtest.fake_omdb import FakeOMDBConfig, create_app, synthetic_movie
+
+
+def fake_client(**config) -> AsyncClient:
+    app = create_app(FakeOMDBConfig(latency=0, seed=1, **config))
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://omdb")
+
+
+class TestFakeOMDB:
+    """Test suite for the local OMDB stand-in"""
+
+    @pytest.mark.asyncio
+    async def test_fixture_lookup_by_title_and_id(self):
+        """Test that canned fixtures are served for t= and i= lookups"""
+        async with fake_client() as client:
+            by_title = await client.get("/", params={"apikey": "k", "t": "the matrix"})
+            by_id = await client.get("/", params={"apikey": "k", "i": "tt0133093"})
+
+        assert by_title.json()["imdbID"] == "tt0133093"
+        assert by_id.json()["Title"] == "The Matrix"
+
+    @pytest.mark.asyncio
+    async def test_unknown_title_is_synthesized(self):
+        """Test that unknown titles get a deterministic synthetic payload"""
+        async with fake_client() as client:
+            response = await client.get("/", params={"apikey": "k", "t": "Foo Bar"})
+
+        assert response.json() == synthetic_movie("Foo Bar")
+        assert synthetic_movie("foo  bar")["imdbID"] == response.json()["imdbID"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_title_not_found(self):
+        """Test the 'Movie not found!' mode"""
+        async with fake_client(synthesize=False) as client:
+            response = await client.get("/", params={"apikey": "k", "t": "Foo Bar"})
+
+        assert response.json() == {"Response": "False", "Error": "Movie not found!"}
+
+    @pytest.mark.asyncio
+    async def test_error_rate(self):
+        """Test that error_rate=1 fails every request with a 500"""
+        async with fake_client(error_rate=1.0) as client:
+            response = await client.get("/", params={"apikey": "k", "t": "Matrix"})
+
+        assert response.status_code == 500
+
+    @pytest.mark.asyncio
+    async def test_request_limit(self):
+        """Test that the request limit answers like OMDB's exhausted quota"""
+        async with fake_client(request_limit=1) as client:
+            first = await client.get("/", params={"apikey": "k", "t": "Matrix"})
+            second = await client.get("/", params={"apikey": "k", "t": "Matrix"})
+            stats = await client.get("/_stats")
+
+        assert first.status_code == 200
+        assert second.status_code == 401
+        assert second.json()["Error"] == "Request limit reached!"
+        assert stats.json()["limited"] == 1
+
+    @pytest.mark.asyncio
+    async def test_search_pages(self):
+        """Test that s= searches are paginated 10 results at a time"""
+        async with fake_client() as client:
+            page = await client.get(
+                "/", params={"apikey": "k", "s": "unknown", "page": 3}
+            )
+
+        assert page.json()["totalResults"] == "30"
+        assert len(page.json()["Search"]) == 10
+
+    @pytest.mark.asyncio
+    async def test_omdb_client_against_fake(self):
+        """Test the real OMDB client end to end against the fake server"""
+        async with fake_client(request_limit=2) as http_client:
+            omdb_client = OMDBClient(http_client=http_client)
+
+            movie = await omdb_client.search_movie_by_title("Inception")
+            assert movie["director"] == "Christopher Nolan"
+
+            with pytest.raises(MovieNotFoundError):
+                await omdb_client.get_movie_by_imdb_id("tt9999999")
+
+            with pytest.raises(QuotaExceededError):
+                await omdb_client.search_movie_by_title("Inception")
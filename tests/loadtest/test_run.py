@@ -0,0 +1,81 @@
+import json
+
+import httpx
+import pytest
+
+from loadtest.run import LoadTest, format_report, parse_mix, percentile
+
+
+class TestLoadTestRun:
+    """Test suite for the fixed-rate load test driver"""
+
+    def test_percentile_nearest_rank(self):
+        """Test nearest-rank percentiles"""
+        values = [float(v) for v in range(1, 101)]
+
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 99) == 0.0
+
+    def test_parse_mix(self):
+        """Test parsing of the request mix"""
+        assert parse_mix("create=1,get=3") == {"create": 1.0, "get": 3.0}
+
+        with pytest.raises(ValueError):
+            parse_mix("delete=1")
+
+    @pytest.mark.asyncio
+    async def test_run_reports_latency_and_throughput(self):
+        """Test that a short run hits every endpoint and reports percentiles"""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append((request.method, request.url.path))
+            if request.method == "POST":
+                title = json.loads(request.content)["title"]
+                return httpx.Response(201, json={"id": len(requests), "title": title})
+            return httpx.Response(200, json={})
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url="http://api"
+        ) as client:
+            load_test = LoadTest(
+                client,
+                rate=200,
+                duration=0.25,
+                mix=parse_mix("create=1,get=1,list=1"),
+                seed=1,
+            )
+            await load_test.warm_up(2)
+            result = await load_test.run()
+
+        report = result.summary()
+        assert report["overall"]["requests"] == 50
+        assert report["overall"]["errors"] == 0
+        assert report["throughput"] > 0
+        assert {"create", "get", "list"} <= set(report)
+        assert any(path.startswith("/api/v1/movies/") for _, path in requests)
+        assert "p99" in format_report(report)
+
+    @pytest.mark.asyncio
+    async def test_get_without_ids_counts_as_list(self):
+        """Test a get with no known movie IDs is sent and recorded as a list"""
+        paths = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            return httpx.Response(200, json={})
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url="http://api"
+        ) as client:
+            load_test = LoadTest(
+                client, rate=100, duration=0.05, mix=parse_mix("get=1"), seed=1
+            )
+            result = await load_test.run()
+
+        report = result.summary()
+        assert "get" not in report
+        assert report["list"]["requests"] == 5
+        assert set(paths) == {"/api/v1/movies"}
@@ -0,0 +1,17 @@
+import pytest
+
+from loadtest.serialization import benchmark, format_report
+
+
+class TestSerializationBenchmark:
+    """Test suite for the list page serialization microbenchmark"""
+
+    @pytest.mark.asyncio
+    async def test_benchmark_reports_both_paths(self):
+        """Test that both paths agree and the report has per-page timings"""
+        report = await benchmark(items=5, rounds=2)
+
+        assert report["items"] == 5
+        assert report["legacy_ms"] > 0
+        assert report["fast_ms"] > 0
+        assert "speedup" in format_report(report)
@@ -1,7 +1,14 @@
+from datetime import date, datetime
+from unittest.mock import patch
+
 import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 
 from app.repositories.movie_repository import MovieRepository
 from app.models.movie import Movie
+from app.models.relations import Genre, Person, movie_people
+from app.schemas.movie import MovieFilters, MovieSort
 
 
 class TestMovieRepository:
@@ -91,8 +98,10 @@ class TestMovieRepository:
 
         # Create multiple movies
         await repo.create(sample_movie_data)
-        await repo.create({**sample_movie_data, "title": "Inception"})
-        await repo.create({**sample_movie_data, "title": "Interstellar"})
+        await repo.create({**sample_movie_data, "title": "Inception", "imdb_id": None})
+        await repo.create(
+            {**sample_movie_data, "title": "Interstellar", "imdb_id": None}
+        )
 
         movies = await repo.get_all()
 
@@ -105,7 +114,9 @@ class TestMovieRepository:
 
         # Create 5 movies
         for i in range(5):
-            await repo.create({**sample_movie_data, "title": f"Movie {i}"})
+            await repo.create(
+                {**sample_movie_data, "title": f"Movie {i}", "imdb_id": None}
+            )
 
         # Test skip and limit
         movies = await repo.get_all(skip=1, limit=2)
@@ -117,8 +128,12 @@ class TestMovieRepository:
         """Test that movies are ordered by created_at descending"""
         repo = MovieRepository(test_db)
 
-        movie1 = await repo.create({**sample_movie_data, "title": "First Movie"})
-        movie2 = await repo.create({**sample_movie_data, "title": "Second Movie"})
+        movie1 = await repo.create(
+            {**sample_movie_data, "title": "First Movie", "imdb_id": None}
+        )
+        movie2 = await repo.create(
+            {**sample_movie_data, "title": "Second Movie", "imdb_id": None}
+        )
 
         movies = await repo.get_all()
 
@@ -126,6 +141,45 @@ class TestMovieRepository:
         assert movies[0].id == movie2.id
         assert movies[1].id == movie1.id
 
+    @pytest.mark.asyncio
+    async def test_get_page_keyset(self, test_db, sample_movie_data):
+        """Test keyset pages follow (created_at, id) descending without gaps"""
+        repo = MovieRepository(test_db)
+        same_time = datetime(2024, 1, 1)
+        for i in range(5):
+            await repo.create(
+                {
+                    **sample_movie_data,
+                    "title": f"Movie {i}",
+                    "imdb_id": None,
+                    # empate em created_at: o id desempata
+                    "created_at": same_time if i < 3 else datetime(2024, 1, 2),
+                }
+            )
+
+        first = await repo.get_page(limit=2)
+        last = first[-1]
+        second = await repo.get_page(limit=2, after=(last.created_at, last.id))
+        last = second[-1]
+        third = await repo.get_page(limit=2, after=(last.created_at, last.id))
+
+        ids = [m.id for m in first + second + third]
+        assert ids == [5, 4, 3, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_stream_chunks(self, test_db, sample_movie_data):
+        """Test streaming yields every movie by id in chunk_size batches"""
+        repo = MovieRepository(test_db)
+        for i in range(5):
+            await repo.create(
+                {**sample_movie_data, "title": f"Movie {i}", "imdb_id": None}
+            )
+
+        chunks = [chunk async for chunk in repo.stream(chunk_size=2)]
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert [m.id for chunk in chunks for m in chunk] == [1, 2, 3, 4, 5]
+
     @pytest.mark.asyncio
     async def test_count_empty(self, test_db):
         """Test count when database is empty"""
@@ -141,12 +195,19 @@ class TestMovieRepository:
         repo = MovieRepository(test_db)
 
         await repo.create(sample_movie_data)
-        await repo.create({**sample_movie_data, "title": "Inception"})
+        await repo.create({**sample_movie_data, "title": "Inception", "imdb_id": None})
 
         count = await repo.count()
 
         assert count == 2
 
+    @pytest.mark.asyncio
+    async def test_estimate_count_unavailable_on_sqlite(self, test_db):
+        """Test that there is no planner estimate outside PostgreSQL"""
+        repo = MovieRepository(test_db)
+
+        assert await repo.estimate_count() is None
+
     @pytest.mark.asyncio
     async def test_exists_by_title_false(self, test_db):
         """Test exists_by_title returns False when movie doesn't exist"""
@@ -175,3 +236,512 @@ class TestMovieRepository:
         exists = await repo.exists_by_title("the matrix")
 
         assert exists is True
+
+    @pytest.mark.asyncio
+    async def test_create_many(self, test_db, sample_movie_data):
+        """Test inserting several movies in one statement"""
+        repo = MovieRepository(test_db)
+
+        movies = await repo.create_many(
+            [
+                sample_movie_data,
+                {**sample_movie_data, "title": "Inception", "imdb_id": None},
+            ]
+        )
+
+        assert sorted(m.title for m in movies) == ["Inception", "The Matrix"]
+        assert all(m.id is not None and m.created_at is not None for m in movies)
+        assert await repo.count() == 2
+
+    @pytest.mark.asyncio
+    async def test_create_many_skips_existing(self, test_db, sample_movie_data):
+        """Test that already stored titles are skipped instead of failing"""
+        repo = MovieRepository(test_db)
+        await repo.create(sample_movie_data)
+
+        movies = await repo.create_many(
+            [
+                sample_movie_data,
+                {**sample_movie_data, "title": "Inception", "imdb_id": None},
+            ]
+        )
+
+        assert [m.title for m in movies] == ["Inception"]
+        assert await repo.count() == 2
+
+    @pytest.mark.asyncio
+    async def test_create_many_empty(self, test_db):
+        """Test that an empty batch is a no-op"""
+        repo = MovieRepository(test_db)
+
+        assert await repo.create_many([]) == []
+
+    @pytest.mark.asyncio
+    async def test_get_existing_titles(self, test_db, sample_movie_data):
+        """Test the single-query existence check for many titles"""
+        repo = MovieRepository(test_db)
+        await repo.create(sample_movie_data)
+        await repo.create({**sample_movie_data, "title": "Inception", "imdb_id": None})
+
+        existing = await repo.get_existing_titles(
+            ["THE MATRIX", "Inception", "Interstellar"]
+        )
+
+        assert existing == {"the matrix", "inception"}
+
+    @pytest.mark.asyncio
+    async def test_get_by_imdb_id(self, test_db, sample_movie_data):
+        """Test exact lookup by IMDb ID"""
+        repo = MovieRepository(test_db)
+        created = await repo.create(sample_movie_data)
+
+        found = await repo.get_by_imdb_id("tt0133093")
+
+        assert found is not None
+        assert found.id == created.id
+        assert await repo.get_by_imdb_id("tt9999999") is None
+
+    @pytest.mark.asyncio
+    async def test_get_by_title_ignores_punctuation(self, test_db, sample_movie_data):
+        """Test that title lookups go through the normalized title"""
+        repo = MovieRepository(test_db)
+        created = await repo.create(
+            {**sample_movie_data, "title": "Spider-Man", "imdb_id": None}
+        )
+
+        found = await repo.get_by_title("  spider man ")
+
+        assert found is not None
+        assert found.id == created.id
+        assert found.title == "Spider-Man"
+        assert found.title_normalized == "spider man"
+
+    @pytest.mark.asyncio
+    async def test_normalized_title_is_unique(self, test_db, sample_movie_data):
+        """Test that punctuation variants of a title cannot both be stored"""
+        repo = MovieRepository(test_db)
+        await repo.create({**sample_movie_data, "title": "Spider-Man", "imdb_id": None})
+
+        with pytest.raises(IntegrityError):
+            await repo.create(
+                {**sample_movie_data, "title": "Spider Man", "imdb_id": None}
+            )
+
+    @pytest.mark.asyncio
+    async def test_create_many_sets_normalized_title(self, test_db, sample_movie_data):
+        """Test that the bulk insert fills in the normalized title"""
+        repo = MovieRepository(test_db)
+
+        created = await repo.create_many(
+            [{**sample_movie_data, "title": "Spider-Man", "imdb_id": None}]
+        )
+        duplicates = await repo.create_many(
+            [{**sample_movie_data, "title": "SPIDER MAN", "imdb_id": None}]
+        )
+
+        assert created[0].title_normalized == "spider man"
+        assert duplicates == []
+        assert await repo.get_existing_titles(["spider-man!"]) == {"spider man"}
+
+    @pytest.mark.asyncio
+    async def test_create_or_get_inserts(self, test_db, sample_movie_data):
+        """Test that the upsert inserts and returns the full new row"""
+        repo = MovieRepository(test_db)
+
+        movie, created = await repo.create_or_get(sample_movie_data)
+
+        assert created is True
+        assert movie.id is not None
+        assert movie.title == "The Matrix"
+        assert movie.title_normalized == "the matrix"
+        assert movie.created_at is not None
+        assert await repo.count() == 1
+
+    @pytest.mark.asyncio
+    async def test_create_or_get_existing_title(self, test_db, sample_movie_data):
+        """Test that a normalized-title conflict returns the stored row"""
+        repo = MovieRepository(test_db)
+        stored, _ = await repo.create_or_get(sample_movie_data)
+
+        movie, created = await repo.create_or_get(
+            {**sample_movie_data, "title": "THE MATRIX!", "imdb_id": None}
+        )
+
+        assert created is False
+        assert movie.id == stored.id
+        assert movie.title == "The Matrix"
+        assert movie.imdb_id == "tt0133093"
+        assert await repo.count() == 1
+
+    @pytest.mark.asyncio
+    async def test_create_or_get_conflict_does_not_write(
+        self, test_db, sample_movie_data
+    ):
+        """Test a duplicate leaves the stored row untouched, even within one clock tick"""
+        repo = MovieRepository(test_db)
+        frozen = datetime(2024, 1, 1, 12, 0, 0)
+        with patch("app.repositories.movie_repository.datetime") as clock:
+            clock.utcnow.return_value = frozen
+            stored, _ = await repo.create_or_get(sample_movie_data)
+            version = await repo.get_collection_version()
+
+            movie, created = await repo.create_or_get(sample_movie_data)
+
+        assert created is False
+        assert movie.id == stored.id
+        assert movie.updated_at == frozen
+        assert await repo.get_collection_version() == version
+
+    @pytest.mark.asyncio
+    async def test_create_or_get_existing_imdb_id(self, test_db, sample_movie_data):
+        """Test that an IMDb ID conflict under another title returns the stored row"""
+        repo = MovieRepository(test_db)
+        stored, _ = await repo.create_or_get(sample_movie_data)
+
+        movie, created = await repo.create_or_get(
+            {**sample_movie_data, "title": "Matrix"}
+        )
+
+        assert created is False
+        assert movie.id == stored.id
+        assert await repo.count() == 1
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_counts(self, test_db, sample_movie_data):
+        """Test inserted/updated/skipped counts across batches"""
+        repo = MovieRepository(test_db)
+        rows = [
+            {**sample_movie_data, "title": f"Movie {i}", "imdb_id": f"tt{i:07d}"}
+            for i in range(25)
+        ]
+
+        first = await repo.bulk_upsert(rows, batch_size=10)
+
+        assert first == {"inserted": 25, "updated": 0, "skipped": 0}
+        assert await repo.count() == 25
+
+        rows[3] = {**rows[3], "imdb_rating": 9.9}
+        rows.append({**sample_movie_data, "title": "New", "imdb_id": None})
+        second = await repo.bulk_upsert(rows, batch_size=10)
+
+        assert second == {"inserted": 1, "updated": 1, "skipped": 24}
+        assert (await repo.get_by_title("Movie 3")).imdb_rating == 9.9
+        assert await repo.count() == 26
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_update_within_one_clock_tick(
+        self, test_db, sample_movie_data
+    ):
+        """Test an update is not counted as an insert when created_at matches the batch clock"""
+        repo = MovieRepository(test_db)
+        with patch("app.repositories.movie_repository.datetime") as clock:
+            clock.utcnow.return_value = datetime(2024, 1, 1, 12, 0, 0)
+            first = await repo.bulk_upsert([sample_movie_data])
+            second = await repo.bulk_upsert(
+                [
+                    {**sample_movie_data, "imdb_rating": 9.9},
+                    {**sample_movie_data, "title": "Inception", "imdb_id": None},
+                ]
+            )
+
+        assert first == {"inserted": 1, "updated": 0, "skipped": 0}
+        assert second == {"inserted": 1, "updated": 1, "skipped": 0}
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_skips_conflicting_rows(self, test_db, sample_movie_data):
+        """Test duplicates in a batch and IMDb IDs owned by another title"""
+        repo = MovieRepository(test_db)
+        await repo.create(sample_movie_data)
+
+        counts = await repo.bulk_upsert(
+            [
+                {**sample_movie_data, "title": "Matrix"},
+                {**sample_movie_data, "title": "Inception", "imdb_id": None},
+                {**sample_movie_data, "title": "INCEPTION", "imdb_id": None},
+            ]
+        )
+
+        assert counts == {"inserted": 1, "updated": 0, "skipped": 2}
+        assert (await repo.get_by_title("inception")).title == "INCEPTION"
+        assert await repo.count() == 2
+
+    @pytest.mark.asyncio
+    async def test_typed_fields_derived_on_every_write_path(self, test_db):
+        """Test text-only dicts still get year, runtime and release columns"""
+        repo = MovieRepository(test_db)
+        heat = {"title": "Heat", "year": "1995", "runtime": "170 min"}
+
+        await repo.bulk_upsert([heat])
+        await repo.bulk_upsert([{**heat, "released": "15 Dec 1995"}])
+        await repo.create_many([{"title": "Alien", "year": "1979"}])
+        created, _ = await repo.create_or_get({"title": "Ronin", "year": "1998"})
+        direct = await repo.create({"title": "Fargo", "runtime": "98 min"})
+
+        movie = await repo.get_by_title("heat")
+        assert (movie.year_start, movie.year_end, movie.runtime_minutes) == (
+            1995,
+            1995,
+            170,
+        )
+        assert movie.released_date == date(1995, 12, 15)
+        assert (await repo.get_by_title("alien")).year_start == 1979
+        assert created.year_start == 1998
+        assert direct.runtime_minutes == 98
+        nineties = await repo.get_all(filters=MovieFilters(year_from=1990))
+        assert {m.title for m in nineties} == {"Heat", "Ronin"}
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_empty(self, test_db):
+        """Test that an empty input writes nothing"""
+        repo = MovieRepository(test_db)
+
+        assert await repo.bulk_upsert([]) == {
+            "inserted": 0,
+            "updated": 0,
+            "skipped": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_copy_requires_postgresql(
+        self, test_db, sample_movie_data
+    ):
+        """Test that the COPY path is refused outside PostgreSQL before any query"""
+        repo = MovieRepository(test_db)
+
+        with patch.object(repo, "_prepare_rows") as prepare:
+            with pytest.raises(ValueError):
+                await repo.bulk_upsert([sample_movie_data], use_copy=True)
+
+        prepare.assert_not_called()
+        assert await repo.count() == 0
+
+    @pytest.mark.asyncio
+    async def test_imdb_id_is_unique(self, test_db, sample_movie_data):
+        """Test that the same IMDb ID cannot be stored twice"""
+        repo = MovieRepository(test_db)
+        await repo.create(sample_movie_data)
+
+        with pytest.raises(IntegrityError):
+            await repo.create({**sample_movie_data, "title": "Matrix"})
+
+    @pytest.mark.asyncio
+    async def test_search(self, test_db, sample_movie_data):
+        """Test full-text search across title, people and plot"""
+        repo = MovieRepository(test_db)
+        await repo.create(sample_movie_data)
+        await repo.create(
+            {
+                **sample_movie_data,
+                "title": "John Wick",
+                "imdb_id": "tt2911666",
+                "director": "Chad Stahelski",
+                "plot": "An ex-hit-man comes out of retirement...",
+            }
+        )
+
+        by_actor = await repo.search("keanu reeves")
+        by_plot = await repo.search("hacker")
+        by_two_fields = await repo.search("wick stahelski")
+
+        assert {m.title for m in by_actor} == {"The Matrix", "John Wick"}
+        assert [m.title for m in by_plot] == ["The Matrix"]
+        assert [m.title for m in by_two_fields] == ["John Wick"]
+        assert await repo.search("nonexistent") == []
+
+    @pytest.mark.asyncio
+    async def test_search_pagination(self, test_db, sample_movie_data):
+        """Test search skip/limit and wildcard escaping"""
+        repo = MovieRepository(test_db)
+        for i in range(3):
+            await repo.create(
+                {**sample_movie_data, "title": f"Matrix {i}", "imdb_id": None}
+            )
+
+        first = await repo.search("matrix", limit=2)
+        rest = await repo.search("matrix", skip=2, limit=2)
+
+        assert len(first) == 2
+        assert len(rest) == 1
+        assert await repo.search("%") == []
+        assert await repo.search("   ") == []
+
+    @pytest.mark.asyncio
+    async def test_create_saves_relations(self, test_db, sample_movie_data):
+        """Test genres, people and languages are normalized on insert"""
+        repo = MovieRepository(test_db)
+        await repo.create(sample_movie_data)
+        await repo.create_or_get(
+            {
+                **sample_movie_data,
+                "title": "John Wick",
+                "imdb_id": "tt2911666",
+                "genre": "Action, Thriller",
+            }
+        )
+
+        genres = (await test_db.execute(select(Genre.name))).scalars().all()
+        people = (await test_db.execute(select(Person.name))).scalars().all()
+        links = await test_db.execute(select(func.count()).select_from(movie_people))
+
+        assert sorted(genres) == ["Action", "Sci-Fi", "Thriller"]
+        # os diretores e o elenco são compartilhados entre os dois filmes
+        assert len(people) == 5
+        assert links.scalar_one() == 10
+
+    @pytest.mark.asyncio
+    async def test_filters(self, test_db, sample_movie_data):
+        """Test relation filters on list, keyset page and count"""
+        repo = MovieRepository(test_db)
+        await repo.create_many(
+            [
+                sample_movie_data,
+                {
+                    **sample_movie_data,
+                    "title": "John Wick",
+                    "imdb_id": "tt2911666",
+                    "genre": "Action, Thriller",
+                    "director": "Chad Stahelski",
+                },
+                {
+                    **sample_movie_data,
+                    "title": "Amélie",
+                    "imdb_id": "tt0211915",
+                    "genre": "Comedy, Romance",
+                    "actors": "Audrey Tautou",
+                    "director": "Jean-Pierre Jeunet",
+                    "language": "French",
+                },
+            ]
+        )
+
+        sci_fi_keanu = MovieFilters(genre="sci fi", actor="KEANU REEVES")
+        action = MovieFilters(genre="Action")
+        french = MovieFilters(language="french")
+        # diretor, não ator
+        not_an_actor = MovieFilters(actor="Chad Stahelski")
+
+        assert [m.title for m in await repo.get_all(filters=sci_fi_keanu)] == [
+            "The Matrix"
+        ]
+        assert await repo.count(filters=action) == 2
+        assert [m.title for m in await repo.get_page(filters=french)] == ["Amélie"]
+        assert await repo.count(filters=not_an_actor) == 0
+        assert await repo.count(filters=MovieFilters(genre="Horror")) == 0
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_replaces_relations(self, test_db, sample_movie_data):
+        """Test that an updated row gets its associations rewritten"""
+        repo = MovieRepository(test_db)
+        await repo.bulk_upsert([sample_movie_data])
+        await repo.bulk_upsert([{**sample_movie_data, "genre": "Drama"}])
+
+        assert await repo.count(filters=MovieFilters(genre="Drama")) == 1
+        assert await repo.count(filters=MovieFilters(genre="Action")) == 0
+
+    @pytest.mark.asyncio
+    async def test_range_filters_and_sort(self, test_db, sample_movie_data):
+        """Test year range overlap, minimum runtime and typed sorting"""
+        repo = MovieRepository(test_db)
+        await repo.create_many(
+            [
+                {
+                    **sample_movie_data,
+                    "title": title,
+                    "imdb_id": None,
+                    "year_start": start,
+                    "year_end": end,
+                    "runtime_minutes": runtime,
+                }
+                for title, start, end, runtime in [
+                    ("Movie 1999", 1999, 1999, 136),
+                    ("Series 2008", 2008, 2013, 45),
+                    ("Series 2019", 2019, None, 30),
+                    ("Unknown", None, None, None),
+                ]
+            ]
+        )
+
+        async def titles(**kwargs) -> list[str]:
+            sort = kwargs.pop("sort", MovieSort.CREATED_DESC)
+            movies = await repo.get_all(filters=MovieFilters(**kwargs), sort=sort)
+            return [m.title for m in movies]
+
+        assert await titles(year_from=2010, sort=MovieSort.YEAR) == [
+            "Series 2008",
+            "Series 2019",
+        ]
+        assert await titles(year_to=2008, sort=MovieSort.YEAR) == [
+            "Movie 1999",
+            "Series 2008",
+        ]
+        assert await titles(min_runtime=40, sort=MovieSort.RUNTIME_DESC) == [
+            "Movie 1999",
+            "Series 2008",
+        ]
+        # nulos por último nos dois sentidos
+        assert (await titles(sort=MovieSort.YEAR_DESC))[-1] == "Unknown"
+        assert (await titles(sort=MovieSort.YEAR))[-1] == "Unknown"
+
+    @pytest.mark.asyncio
+    async def test_column_projection(self, test_db, sample_movie_data):
+        """Test that requested columns come back as rows, not Movie objects"""
+        repo = MovieRepository(test_db)
+        movie = await repo.create(sample_movie_data)
+
+        rows = await repo.get_all(columns=("title", "year"))
+        page = await repo.get_page(columns=("title",))
+        row = await repo.get_by_id(movie.id, columns=("imdb_rating",))
+
+        assert not isinstance(rows[0], Movie)
+        assert set(rows[0]._fields) == {
+            "id",
+            "created_at",
+            "updated_at",
+            "title",
+            "year",
+        }
+        assert (rows[0].title, rows[0].year) == ("The Matrix", "1999")
+        assert page[0].created_at == movie.created_at
+        assert row.imdb_rating == 8.7
+        assert await repo.get_by_id(999, columns=("title",)) is None
+
+    @pytest.mark.asyncio
+    async def test_versions(self, test_db, sample_movie_data):
+        """Test the cheap version queries behind ETags"""
+        repo = MovieRepository(test_db)
+        assert await repo.get_collection_version() == (None, None, None)
+
+        movie = await repo.create(sample_movie_data)
+
+        assert await repo.get_version(movie.id) == movie.updated_at
+        assert await repo.get_version(999) is None
+        assert await repo.get_collection_version() == (1, movie.updated_at, movie.id)
+
+    @pytest.mark.asyncio
+    async def test_collection_version_changes_on_late_commit(
+        self, test_db, sample_movie_data
+    ):
+        """Test a write that commits after a newer one still changes the version"""
+        repo = MovieRepository(test_db)
+        await repo.create({**sample_movie_data, "id": 2})
+        before = await repo.get_collection_version()
+
+        # a transação que inseriu o id 1 mais cedo só commita agora
+        earlier = datetime(2020, 1, 1)
+        await repo.create(
+            {
+                **sample_movie_data,
+                "id": 1,
+                "title": "Alien",
+                "imdb_id": None,
+                "created_at": earlier,
+                "updated_at": earlier,
+            }
+        )
+        after = await repo.get_collection_version()
+
+        assert after[1:] == before[1:]
+        assert after != before
+
+        await repo.create_or_get(sample_movie_data)  # já existe: sem escrita
+        assert await repo.get_collection_version() == after
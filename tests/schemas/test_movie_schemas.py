@@ -1,13 +1,28 @@
+import json
+from types import SimpleNamespace
+
 import pytest
 from datetime import datetime
 from pydantic import ValidationError
 
 from app.schemas.movie import (
+    MovieBatchCreate,
+    MovieBatchItem,
     MovieCreate,
+    MovieImdbCreate,
     MovieResponse,
+    MovieSearchResponse,
     MovieListResponse,
     ErrorResponse,
+    dump_movie,
+    dump_movie_batch,
+    dump_movies,
+    movie_list_adapter,
+    parse_fieldset,
+    sparse_movie_list_response,
+    sparse_movie_response,
 )
+from app.core.exceptions import InvalidFieldsError
 
 
 class TestMovieSchemas:
@@ -34,6 +49,31 @@ class TestMovieSchemas:
         with pytest.raises(ValidationError):
             MovieCreate()
 
+    def test_movie_imdb_create(self):
+        """Test MovieImdbCreate IMDb ID format"""
+        assert MovieImdbCreate(imdb_id="tt0133093").imdb_id == "tt0133093"
+        with pytest.raises(ValidationError):
+            MovieImdbCreate(imdb_id="0133093")
+
+    def test_movie_batch_create_limits(self):
+        """Test MovieBatchCreate size and title validation"""
+        assert MovieBatchCreate(titles=["The Matrix"]).titles == ["The Matrix"]
+        with pytest.raises(ValidationError):
+            MovieBatchCreate(titles=[])
+        with pytest.raises(ValidationError):
+            MovieBatchCreate(titles=["a" * 256])
+        with pytest.raises(ValidationError):
+            MovieBatchCreate(titles=["x"] * 1001)
+
+    def test_movie_batch_item_status(self):
+        """Test MovieBatchItem status values"""
+        item = MovieBatchItem(title="The Matrix", status="exists")
+
+        assert item.status == "exists"
+        assert item.movie is None
+        with pytest.raises(ValidationError):
+            MovieBatchItem(title="The Matrix", status="unknown")
+
     def test_movie_response_full_data(self):
         """Test MovieResponse with complete data"""
         data = {
@@ -125,3 +165,87 @@ class TestMovieSchemas:
         """Test MovieResponse with from_attributes config"""
         # This test verifies that the model_config is properly set
         assert MovieResponse.model_config["from_attributes"] is True
+
+    def test_parse_fieldset(self):
+        """Test fields= parsing keeps schema order and always includes id"""
+        assert parse_fieldset("year, title,title") == ("id", "title", "year")
+        assert parse_fieldset("") == ("id",)
+
+    def test_parse_fieldset_unknown(self):
+        """Test that unknown fields are rejected"""
+        with pytest.raises(InvalidFieldsError, match="plot_summary"):
+            parse_fieldset("title,plot_summary")
+
+    def test_sparse_movie_models(self):
+        """Test the slim models only carry the requested fields"""
+        fields = ("id", "title", "imdb_rating")
+        movie_model = sparse_movie_response(fields)
+        list_model = sparse_movie_list_response(fields)
+
+        body = list_model(
+            movies=[{"id": 1, "title": "The Matrix", "imdb_rating": 8.7}], total=1
+        )
+
+        assert tuple(movie_model.model_fields) == fields
+        assert sparse_movie_response(fields) is movie_model
+        assert body.model_dump()["movies"] == [
+            {"id": 1, "title": "The Matrix", "imdb_rating": 8.7}
+        ]
+
+    def test_dump_movie_from_attributes(self):
+        """Test that ORM-like objects are dumped straight to JSON bytes"""
+        now = datetime(2024, 1, 1)
+        movie = SimpleNamespace(
+            id=1, title="The Matrix", created_at=now, updated_at=now
+        )
+
+        body = dump_movie(movie)
+        sparse = dump_movie(movie, ("id", "title"))
+
+        assert isinstance(body, bytes)
+        assert json.loads(body)["title"] == "The Matrix"
+        assert json.loads(sparse) == {"id": 1, "title": "The Matrix"}
+
+    def test_dump_movies_envelope(self):
+        """Test that the list envelope wraps the validated movies once"""
+        movies = [SimpleNamespace(id=i, title=f"Movie {i}") for i in (1, 2)]
+        fields = ("id", "title")
+
+        body = json.loads(
+            dump_movies(sparse_movie_list_response(fields), movies, fields, total=2)
+        )
+
+        assert body["movies"] == [
+            {"id": 1, "title": "Movie 1"},
+            {"id": 2, "title": "Movie 2"},
+        ]
+        assert body["total"] == 2
+        assert body["next_cursor"] is None
+        assert movie_list_adapter(fields) is movie_list_adapter(fields)
+
+        search = json.loads(dump_movies(MovieSearchResponse, [], has_more=False))
+        assert search == {"movies": [], "has_more": False}
+
+    def test_dump_movie_batch(self):
+        """Test that the batch envelope counts statuses from the items"""
+        now = datetime(2024, 1, 1)
+        movie = SimpleNamespace(id=1, title="Inception", created_at=now, updated_at=now)
+
+        body = json.loads(
+            dump_movie_batch(
+                [
+                    {"title": "Inception", "status": "created", "movie": movie},
+                    {"title": "Missing", "status": "not_found", "detail": "nope"},
+                ]
+            )
+        )
+
+        assert body["results"][0]["movie"]["title"] == "Inception"
+        assert body["results"][1] == {
+            "title": "Missing",
+            "status": "not_found",
+            "movie": None,
+            "detail": "nope",
+        }
+        assert (body["created"], body["existing"]) == (1, 0)
+        assert (body["not_found"], body["errors"]) == (1, 0)
@@ -1,8 +1,17 @@
+import asyncio
+from datetime import datetime
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from app.services.movie_service import MovieService
-from app.core.exceptions import MovieAlreadyExistsError, MovieNotFoundError
+from app.core.pagination import decode_cursor, encode_cursor
+from app.schemas.movie import MovieCountMode, MovieFilters, MovieSort
+from app.services.movie_service import MovieService, _count_cache
+from app.core.exceptions import (
+    ExternalAPIError,
+    MovieAlreadyExistsError,
+    MovieNotFoundError,
+)
 from app.models.movie import Movie
 
 
@@ -12,7 +21,9 @@ class TestMovieService:
     @pytest.fixture
     def mock_repository(self):
         """Create a mock repository"""
-        return MagicMock()
+        repository = MagicMock()
+        repository.get_by_imdb_id = AsyncMock(return_value=None)
+        return repository
 
     @pytest.fixture
     def mock_omdb_client(self):
@@ -37,7 +48,7 @@ class TestMovieService:
 
         mock_movie = Movie(**sample_movie_data)
         mock_movie.id = 1
-        mock_repository.create = AsyncMock(return_value=mock_movie)
+        mock_repository.create_or_get = AsyncMock(return_value=(mock_movie, True))
 
         # Execute
         result = await movie_service.create_movie("The Matrix")
@@ -47,7 +58,7 @@ class TestMovieService:
         assert result.title == "The Matrix"
         mock_repository.exists_by_title.assert_called_once_with("The Matrix")
         mock_omdb_client.search_movie_by_title.assert_called_once_with("The Matrix")
-        mock_repository.create.assert_called_once_with(sample_movie_data)
+        mock_repository.create_or_get.assert_called_once_with(sample_movie_data)
 
     @pytest.mark.asyncio
     async def test_create_movie_already_exists(
@@ -64,7 +75,7 @@ class TestMovieService:
         assert "already exists" in str(exc_info.value)
         mock_repository.exists_by_title.assert_called_once_with("The Matrix")
         mock_omdb_client.search_movie_by_title.assert_not_called()
-        mock_repository.create.assert_not_called()
+        mock_repository.create_or_get.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_create_movie_not_found_in_omdb(
@@ -83,7 +94,275 @@ class TestMovieService:
 
         mock_repository.exists_by_title.assert_called_once()
         mock_omdb_client.search_movie_by_title.assert_called_once()
-        mock_repository.create.assert_not_called()
+        mock_repository.create_or_get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_movie_concurrent_same_title_coalesced(
+        self, mock_omdb_client, sample_movie_data
+    ):
+        """Test concurrent creations share one fetch but insert on their own sessions"""
+        release = asyncio.Event()
+
+        async def slow_search(title):
+            await release.wait()
+            return sample_movie_data
+
+        mock_omdb_client.search_movie_by_title = AsyncMock(side_effect=slow_search)
+        stored = Movie(**sample_movie_data)
+        stored.id = 1
+        inserted = iter([True, False, False])
+
+        def make_repository():
+            """One repository (and session) per request"""
+            repository = MagicMock()
+            repository.exists_by_title = AsyncMock(return_value=False)
+            repository.create_or_get = AsyncMock(
+                side_effect=lambda data: (stored, next(inserted))
+            )
+            return repository
+
+        repositories = [make_repository() for _ in range(3)]
+        tasks = [
+            asyncio.create_task(
+                MovieService(repository, mock_omdb_client).create_movie(title)
+            )
+            for repository, title in zip(
+                repositories, ["The Matrix", "the matrix", " THE  MATRIX "]
+            )
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert all(result is stored for result in results)
+        mock_omdb_client.search_movie_by_title.assert_called_once()
+        for repository in repositories:
+            repository.create_or_get.assert_called_once_with(sample_movie_data)
+
+    @pytest.mark.asyncio
+    async def test_create_movie_cancelled_caller_does_not_affect_waiters(
+        self, mock_omdb_client, sample_movie_data
+    ):
+        """Test cancelling the first caller leaves the shared lookup running"""
+        release = asyncio.Event()
+
+        async def slow_search(title):
+            await release.wait()
+            return sample_movie_data
+
+        mock_omdb_client.search_movie_by_title = AsyncMock(side_effect=slow_search)
+        first, second = MagicMock(), MagicMock()
+        for repository in (first, second):
+            repository.exists_by_title = AsyncMock(return_value=False)
+        stored = Movie(**sample_movie_data)
+        stored.id = 1
+        second.create_or_get = AsyncMock(return_value=(stored, True))
+
+        first_task = asyncio.create_task(
+            MovieService(first, mock_omdb_client).create_movie("The Matrix")
+        )
+        second_task = asyncio.create_task(
+            MovieService(second, mock_omdb_client).create_movie("The Matrix")
+        )
+        await asyncio.sleep(0)
+        first_task.cancel()
+        release.set()
+
+        assert await second_task is stored
+        assert first_task.cancelled()
+        first.create_or_get.assert_not_called()
+        mock_omdb_client.search_movie_by_title.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_create_movie_concurrent_same_title_shared_error(
+        self, movie_service, mock_repository, mock_omdb_client
+    ):
+        """Test that concurrent waiters all receive the same OMDB error"""
+        release = asyncio.Event()
+
+        async def slow_search(title):
+            await release.wait()
+            raise MovieNotFoundError("Movie not found in OMDB")
+
+        mock_repository.exists_by_title = AsyncMock(return_value=False)
+        mock_omdb_client.search_movie_by_title = AsyncMock(side_effect=slow_search)
+
+        tasks = [
+            asyncio.create_task(movie_service.create_movie("Missing")) for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(r, MovieNotFoundError) for r in results)
+        mock_omdb_client.search_movie_by_title.assert_called_once()
+        mock_repository.create_or_get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_movie_same_imdb_id_other_spelling(
+        self, movie_service, mock_repository, mock_omdb_client, sample_movie_data
+    ):
+        """Test that a different title spelling of a stored movie is rejected"""
+        mock_repository.exists_by_title = AsyncMock(return_value=False)
+        mock_omdb_client.search_movie_by_title = AsyncMock(
+            return_value=sample_movie_data
+        )
+        existing = Movie(**sample_movie_data)
+        existing.id = 1
+        mock_repository.create_or_get = AsyncMock(return_value=(existing, False))
+
+        with pytest.raises(MovieAlreadyExistsError):
+            await movie_service.create_movie("Matrix")
+
+        mock_repository.create_or_get.assert_called_once_with(sample_movie_data)
+
+    @pytest.mark.asyncio
+    async def test_create_movie_by_imdb_id_success(
+        self, movie_service, mock_repository, mock_omdb_client, sample_movie_data
+    ):
+        """Test creating a movie from its IMDb ID"""
+        mock_repository.exists_by_title = AsyncMock(return_value=False)
+        mock_omdb_client.get_movie_by_imdb_id = AsyncMock(
+            return_value=sample_movie_data
+        )
+        mock_movie = Movie(**sample_movie_data)
+        mock_movie.id = 1
+        mock_repository.create_or_get = AsyncMock(return_value=(mock_movie, True))
+
+        result = await movie_service.create_movie_by_imdb_id("tt0133093")
+
+        assert result is mock_movie
+        mock_repository.get_by_imdb_id.assert_called_once_with("tt0133093")
+        mock_omdb_client.get_movie_by_imdb_id.assert_called_once_with("tt0133093")
+        mock_repository.create_or_get.assert_called_once_with(sample_movie_data)
+
+    @pytest.mark.asyncio
+    async def test_create_movie_lost_insert_race(
+        self, movie_service, mock_repository, mock_omdb_client, sample_movie_data
+    ):
+        """Test that a row inserted by a concurrent request maps to a conflict"""
+        mock_repository.exists_by_title = AsyncMock(return_value=False)
+        mock_omdb_client.search_movie_by_title = AsyncMock(
+            return_value=sample_movie_data
+        )
+        existing = Movie(**sample_movie_data)
+        existing.id = 7
+        mock_repository.create_or_get = AsyncMock(return_value=(existing, False))
+
+        with pytest.raises(MovieAlreadyExistsError) as exc_info:
+            await movie_service.create_movie("The Matrix")
+
+        assert "already exists" in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_create_movie_by_imdb_id_already_exists(
+        self, movie_service, mock_repository, mock_omdb_client, sample_movie_data
+    ):
+        """Test that a stored IMDb ID skips the OMDB call"""
+        mock_repository.get_by_imdb_id = AsyncMock(
+            return_value=Movie(**sample_movie_data)
+        )
+        mock_omdb_client.get_movie_by_imdb_id = AsyncMock()
+
+        with pytest.raises(MovieAlreadyExistsError):
+            await movie_service.create_movie_by_imdb_id("tt0133093")
+
+        mock_omdb_client.get_movie_by_imdb_id.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_movie_by_imdb_id(
+        self, movie_service, mock_repository, sample_movie_data
+    ):
+        """Test getting a movie by IMDb ID"""
+        mock_repository.get_by_imdb_id = AsyncMock(
+            side_effect=[Movie(**sample_movie_data), None]
+        )
+
+        result = await movie_service.get_movie_by_imdb_id("tt0133093")
+        assert result.title == "The Matrix"
+
+        with pytest.raises(MovieNotFoundError):
+            await movie_service.get_movie_by_imdb_id("tt9999999")
+
+    @pytest.mark.asyncio
+    async def test_create_movies_batch(
+        self, movie_service, mock_repository, mock_omdb_client, sample_movie_data
+    ):
+        """Test batch creation with mixed outcomes"""
+
+        async def search(title):
+            if title == "Missing":
+                raise MovieNotFoundError("Movie 'Missing' not found in OMDB")
+            if title == "Broken":
+                raise ExternalAPIError("Failed to connect to OMDB")
+            return {**sample_movie_data, "title": title}
+
+        mock_repository.get_existing_titles = AsyncMock(return_value={"the matrix"})
+        mock_omdb_client.search_movie_by_title = AsyncMock(side_effect=search)
+        created_movie = Movie(**{**sample_movie_data, "title": "Inception"})
+        created_movie.id = 2
+        mock_repository.create_many = AsyncMock(return_value=[created_movie])
+
+        results = await movie_service.create_movies(
+            ["The Matrix", "Inception", "inception", "Missing", "Broken"]
+        )
+
+        assert [(r["title"], r["status"]) for r in results] == [
+            ("The Matrix", "exists"),
+            ("Inception", "created"),
+            ("Missing", "not_found"),
+            ("Broken", "error"),
+        ]
+        assert results[1]["movie"] is created_movie
+        mock_repository.get_existing_titles.assert_called_once_with(
+            ["The Matrix", "Inception", "Missing", "Broken"]
+        )
+        assert mock_omdb_client.search_movie_by_title.call_count == 3
+        mock_repository.create_many.assert_called_once()
+        assert len(mock_repository.create_many.call_args.args[0]) == 1
+
+    @pytest.mark.asyncio
+    async def test_create_movies_batch_same_omdb_movie(
+        self, movie_service, mock_repository, mock_omdb_client, sample_movie_data
+    ):
+        """Test that two titles resolving to one OMDB movie insert it once"""
+        mock_repository.get_existing_titles = AsyncMock(return_value=set())
+        mock_omdb_client.search_movie_by_title = AsyncMock(
+            return_value=sample_movie_data
+        )
+        created_movie = Movie(**sample_movie_data)
+        mock_repository.create_many = AsyncMock(return_value=[created_movie])
+
+        results = await movie_service.create_movies(["Matrix", "The Matrix"])
+
+        assert [r["status"] for r in results] == ["created", "exists"]
+        assert mock_repository.create_many.call_args.args[0] == [sample_movie_data]
+
+    @pytest.mark.asyncio
+    async def test_create_movies_batch_bounded_concurrency(
+        self, movie_service, mock_repository, mock_omdb_client, sample_movie_data
+    ):
+        """Test that OMDB fetches respect OMDB_BATCH_CONCURRENCY"""
+        in_flight = 0
+        peak = 0
+
+        async def search(title):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return {**sample_movie_data, "title": title}
+
+        mock_repository.get_existing_titles = AsyncMock(return_value=set())
+        mock_omdb_client.search_movie_by_title = AsyncMock(side_effect=search)
+        mock_repository.create_many = AsyncMock(return_value=[])
+
+        with patch("app.services.movie_service.settings") as mock_settings:
+            mock_settings.OMDB_BATCH_CONCURRENCY = 2
+            await movie_service.create_movies([f"Movie {i}" for i in range(10)])
+
+        assert peak == 2
 
     @pytest.mark.asyncio
     async def test_get_movie_by_id_found(
@@ -101,7 +380,7 @@ class TestMovieService:
         # Assert
         assert result.id == 1
         assert result.title == "The Matrix"
-        mock_repository.get_by_id.assert_called_once_with(1)
+        mock_repository.get_by_id.assert_called_once_with(1, columns=None)
 
     @pytest.mark.asyncio
     async def test_get_movie_by_id_not_found(self, movie_service, mock_repository):
@@ -114,7 +393,7 @@ class TestMovieService:
             await movie_service.get_movie_by_id(999)
 
         assert "not found" in str(exc_info.value)
-        mock_repository.get_by_id.assert_called_once_with(999)
+        mock_repository.get_by_id.assert_called_once_with(999, columns=None)
 
     @pytest.mark.asyncio
     async def test_get_all_movies_empty(self, movie_service, mock_repository):
@@ -124,12 +403,20 @@ class TestMovieService:
         mock_repository.count = AsyncMock(return_value=0)
 
         # Execute
-        movies, total = await movie_service.get_all_movies()
+        movies, total, estimated, next_cursor = await movie_service.get_all_movies()
 
         # Assert
         assert len(movies) == 0
         assert total == 0
-        mock_repository.get_all.assert_called_once_with(skip=0, limit=100)
+        assert estimated is False
+        assert next_cursor is None
+        mock_repository.get_all.assert_called_once_with(
+            skip=0,
+            limit=100,
+            filters=None,
+            sort=MovieSort.CREATED_DESC,
+            columns=None,
+        )
         mock_repository.count.assert_called_once()
 
     @pytest.mark.asyncio
@@ -146,12 +433,20 @@ class TestMovieService:
         mock_repository.count = AsyncMock(return_value=2)
 
         # Execute
-        movies, total = await movie_service.get_all_movies()
+        movies, total, estimated, next_cursor = await movie_service.get_all_movies()
 
         # Assert
         assert len(movies) == 2
         assert total == 2
-        mock_repository.get_all.assert_called_once_with(skip=0, limit=100)
+        assert estimated is False
+        assert next_cursor is None
+        mock_repository.get_all.assert_called_once_with(
+            skip=0,
+            limit=100,
+            filters=None,
+            sort=MovieSort.CREATED_DESC,
+            columns=None,
+        )
         mock_repository.count.assert_called_once()
 
     @pytest.mark.asyncio
@@ -160,15 +455,242 @@ class TestMovieService:
     ):
         """Test getting all movies with custom pagination"""
         # Setup mocks
-        mock_movies = [Movie(**sample_movie_data)]
+        mock_movies = [
+            Movie(**sample_movie_data, id=6, created_at=datetime(2024, 1, 1))
+        ]
         mock_repository.get_all = AsyncMock(return_value=mock_movies)
         mock_repository.count = AsyncMock(return_value=10)
 
         # Execute
-        movies, total = await movie_service.get_all_movies(skip=5, limit=5)
+        movies, total, estimated, next_cursor = await movie_service.get_all_movies(
+            skip=5, limit=5
+        )
 
         # Assert
         assert len(movies) == 1
         assert total == 10
-        mock_repository.get_all.assert_called_once_with(skip=5, limit=5)
+        assert estimated is False
+        assert decode_cursor(next_cursor) == (datetime(2024, 1, 1), 6)
+        mock_repository.get_all.assert_called_once_with(
+            skip=5,
+            limit=5,
+            filters=None,
+            sort=MovieSort.CREATED_DESC,
+            columns=None,
+        )
         mock_repository.count.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_count_movies_estimate_for_large_table(
+        self, movie_service, mock_repository
+    ):
+        """Test that the planner estimate is used for large tables"""
+        mock_repository.estimate_count = AsyncMock(return_value=2_500_000)
+        mock_repository.count = AsyncMock()
+
+        total, estimated = await movie_service.count_movies(MovieCountMode.ESTIMATE)
+
+        assert total == 2_500_000
+        assert estimated is True
+        mock_repository.count.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("estimate", [None, 500])
+    async def test_count_movies_estimate_falls_back_to_exact(
+        self, movie_service, mock_repository, estimate
+    ):
+        """Test exact counting when no estimate exists or the table is small"""
+        mock_repository.estimate_count = AsyncMock(return_value=estimate)
+        mock_repository.count = AsyncMock(return_value=498)
+
+        total, estimated = await movie_service.count_movies(MovieCountMode.ESTIMATE)
+
+        assert total == 498
+        assert estimated is False
+
+    @pytest.mark.asyncio
+    async def test_count_movies_cached(self, movie_service, mock_repository):
+        """Test that cached mode reuses the last exact count"""
+        _count_cache.clear()
+        mock_repository.count = AsyncMock(return_value=7)
+
+        first = await movie_service.count_movies(MovieCountMode.CACHED)
+        second = await movie_service.count_movies(MovieCountMode.CACHED)
+
+        assert first == (7, False)
+        assert second == (7, True)
+        mock_repository.count.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_count_cache_invalidated_on_create(
+        self, movie_service, mock_repository, mock_omdb_client, sample_movie_data
+    ):
+        """Test that creating a movie drops the cached total"""
+        _count_cache.clear()
+        mock_repository.count = AsyncMock(side_effect=[1, 2])
+        mock_repository.exists_by_title = AsyncMock(return_value=False)
+        mock_repository.create_or_get = AsyncMock(
+            return_value=(Movie(**sample_movie_data), True)
+        )
+        mock_omdb_client.search_movie_by_title = AsyncMock(
+            return_value=sample_movie_data
+        )
+
+        await movie_service.count_movies(MovieCountMode.CACHED)
+        await movie_service.create_movie("The Matrix")
+        total, estimated = await movie_service.count_movies(MovieCountMode.CACHED)
+
+        assert (total, estimated) == (2, False)
+
+    @pytest.mark.asyncio
+    async def test_count_cache_invalidated_on_bulk_upsert(
+        self, movie_service, mock_repository, sample_movie_data
+    ):
+        """Test that a backfill inserting rows drops the cached total"""
+        _count_cache.clear()
+        mock_repository.count = AsyncMock(side_effect=[1, 26])
+        mock_repository.bulk_upsert = AsyncMock(
+            side_effect=[
+                {"inserted": 0, "updated": 1, "skipped": 0},
+                {"inserted": 25, "updated": 0, "skipped": 0},
+            ]
+        )
+
+        await movie_service.count_movies(MovieCountMode.CACHED)
+        await movie_service.bulk_upsert_movies([sample_movie_data])
+        assert await movie_service.count_movies(MovieCountMode.CACHED) == (1, True)
+
+        counts = await movie_service.bulk_upsert_movies(
+            [sample_movie_data] * 25, batch_size=10
+        )
+
+        assert counts["inserted"] == 25
+        mock_repository.bulk_upsert.assert_called_with(
+            [sample_movie_data] * 25, batch_size=10, use_copy=None
+        )
+        assert await movie_service.count_movies(MovieCountMode.CACHED) == (26, False)
+
+    @pytest.mark.asyncio
+    async def test_get_all_movies_with_cursor(
+        self, movie_service, mock_repository, sample_movie_data
+    ):
+        """Test keyset pagination fetches one extra row to detect more pages"""
+        mock_movies = [
+            Movie(**sample_movie_data, id=i, created_at=datetime(2024, 1, i))
+            for i in (5, 4, 3)
+        ]
+        mock_repository.get_page = AsyncMock(return_value=mock_movies)
+        mock_repository.count = AsyncMock(return_value=10)
+        cursor = encode_cursor(datetime(2024, 1, 6), 6)
+
+        movies, total, _, next_cursor = await movie_service.get_all_movies(
+            limit=2, cursor=cursor
+        )
+
+        assert [m.id for m in movies] == [5, 4]
+        assert decode_cursor(next_cursor) == (datetime(2024, 1, 4), 4)
+        mock_repository.get_page.assert_called_once_with(
+            limit=3,
+            after=(datetime(2024, 1, 6), 6),
+            filters=None,
+            columns=None,
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_all_movies_cursor_last_page(
+        self, movie_service, mock_repository, sample_movie_data
+    ):
+        """Test that the last keyset page has no next cursor"""
+        mock_repository.get_page = AsyncMock(
+            return_value=[
+                Movie(**sample_movie_data, id=1, created_at=datetime(2024, 1, 1))
+            ]
+        )
+        mock_repository.count = AsyncMock(return_value=1)
+
+        _, _, _, next_cursor = await movie_service.get_all_movies(
+            limit=2, cursor=encode_cursor(datetime(2024, 1, 2), 2)
+        )
+
+        assert next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_search_movies(self, movie_service, mock_repository):
+        """Test that search fetches one extra row to detect the next page"""
+        movies = [Movie(title=f"Movie {i}", id=i) for i in range(3)]
+        mock_repository.search = AsyncMock(return_value=movies)
+
+        page, has_more = await movie_service.search_movies("movie", skip=4, limit=2)
+
+        assert page == movies[:2]
+        assert has_more is True
+        mock_repository.search.assert_called_once_with("movie", skip=4, limit=3)
+
+    @pytest.mark.asyncio
+    async def test_search_movies_last_page(self, movie_service, mock_repository):
+        """Test the last search page reports no more results"""
+        mock_repository.search = AsyncMock(return_value=[Movie(title="Movie", id=1)])
+
+        page, has_more = await movie_service.search_movies("movie", limit=2)
+
+        assert len(page) == 1
+        assert has_more is False
+
+    def test_export_movies(self, movie_service, mock_repository):
+        """Test the export streams in configured chunks and drops empty filters"""
+        chunks = object()
+        mock_repository.stream = MagicMock(return_value=chunks)
+
+        with patch("app.core.config.settings.MOVIE_EXPORT_CHUNK_SIZE", 50):
+            assert movie_service.export_movies(MovieFilters()) is chunks
+
+        mock_repository.stream.assert_called_once_with(None, chunk_size=50)
+
+    @pytest.mark.asyncio
+    async def test_count_movies_with_filters_is_exact(
+        self, movie_service, mock_repository
+    ):
+        """Test filtered totals skip the table-wide estimate and cache"""
+        filters = MovieFilters(genre="Action")
+        mock_repository.estimate_count = AsyncMock(return_value=2_500_000)
+        mock_repository.count = AsyncMock(return_value=3)
+
+        total, estimated = await movie_service.count_movies(
+            MovieCountMode.ESTIMATE, filters
+        )
+
+        assert (total, estimated) == (3, False)
+        mock_repository.count.assert_called_once_with(filters=filters)
+        mock_repository.estimate_count.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_all_movies_passes_filters(self, movie_service, mock_repository):
+        """Test that active filters reach the repository and empty ones do not"""
+        mock_repository.get_all = AsyncMock(return_value=[])
+        mock_repository.count = AsyncMock(return_value=0)
+        filters = MovieFilters(actor="Keanu Reeves")
+
+        await movie_service.get_all_movies(filters=filters)
+        await movie_service.get_all_movies(filters=MovieFilters())
+
+        assert mock_repository.get_all.call_args_list[0].kwargs["filters"] == filters
+        assert mock_repository.get_all.call_args_list[1].kwargs["filters"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_all_movies_custom_sort_has_no_cursor(
+        self, movie_service, mock_repository, sample_movie_data
+    ):
+        """Test that only the default order hands out a keyset cursor"""
+        mock_repository.get_all = AsyncMock(
+            return_value=[
+                Movie(**sample_movie_data, id=i, created_at=datetime(2024, 1, i))
+                for i in (1, 2)
+            ]
+        )
+        mock_repository.count = AsyncMock(return_value=5)
+
+        _, _, _, next_cursor = await movie_service.get_all_movies(
+            limit=2, sort=MovieSort.YEAR
+        )
+
+        assert next_cursor is None
@@ -1,5 +1,11 @@
 import pytest
-from app.main import app
+from fastapi.middleware.cors import CORSMiddleware
+from unittest.mock import AsyncMock, patch
+
+from app.clients.cache import TTLCache
+from app.clients.omdb_client import OMDBClient
+from app.core.compression import CompressionMiddleware
+from app.main import app, lifespan
 
 
 class TestMainApp:
@@ -20,6 +26,12 @@ class TestMainApp:
             "/api/v1/movies" in route for route in routes
         )
 
+    def test_compression_middleware_is_installed(self):
+        """Test that responses go through the compression middleware"""
+        middleware = [m.cls for m in app.user_middleware]
+        assert CompressionMiddleware in middleware
+        assert CORSMiddleware in middleware
+
     def test_health_endpoint_exists(self):
         """Test that health endpoint exists"""
         routes = [route.path for route in app.routes]
@@ -33,6 +45,45 @@ class TestMainApp:
         assert response.status_code == 200
         assert response.json() == {"status": "healthy"}
 
+    @pytest.mark.asyncio
+    async def test_lifespan_manages_shared_omdb_client(self):
+        """Test that lifespan creates and closes the pooled OMDB client"""
+        with patch("app.main.init_db", new_callable=AsyncMock):
+            async with lifespan(app):
+                omdb_client = app.state.omdb_client
+                assert isinstance(omdb_client, OMDBClient)
+                assert omdb_client.http_client is not None
+                assert not omdb_client.http_client.is_closed
+
+        assert omdb_client.http_client.is_closed
+        assert omdb_client.cache is not None
+        del app.state.omdb_client
+
+    @pytest.mark.asyncio
+    async def test_lifespan_skips_schema_init(self):
+        """Test that DB_INIT_ON_STARTUP=false boots without touching the schema"""
+        with (
+            patch("app.main.init_db", new_callable=AsyncMock) as mock_init_db,
+            patch("app.main.settings.DB_INIT_ON_STARTUP", False),
+        ):
+            async with lifespan(app):
+                pass
+
+        mock_init_db.assert_not_called()
+        del app.state.omdb_client
+
+    @pytest.mark.asyncio
+    async def test_omdb_health_endpoint(self, client):
+        """Test that OMDB client stats are exposed"""
+        app.state.omdb_client = OMDBClient(cache=TTLCache(10))
+        try:
+            response = await client.get("/health/omdb")
+        finally:
+            del app.state.omdb_client
+
+        assert response.status_code == 200
+        assert response.json()["cache"]["max_size"] == 10
+
     def test_openapi_paths(self):
         """Test that expected paths are in OpenAPI schema"""
         schema = app.openapi()
@@ -40,6 +91,7 @@ class TestMainApp:
         assert "/health" in schema["paths"]
         assert "/api/v1/movies" in schema["paths"]
         assert "/api/v1/movies/{movie_id}" in schema["paths"]
+        assert "/api/v1/movies/by-imdb/{imdb_id}" in schema["paths"]
 
     def test_openapi_movies_post_endpoint(self):
         """Test that POST /api/v1/movies endpoint is documented"""
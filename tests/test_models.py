@@ -1,5 +1,9 @@
 from datetime import datetime, UTC
-from app.models.movie import Movie
+
+from sqlalchemy import create_mock_engine
+
+from app.db.database import Base
+from app.models.movie import SEARCH_VECTOR_INDEX, Movie
 
 
 class TestMovieModel:
@@ -89,3 +93,31 @@ class TestMovieModel:
         # Here we're just testing the model structure
         assert hasattr(movie, "created_at")
         assert hasattr(movie, "updated_at")
+
+    def test_movie_title_normalized(self):
+        """Test that setting the title keeps the normalized title in sync"""
+        movie = Movie(title="Spider-Man: No Way Home")
+
+        assert movie.title_normalized == "spider man no way home"
+
+        movie.title = "The Matrix"
+        assert movie.title_normalized == "the matrix"
+
+    def test_search_vector_ddl_postgresql_only(self):
+        """Test the tsvector column and GIN index are created on PostgreSQL only"""
+
+        def ddl(dialect: str) -> str:
+            statements = []
+            engine = create_mock_engine(
+                f"{dialect}://",
+                lambda sql, *args, **kwargs: statements.append(
+                    str(sql.compile(dialect=engine.dialect))
+                ),
+            )
+            Base.metadata.create_all(engine, checkfirst=False)
+            return "\n".join(statements)
+
+        postgresql = ddl("postgresql")
+        assert "search_vector tsvector GENERATED ALWAYS AS" in postgresql
+        assert f"CREATE INDEX {SEARCH_VECTOR_INDEX} ON movies USING gin" in postgresql
+        assert "search_vector" not in ddl("sqlite")